@@ -1,8 +1,15 @@
 """Analysis module for EOFtoolkit."""
 
-from eoftoolkit.analysis.svd import perform_svd
+from eoftoolkit.analysis.svd import perform_svd, truncated_svd
 from eoftoolkit.analysis.reconstruction import reconstruct_from_modes
 from eoftoolkit.analysis.validation import calculate_error_metrics
+from eoftoolkit.analysis.regional import run_regional_svd, select_region_columns
+from eoftoolkit.analysis.gapfill import dineof_fill
+from eoftoolkit.analysis.windowed import run_windowed_svd, sliding_windows
+from eoftoolkit.analysis.ensemble import run_ensemble_svd
+from eoftoolkit.analysis.incremental import IncrementalSVD
+from eoftoolkit.analysis.tsqr import tsqr_svd
+from eoftoolkit.analysis.costmodel import select_svd_method, calibrate_cost_model
 
 # Expose simplified API functions
 svd = perform_svd
@@ -10,8 +17,19 @@ reconstruct = reconstruct_from_modes
 
 __all__ = [
     'perform_svd',
+    'truncated_svd',
     'reconstruct_from_modes',
     'calculate_error_metrics',
+    'run_regional_svd',
+    'select_region_columns',
+    'dineof_fill',
+    'run_windowed_svd',
+    'sliding_windows',
+    'run_ensemble_svd',
+    'IncrementalSVD',
+    'tsqr_svd',
+    'select_svd_method',
+    'calibrate_cost_model',
     'svd',
     'reconstruct'
 ]
\ No newline at end of file
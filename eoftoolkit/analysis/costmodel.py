@@ -0,0 +1,272 @@
+"""Module for choosing an SVD backend from a calibrated cost model."""
+
+import os
+import json
+import time
+import numpy as np
+from scipy import linalg
+
+
+# Bump when the benchmarks or the stored keys change, to force recalibration
+COST_MODEL_VERSION = 1
+
+# Backends considered by method='auto' (tsqr is left out: its process start-up
+# cost depends on the pool, not on the matrix)
+AUTO_METHODS = ('full', 'snapshot', 'randomized', 'lanczos', 'incremental')
+
+# Share of the available memory a backend may use for its working arrays
+MEMORY_FRACTION = 0.8
+
+
+def cost_model_path():
+    """
+    Get the path of the cached cost model.
+
+    Returns
+    -------
+    str
+        $XDG_CONFIG_HOME/eoftoolkit/svd_cost_model.json, with ~/.config as the
+        default config directory.
+    """
+    config_home = os.environ.get('XDG_CONFIG_HOME') or os.path.join(
+        os.path.expanduser('~'), '.config')
+    return os.path.join(config_home, 'eoftoolkit', 'svd_cost_model.json')
+
+
+def _best_time(func, repeats=3):
+    """Shortest wall time of several runs of a function."""
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return max(best, 1e-9)
+
+
+def calibrate_cost_model(path=None, save=True):
+    """
+    Measure this machine's throughput for the kernels the SVD backends use.
+
+    Runs three micro-benchmarks of well under a second: a matrix product
+    (GEMM, for the randomized, snapshot and incremental backends), a dense
+    SVD (LAPACK gesdd, for the full backend and the small inner problems),
+    and matrix-vector products (GEMV, memory-bound, for the Lanczos backend).
+
+    Parameters
+    ----------
+    path : str, optional
+        Where to cache the model. Default is cost_model_path().
+    save : bool, optional
+        Whether to write the model to `path`. Default is True.
+
+    Returns
+    -------
+    dict
+        Dictionary containing:
+        - 'version': Cost model version
+        - 'gemm_rate': Matrix product throughput in flop/s
+        - 'svd_rate': Dense SVD throughput in flop/s
+        - 'gemv_rate': Matrix-vector product throughput in flop/s
+    """
+    rng = np.random.default_rng(0)
+
+    a = rng.standard_normal((384, 384))
+    b = rng.standard_normal((384, 384))
+    gemm_rate = 2 * 384 ** 3 / _best_time(lambda: a @ b)
+
+    m, n = 192, 768
+    c = rng.standard_normal((m, n))
+    svd_rate = (4 * m * m * n + 22 * m ** 3) / _best_time(
+        lambda: linalg.svd(c, full_matrices=False))
+
+    d = rng.standard_normal((2048, 2048))
+    v = rng.standard_normal(2048)
+    gemv_rate = 10 * 2 * 2048 ** 2 / _best_time(lambda: [d @ v for _ in range(10)])
+
+    model = {
+        'version': COST_MODEL_VERSION,
+        'gemm_rate': gemm_rate,
+        'svd_rate': svd_rate,
+        'gemv_rate': gemv_rate
+    }
+
+    if save:
+        path = path or cost_model_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(model, f, indent=2)
+        except OSError:
+            # A read-only home directory only costs a recalibration next time
+            pass
+
+    return model
+
+
+def load_cost_model(path=None):
+    """
+    Load the cached cost model, calibrating (and caching) it if needed.
+
+    Parameters
+    ----------
+    path : str, optional
+        Cached model file. Default is cost_model_path().
+
+    Returns
+    -------
+    dict
+        Cost model as returned by calibrate_cost_model.
+    """
+    path = path or cost_model_path()
+
+    try:
+        with open(path) as f:
+            model = json.load(f)
+        if model.get('version') == COST_MODEL_VERSION:
+            return model
+    except (OSError, ValueError):
+        pass
+
+    return calibrate_cost_model(path)
+
+
+def available_memory():
+    """
+    Get the memory available to new allocations in bytes.
+
+    Returns
+    -------
+    int or None
+        MemAvailable from /proc/meminfo, or free physical pages from sysconf.
+        None if neither can be read.
+    """
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def estimate_svd_costs(n_rows, n_cols, num_modes=None, itemsize=8, in_memory=True,
+                       model=None, block_bytes=256 * 1024 ** 2):
+    """
+    Estimate the run time and working memory of each SVD backend.
+
+    Flop counts follow the usual dense linear algebra estimates and are
+    converted to seconds with the calibrated throughputs.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of time steps (T).
+    n_cols : int
+        Number of spatial locations (N).
+    num_modes : int, optional
+        Number of modes requested (k). If None, all min(T, N) modes are needed
+        and only 'full' is estimated: 'snapshot' drops modes below its
+        eigenvalue cutoff, so it could return fewer modes than 'full'.
+    itemsize : int, optional
+        Bytes per element of the super matrix. Default is 8.
+    in_memory : bool, optional
+        Whether the super matrix is already in memory. If False (e.g. a
+        memory-mapped file), backends that need it as one dense block are
+        charged for loading it. Default is True.
+    model : dict, optional
+        Cost model. Default is load_cost_model().
+    block_bytes : int, optional
+        Size of the column or row blocks read by the blockwise backends.
+
+    Returns
+    -------
+    dict
+        Dictionary with backend names as keys and (seconds, bytes) pairs as
+        values.
+    """
+    model = model or load_cost_model()
+    gemm, svd, gemv = model['gemm_rate'], model['svd_rate'], model['gemv_rate']
+
+    T, N = n_rows, n_cols
+    m, M = min(T, N), max(T, N)
+    k = m if num_modes is None else min(num_modes, m)
+    dense = 0 if in_memory else T * N * itemsize
+
+    costs = {
+        'full': ((4 * m * m * M + 22 * m ** 3) / svd,
+                 dense + 8 * (T * N + m * (T + N))),
+    }
+
+    if num_modes is None:
+        return costs
+
+    costs['snapshot'] = ((T * T * N + 2 * k * T * N) / gemm + 9 * T ** 3 / svd,
+                         8 * (T * T + k * N) + min(block_bytes, T * N * itemsize))
+
+    # Randomized: 2 + 2 * n_iter products with l = k + oversampling columns
+    l = min(k + 10, m)
+    costs['randomized'] = ((10 * 2 * T * N * l + 5 * 4 * (T + N) * l * l) / gemm
+                           + 4 * l * l * N / svd,
+                           dense + 3 * 8 * (T + N) * l)
+
+    # Lanczos: a few restarts of 2k + 1 Lanczos vectors, one X v and one Xᵀ u each
+    if k < m:
+        ncv = min(2 * k + 1, m)
+        costs['lanczos'] = (6 * ncv * 2 * T * N / gemv,
+                            2 * 8 * (T + N) * ncv + min(block_bytes, T * N * itemsize))
+
+    # Incremental: per block of b rows, two projections, a QR and a subspace update
+    r = min(k + 10, m)
+    b = max(1, min(T, block_bytes // (itemsize * N)))
+    costs['incremental'] = (T * N * (8 * r + 4 * b + 2 * r * (r + b) / b) / gemm,
+                            8 * ((b + 2 * r) * N + T * r))
+
+    return costs
+
+
+def select_svd_method(n_rows, n_cols, num_modes=None, itemsize=8, in_memory=True,
+                      memory_limit=None, model=None):
+    """
+    Choose the fastest SVD backend that fits in memory.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of time steps (T).
+    n_cols : int
+        Number of spatial locations (N).
+    num_modes : int, optional
+        Number of modes requested. If None, all modes are needed and 'full' is
+        chosen, so the results stay interchangeable with method='full'.
+    itemsize : int, optional
+        Bytes per element of the super matrix. Default is 8.
+    in_memory : bool, optional
+        Whether the super matrix is already in memory. Default is True.
+    memory_limit : int, optional
+        Memory budget in bytes. Default is MEMORY_FRACTION of the available
+        memory.
+    model : dict, optional
+        Cost model. Default is load_cost_model().
+
+    Returns
+    -------
+    str
+        Name of the chosen backend.
+    """
+    costs = estimate_svd_costs(n_rows, n_cols, num_modes, itemsize, in_memory, model)
+
+    if memory_limit is None:
+        available = available_memory()
+        memory_limit = np.inf if available is None else MEMORY_FRACTION * available
+
+    fitting = {method: cost for method, cost in costs.items() if cost[1] <= memory_limit}
+    if not fitting:
+        # Nothing fits: take the smallest working set and let the OS page
+        return min(costs, key=lambda method: costs[method][1])
+
+    return min(fitting, key=lambda method: fitting[method][0])
@@ -0,0 +1,87 @@
+"""Module for running EOF analyses on every member of an ensemble."""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from eoftoolkit.analysis.svd import results_from_factors
+from eoftoolkit.core.exceptions import DimensionError, SVDError
+
+
+# Ensembles up to this size are decomposed in one batched call
+DEFAULT_MAX_BATCH_BYTES = 2 * 1024 ** 3
+
+
+def _member_svd_worker(shm_name, shape, dtype, member):
+    """Attach to the shared ensemble array and run the SVD of one member."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        base = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        # Copy the member out so no view of the buffer outlives the close below
+        member_matrix = base[member].copy()
+        del base
+        U, s, Vt = np.linalg.svd(member_matrix, full_matrices=False)
+    finally:
+        shm.close()
+
+    return U, s, Vt
+
+
+def run_ensemble_svd(ensemble, num_modes=None, compute_surfaces=False, n_workers=None,
+                     max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+    """
+    Run the SVD of every member of an ensemble.
+
+    Members that fit in `max_batch_bytes` are decomposed together with one
+    batched numpy.linalg.svd call over the leading axis. Larger ensembles are
+    placed once in shared memory and decomposed member by member in a
+    process pool.
+
+    Parameters
+    ----------
+    ensemble : ndarray
+        Array with shape (members, time steps, spatial locations).
+    num_modes : int, optional
+        Number of modes to extract per member. If None, extracts all modes.
+    compute_surfaces : bool, optional
+        Whether to compute corresponding surfaces. Default is False.
+    n_workers : int, optional
+        Number of worker processes for ensembles too large to batch. If None,
+        uses the number of CPUs.
+    max_batch_bytes : int, optional
+        Largest ensemble (in bytes) decomposed in one batched call. Default is 2 GiB.
+
+    Returns
+    -------
+    list
+        perform_svd style results, one per member.
+    """
+    if ensemble.ndim != 3:
+        raise DimensionError(f"Ensemble must have shape (members, time, space), "
+                             f"got {ensemble.shape}")
+
+    if np.isnan(ensemble).any():
+        raise SVDError("Cannot perform SVD on an ensemble that contains NaN")
+
+    if ensemble.nbytes <= max_batch_bytes:
+        U, s, Vt = np.linalg.svd(ensemble, full_matrices=False)
+        factors = [(U[m], s[m], Vt[m]) for m in range(ensemble.shape[0])]
+    else:
+        base = np.ascontiguousarray(ensemble)
+        shm = shared_memory.SharedMemory(create=True, size=base.nbytes)
+        try:
+            shared = np.ndarray(base.shape, dtype=base.dtype, buffer=shm.buf)
+            shared[:] = base
+            del shared
+
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                futures = [executor.submit(_member_svd_worker, shm.name, base.shape,
+                                           base.dtype, m)
+                           for m in range(base.shape[0])]
+                factors = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    return [results_from_factors(U, s, Vt, num_modes, compute_surfaces=compute_surfaces)
+            for U, s, Vt in factors]
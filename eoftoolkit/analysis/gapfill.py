@@ -0,0 +1,172 @@
+"""Module for filling gaps in super matrices with low-rank reconstructions."""
+
+import warnings
+import numpy as np
+from eoftoolkit.analysis.svd import truncated_svd
+from eoftoolkit.core.exceptions import SVDError
+
+
+def _fill_iterations(matrix, rows, cols, num_modes, subspace, max_iter, tol, scale, n_iter,
+                     random_state, verbose):
+    """Refill the entries at (rows, cols) from rank-`num_modes` reconstructions."""
+    changes = []
+    converged = False
+
+    for iteration in range(1, max_iter + 1):
+        U, s, Vt = truncated_svd(matrix, num_modes, initial_subspace=subspace,
+                                 n_iter=n_iter, random_state=random_state)
+
+        # Reconstruct only the missing entries
+        filled = np.einsum('ij,ij->i', U[rows] * s, Vt.T[cols])
+        change = np.sqrt(np.mean((filled - matrix[rows, cols]) ** 2)) / scale
+
+        matrix[rows, cols] = filled
+        subspace = Vt.T
+        changes.append(change)
+
+        if verbose:
+            print(f"  Gap filling iteration {iteration} ({num_modes} modes): "
+                  f"relative change {change:.2e}")
+
+        if change < tol:
+            converged = True
+            break
+
+    return changes, converged, subspace
+
+
+def _cross_validate_modes(matrix, gap_mask, max_modes, max_iter, tol, scale, n_iter,
+                          cv_fraction, rng, verbose):
+    """
+    Choose the number of filling modes by DINEOF cross-validation.
+
+    A random subset of the observed entries is hidden along with the gaps, the
+    fill is run with 1, 2, ... modes (each starting from the previous fill),
+    and the number of modes with the lowest RMS error on the hidden entries is
+    kept. The search stops after three mode counts without improvement.
+    """
+    observed_rows, observed_cols = np.nonzero(~gap_mask)
+    n_hidden = min(len(observed_rows) // 2,
+                   max(30, int(cv_fraction * len(observed_rows))))
+    hidden = rng.choice(len(observed_rows), size=n_hidden, replace=False)
+    hidden_rows, hidden_cols = observed_rows[hidden], observed_cols[hidden]
+    truth = matrix[hidden_rows, hidden_cols].copy()
+
+    work = matrix.copy()
+    work[hidden_rows, hidden_cols] = 0.0
+    rows = np.concatenate([np.nonzero(gap_mask)[0], hidden_rows])
+    cols = np.concatenate([np.nonzero(gap_mask)[1], hidden_cols])
+
+    errors = []
+    best_modes, best_fill = None, None
+    subspace = None
+    for num_modes in range(1, max_modes + 1):
+        # Grow the warm-start subspace by one random direction per added mode
+        extra = rng.standard_normal((work.shape[1], 1))
+        subspace = extra if subspace is None else np.hstack([subspace, extra])
+
+        _, _, subspace = _fill_iterations(work, rows, cols, num_modes, subspace, max_iter,
+                                          tol, scale, n_iter, rng, False)
+
+        error = np.sqrt(np.mean((work[hidden_rows, hidden_cols] - truth) ** 2)) / scale
+        errors.append(error)
+        if verbose:
+            print(f"  Cross-validation with {num_modes} modes: relative error {error:.3e}")
+
+        if best_modes is None or error < errors[best_modes - 1]:
+            best_modes = num_modes
+            best_fill = work[gap_mask]
+        elif num_modes >= best_modes + 3:
+            break
+
+    return best_modes, best_fill, errors
+
+
+def dineof_fill(matrix, num_modes=None, max_iter=100, tol=1e-5, n_iter=1, random_state=None,
+                verbose=False, max_modes=20, cv_fraction=0.03):
+    """
+    Fill missing (NaN) entries of a matrix in place, DINEOF-style.
+
+    Missing entries start at zero (the mean of centered data) and are then
+    repeatedly replaced by a rank-`num_modes` reconstruction until they stop
+    changing. Each iteration's truncated SVD is warm-started from the previous
+    right singular subspace, so only a few subspace iterations are needed per step.
+
+    Too many modes fit the noise and make the fill both slow to converge and
+    inaccurate, so by default the number of modes is chosen by cross-validation
+    on a random subset of the observed entries (Beckers and Rixen, 2003). A
+    RuntimeWarning is issued if the final fill does not converge.
+
+    Parameters
+    ----------
+    matrix : ndarray
+        Centered matrix with rows as time steps and columns as spatial locations.
+        NaN entries are filled in place.
+    num_modes : int, optional
+        Number of modes used for the reconstruction. If None, it is chosen by
+        cross-validation. Default is None.
+    max_iter : int, optional
+        Maximum number of fill iterations. Default is 100.
+    tol : float, optional
+        Convergence tolerance on the RMS change of the filled values, relative to
+        the standard deviation of the observed values. Default is 1e-5.
+    n_iter : int, optional
+        Subspace iterations per truncated SVD. Default is 1.
+    random_state : int or Generator, optional
+        Seed for the initial random subspace and the cross-validation entries.
+    verbose : bool, optional
+        Whether to print convergence progress. Default is False.
+    max_modes : int, optional
+        Largest number of modes tried by cross-validation. Default is 20.
+    cv_fraction : float, optional
+        Share of the observed entries hidden for cross-validation (at least
+        30 entries). Default is 0.03.
+
+    Returns
+    -------
+    dict
+        Dictionary containing:
+        - 'gap_mask': Boolean array marking the entries that were filled
+        - 'num_modes': Number of modes used for the fill
+        - 'cv_errors': Relative RMS cross-validation error per number of modes
+          (None if `num_modes` was given)
+        - 'iterations': Number of iterations run
+        - 'converged': Whether the tolerance was reached
+        - 'changes': Relative RMS change of the filled values per iteration
+    """
+    gap_mask = np.isnan(matrix)
+    rows, cols = np.nonzero(gap_mask)
+    info = {'gap_mask': gap_mask, 'num_modes': num_modes, 'cv_errors': None,
+            'iterations': 0, 'converged': True, 'changes': []}
+
+    if len(rows) == 0:
+        return info
+
+    observed = matrix[~gap_mask]
+    if observed.size == 0:
+        raise SVDError("Cannot fill gaps in a matrix without observed values")
+
+    scale = np.std(observed) or 1.0
+    rng = np.random.default_rng(random_state)
+    matrix[gap_mask] = 0.0
+
+    if num_modes is None:
+        limit = max(1, min(max_modes, min(matrix.shape) - 1))
+        num_modes, start, info['cv_errors'] = _cross_validate_modes(
+            matrix, gap_mask, limit, max_iter, tol, scale, n_iter, cv_fraction, rng, verbose
+        )
+        info['num_modes'] = num_modes
+
+        # Start from the cross-validated fill, which is already close
+        matrix[gap_mask] = start
+
+    changes, converged, _ = _fill_iterations(matrix, rows, cols, num_modes, None, max_iter,
+                                             tol, scale, n_iter, rng, verbose)
+    info.update(iterations=len(changes), converged=converged, changes=changes)
+
+    if not converged:
+        warnings.warn(f"Gap filling with {num_modes} modes did not converge in {max_iter} "
+                      f"iterations (last relative change {changes[-1]:.2e}); the filled "
+                      f"values may be inaccurate", RuntimeWarning)
+
+    return info
@@ -0,0 +1,121 @@
+"""Module for running EOF analyses on regional subsets of one super matrix."""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from eoftoolkit.analysis.svd import perform_svd
+from eoftoolkit.core.exceptions import DimensionError
+
+
+def select_region_columns(longitudes, latitudes, lon_range, lat_range):
+    """
+    Find the super matrix columns that fall inside a longitude/latitude box.
+
+    Parameters
+    ----------
+    longitudes : ndarray
+        1D array with the longitude of each super matrix column.
+    latitudes : ndarray
+        1D array with the latitude of each super matrix column.
+    lon_range : tuple
+        Longitude range as (lon_min, lon_max), inclusive.
+    lat_range : tuple
+        Latitude range as (lat_min, lat_max), inclusive.
+
+    Returns
+    -------
+    ndarray
+        Sorted column indices inside the box.
+    """
+    inside = ((longitudes >= lon_range[0]) & (longitudes <= lon_range[1]) &
+              (latitudes >= lat_range[0]) & (latitudes <= lat_range[1]))
+
+    return np.flatnonzero(inside)
+
+
+def _regional_svd_worker(shm_name, shape, dtype, columns, num_modes, compute_surfaces,
+                         center_rows):
+    """Attach to the shared super matrix and run the SVD of one column subset."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        base = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        # Fancy indexing copies the subset, so the buffer can be released right away
+        subset = base[:, columns]
+        del base
+    finally:
+        shm.close()
+
+    return _regional_svd(subset, num_modes, compute_surfaces, center_rows)
+
+
+def _regional_svd(subset, num_modes, compute_surfaces, center_rows):
+    """Run the SVD of one column subset."""
+    if center_rows:
+        subset -= np.mean(subset, axis=1, keepdims=True)
+
+    return perform_svd(subset, num_modes, compute_surfaces)
+
+
+def run_regional_svd(super_matrix, region_columns, num_modes=None, compute_surfaces=False,
+                     n_workers=None, center_rows=False):
+    """
+    Run separate SVDs on column subsets of one super matrix.
+
+    The super matrix is placed once in shared memory and each worker process
+    reads only its own columns from it, so the base matrix is never pickled.
+
+    Parameters
+    ----------
+    super_matrix : ndarray
+        Super matrix with rows as time steps and columns as spatial locations.
+    region_columns : dict
+        Dictionary with region names as keys and column index arrays as values.
+    num_modes : int, optional
+        Number of modes to extract per region. If None, extracts all modes.
+    compute_surfaces : bool, optional
+        Whether to compute corresponding surfaces. Default is False.
+    n_workers : int, optional
+        Number of worker processes. If 1, regions run in the current process.
+        If None, uses the number of CPUs.
+    center_rows : bool, optional
+        Whether to subtract the spatial mean of each time step within each region.
+        Use this when the super matrix was centered with 'spatial' centering.
+        Default is False.
+
+    Returns
+    -------
+    dict
+        Dictionary with region names as keys and perform_svd results as values.
+    """
+    for name, columns in region_columns.items():
+        if len(columns) == 0:
+            raise DimensionError(f"Region '{name}' contains no valid cells")
+
+    if n_workers == 1:
+        return {
+            name: _regional_svd(super_matrix[:, np.asarray(columns)], num_modes,
+                                compute_surfaces, center_rows)
+            for name, columns in region_columns.items()
+        }
+
+    base = np.ascontiguousarray(super_matrix)
+    shm = shared_memory.SharedMemory(create=True, size=base.nbytes)
+    try:
+        shared = np.ndarray(base.shape, dtype=base.dtype, buffer=shm.buf)
+        shared[:] = base
+        del shared
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = {
+                name: executor.submit(_regional_svd_worker, shm.name, base.shape, base.dtype,
+                                      np.asarray(columns), num_modes, compute_surfaces,
+                                      center_rows)
+                for name, columns in region_columns.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return results
@@ -1,11 +1,27 @@
 """Module for performing SVD analysis on super matrices."""
 
 import numpy as np
+from collections.abc import Mapping
 from scipy import linalg
+from scipy.sparse.linalg import LinearOperator, svds, ArpackNoConvergence
+from eoftoolkit.analysis.costmodel import select_svd_method
+from eoftoolkit.analysis.incremental import IncrementalSVD
+from eoftoolkit.analysis.tsqr import tsqr_svd
 from eoftoolkit.core.exceptions import SVDError
 
 
-def perform_svd(super_matrix, num_modes=None, compute_surfaces=True):
+SVD_METHODS = ('full', 'randomized', 'snapshot', 'lanczos', 'incremental', 'tsqr', 'mixed',
+               'auto')
+
+# Solvers extend_modes can run on the deflated super matrix
+EXTEND_METHODS = ('randomized', 'lanczos', 'full')
+
+# Memory-mapped super matrices are read in column blocks of about this size
+DEFAULT_BLOCK_BYTES = 256 * 1024 ** 2
+
+
+def perform_svd(super_matrix, num_modes=None, compute_surfaces=True, method='full',
+                random_state=None, **method_options):
     """
     Perform SVD analysis on the super matrix and extract EOFs and PCs.
     
@@ -17,6 +33,35 @@ def perform_svd(super_matrix, num_modes=None, compute_surfaces=True):
         Number of modes to extract. If None, extracts all modes.
     compute_surfaces : bool, optional
         Whether to compute corresponding surfaces. Default is True.
+    method : str, optional
+        SVD backend:
+        - 'full': thin SVD of the whole matrix (exact, cost independent of num_modes)
+        - 'randomized': randomized range finder for the leading `num_modes`
+          modes only (see randomized_svd)
+        - 'snapshot': eigendecomposition of the small (rows x rows) Gram matrix,
+          for far fewer time steps than spatial locations (see snapshot_svd)
+        - 'lanczos': ARPACK iterations driven by matrix-vector products, for a
+          few leading modes (see lanczos_svd)
+        - 'incremental': Brand updates over blocks of rows, keeping only the
+          rank-limited factors in memory (see IncrementalSVD)
+        - 'tsqr': tall-skinny QR of the transpose in parallel worker processes,
+          for far more spatial locations than time steps (see tsqr_svd)
+        - 'mixed': float32 SVD refined with float64 subspace iterations (see
+          mixed_precision_svd)
+        - 'auto': the fastest of 'full', 'snapshot', 'randomized', 'lanczos'
+          and 'incremental' for this shape, num_modes and memory, from a cost
+          model calibrated on this machine (see select_svd_method); always
+          'full' when num_modes is None, so that all modes are returned
+        Default is 'full'. Explained variance is always relative to the total
+        variance of the matrix.
+    random_state : int or Generator, optional
+        Seed for randomized backends, for reproducible results.
+    **method_options
+        Extra options for the backend, e.g. `oversampling` and `n_iter` for
+        'randomized', `chunk_size` and `rcond` for 'snapshot', or `tol`,
+        `maxiter` and `chunk_size` for 'lanczos', `block_size` and
+        `oversampling` for 'incremental', `n_workers` for 'tsqr',
+        `refine_iter` for 'mixed', or `memory_limit` (bytes) for 'auto'.
         
     Returns
     -------
@@ -27,51 +72,64 @@ def perform_svd(super_matrix, num_modes=None, compute_surfaces=True):
         - 'singular_values': Singular values from SVD
         - 'explained_variance': Percentage of variance explained by each mode
         - 'cumulative_variance': Cumulative percentage of variance explained
-        - 'corresponding_surfaces': Corresponding surfaces (if compute_surfaces is True)
+        - 'corresponding_surfaces': Corresponding surfaces (if compute_surfaces is True),
+          computed on access (see CorrespondingSurfaces)
+        - 'convergence': Solver diagnostics (only for 'lanczos' and 'mixed')
+        - 'method': Backend chosen by method='auto'
     """
     
+    if method not in SVD_METHODS:
+        raise ValueError(f"Unknown SVD method '{method}'. Choose from {', '.join(SVD_METHODS)}")
+    
+    auto = method == 'auto'
+    if auto:
+        memory_limit = method_options.pop('memory_limit', None)
+        if method_options:
+            raise ValueError(f"method='auto' only accepts memory_limit, got "
+                             f"{', '.join(method_options)}")
+        method = select_svd_method(
+            *super_matrix.shape, num_modes, itemsize=super_matrix.itemsize,
+            in_memory=not isinstance(super_matrix, np.memmap), memory_limit=memory_limit
+        )
+    
+    if method in ('randomized', 'lanczos', 'incremental') and num_modes is None:
+        raise ValueError(f"The '{method}' SVD method requires num_modes")
+    
     try:
         # Check for zero matrix
-        if np.all(super_matrix == 0):
+        if _is_zero(super_matrix):
             raise SVDError("Cannot perform SVD on zero matrix")
 
         # Perform SVD
-        U, s, Vt = linalg.svd(super_matrix, full_matrices=False)
-        
-        # Determine number of modes to keep
-        if num_modes is None:
-            num_modes = len(s)
+        total_variance = None
+        convergence = None
+        if method == 'full':
+            U, s, Vt = linalg.svd(super_matrix, full_matrices=False)
+        elif method == 'snapshot':
+            U, s, Vt, total_variance = snapshot_svd(super_matrix, num_modes, **method_options)
+        elif method == 'lanczos':
+            U, s, Vt, convergence = lanczos_svd(super_matrix, num_modes,
+                                                random_state=random_state, **method_options)
+            total_variance = convergence['total_variance']
+        elif method == 'incremental':
+            U, s, Vt, total_variance = incremental_svd(super_matrix, num_modes, **method_options)
+        elif method == 'tsqr':
+            U, s, Vt = tsqr_svd(super_matrix, num_modes, **method_options)
+            total_variance = np.einsum('ij,ij->', super_matrix, super_matrix)
+        elif method == 'mixed':
+            U, s, Vt, convergence = mixed_precision_svd(super_matrix, num_modes, **method_options)
+            total_variance = convergence['total_variance']
         else:
-            num_modes = min(num_modes, len(s))
-        
-        # Extract EOFs and PCs
-        eofs = Vt[:num_modes, :]
-        pcs = U[:, :num_modes] * s[:num_modes]
-        
-        # Calculate variance explained
-        variance = s**2 / np.sum(s**2) * 100
-        cumulative_variance = np.cumsum(variance)
-        
-        # Prepare results dictionary
-        results = {
-            'eofs': eofs,
-            'pcs': pcs,
-            'singular_values': s[:num_modes],
-            'explained_variance': variance[:num_modes],
-            'cumulative_variance': cumulative_variance[:num_modes]
-        }
-        
-        # Compute corresponding surfaces if requested
-        if compute_surfaces:
-            corresponding_surfaces = {}
-            
-            for i in range(num_modes):
-                eof = eofs[i, :].reshape(-1, 1)
-                pc = pcs[:, i].reshape(-1, 1)
-                surface = np.dot(pc, eof.T)
-                corresponding_surfaces[f'mode_{i+1}'] = surface
-            
-            results['corresponding_surfaces'] = corresponding_surfaces
+            U, s, Vt = randomized_svd(super_matrix, num_modes, random_state=random_state,
+                                      **method_options)
+            total_variance = np.einsum('ij,ij->', super_matrix, super_matrix)
+        
+        results = results_from_factors(U, s, Vt, num_modes, total_variance=total_variance,
+                                       compute_surfaces=compute_surfaces)
+        if convergence is not None:
+            results['convergence'] = convergence
+        if auto:
+            results['method'] = method
         
         return results
     
@@ -79,6 +137,720 @@ def perform_svd(super_matrix, num_modes=None, compute_surfaces=True):
         raise SVDError(f"Error during SVD computation: {str(e)}")
 
 
+class CorrespondingSurfaces(Mapping):
+    """
+    Read-only mapping from 'mode_k' to the (T x N) surface of mode k, computed on access.
+    
+    Each surface is the outer product of a PC and its EOF. Only the PCs and
+    EOFs are stored, so no T x N array exists until a surface is requested,
+    and `surface` can compute just a block of rows or columns. Converting to a
+    dict (e.g. dict(surfaces)) materializes every surface.
+    """
+    
+    def __init__(self, pcs, eofs, modes=None):
+        """
+        Initialize the mapping.
+        
+        Parameters
+        ----------
+        pcs : ndarray
+            PCs with shape (T, k).
+        eofs : ndarray
+            EOFs with shape (k, N).
+        modes : list, optional
+            Mode number (1-based) of each column of `pcs`. Default is 1 to k.
+        """
+        self._pcs = pcs
+        self._eofs = eofs
+        if modes is None:
+            modes = range(1, pcs.shape[1] + 1)
+        self._index = {f'mode_{mode}': i for i, mode in enumerate(modes)}
+    
+    def __getitem__(self, key):
+        """Compute the full surface of one mode."""
+        return self.surface(key)
+    
+    def __iter__(self):
+        return iter(self._index)
+    
+    def __len__(self):
+        return len(self._index)
+    
+    def __repr__(self):
+        return (f"CorrespondingSurfaces({len(self)} modes, "
+                f"{self._pcs.shape[0]} x {self._eofs.shape[1]} each)")
+    
+    def surface(self, mode, rows=None, columns=None):
+        """
+        Compute the surface of one mode, optionally for a subset of rows and columns.
+        
+        Parameters
+        ----------
+        mode : str or int
+            Key ('mode_k') or mode number (k).
+        rows : slice or array_like, optional
+            Rows (time steps) to compute. Default is all rows.
+        columns : slice or array_like, optional
+            Columns (spatial locations) to compute. Default is all columns.
+            
+        Returns
+        -------
+        ndarray
+            Surface with shape (rows, columns).
+        """
+        key = f'mode_{mode}' if isinstance(mode, (int, np.integer)) else mode
+        if key not in self._index:
+            raise KeyError(key)
+        
+        i = self._index[key]
+        pc = self._pcs[:, i] if rows is None else self._pcs[rows, i]
+        eof = self._eofs[i] if columns is None else self._eofs[i, columns]
+        
+        return np.outer(pc, eof)
+
+
+def results_from_factors(U, s, Vt, num_modes=None, total_variance=None, compute_surfaces=True):
+    """
+    Build the SVD results dictionary from (possibly truncated) SVD factors.
+    
+    Parameters
+    ----------
+    U : ndarray
+        Left singular vectors with shape (rows, k).
+    s : ndarray
+        Singular values with shape (k,).
+    Vt : ndarray
+        Right singular vectors with shape (k, columns).
+    num_modes : int, optional
+        Number of modes to keep. If None, keeps all k modes.
+    total_variance : float, optional
+        Sum of all squared singular values (the squared Frobenius norm of the
+        matrix). Needed when the factors are truncated, so that explained
+        variance is relative to the whole matrix. If None, uses sum(s**2).
+    compute_surfaces : bool, optional
+        Whether to compute corresponding surfaces. Default is True.
+        
+    Returns
+    -------
+    dict
+        Dictionary with the same keys as perform_svd.
+    """
+    # Determine number of modes to keep
+    if num_modes is None:
+        num_modes = len(s)
+    else:
+        num_modes = min(num_modes, len(s))
+    
+    if total_variance is None:
+        total_variance = np.sum(s**2)
+    
+    # Extract EOFs and PCs
+    eofs = Vt[:num_modes, :]
+    pcs = U[:, :num_modes] * s[:num_modes]
+    
+    # Calculate variance explained
+    variance = s**2 / total_variance * 100
+    cumulative_variance = np.cumsum(variance)
+    
+    # Prepare results dictionary
+    results = {
+        'eofs': eofs,
+        'pcs': pcs,
+        'singular_values': s[:num_modes],
+        'explained_variance': variance[:num_modes],
+        'cumulative_variance': cumulative_variance[:num_modes]
+    }
+    
+    # Corresponding surfaces are computed when accessed
+    if compute_surfaces:
+        results['corresponding_surfaces'] = CorrespondingSurfaces(pcs, eofs)
+    
+    return results
+
+
+def truncated_svd(matrix, num_modes, initial_subspace=None, n_iter=2, random_state=None):
+    """
+    Compute the leading singular triplets by subspace iteration.
+    
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with rows as time steps and columns as spatial locations.
+    num_modes : int
+        Number of singular triplets to compute.
+    initial_subspace : ndarray, optional
+        Starting right subspace with shape (columns, num_modes), typically the
+        right singular vectors (Vt.T) of a previous, similar matrix. Warm starts
+        converge in far fewer iterations. If None, a random subspace is used.
+    n_iter : int, optional
+        Number of subspace (power) iterations. Default is 2.
+    random_state : int or Generator, optional
+        Seed for the random starting subspace.
+        
+    Returns
+    -------
+    tuple
+        (U, s, Vt) with shapes (rows, num_modes), (num_modes,) and
+        (num_modes, columns).
+    """
+    num_modes = min(num_modes, *matrix.shape)
+    
+    if initial_subspace is None:
+        rng = np.random.default_rng(random_state)
+        initial_subspace = rng.standard_normal((matrix.shape[1], num_modes))
+    
+    Q, _ = linalg.qr(matrix @ initial_subspace, mode='economic')
+    
+    for _ in range(n_iter):
+        Z, _ = linalg.qr(matrix.T @ Q, mode='economic')
+        Q, _ = linalg.qr(matrix @ Z, mode='economic')
+    
+    # Exact SVD of the small projected matrix
+    Ub, s, Vt = linalg.svd(Q.T @ matrix, full_matrices=False)
+    U = Q @ Ub
+    
+    return U[:, :num_modes], s[:num_modes], Vt[:num_modes, :]
+
+
+def randomized_svd(matrix, num_modes, oversampling=10, n_iter=4, random_state=None):
+    """
+    Compute the leading singular triplets with a randomized range finder.
+    
+    The range of the matrix is sampled with `num_modes + oversampling` random
+    vectors and refined with `n_iter` power iterations (re-orthonormalized
+    with QR at each step), so the cost grows with the number of modes rather
+    than with the smaller matrix dimension.
+    
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with rows as time steps and columns as spatial locations.
+    num_modes : int
+        Number of singular triplets to compute.
+    oversampling : int, optional
+        Extra random vectors beyond num_modes. Default is 10.
+    n_iter : int, optional
+        Number of power iterations. More iterations help when singular values
+        decay slowly. Default is 4.
+    random_state : int or Generator, optional
+        Seed for the random test matrix, for reproducible results.
+        
+    Returns
+    -------
+    tuple
+        (U, s, Vt) with shapes (rows, num_modes), (num_modes,) and
+        (num_modes, columns).
+    """
+    U, s, Vt = truncated_svd(matrix, num_modes + oversampling, n_iter=n_iter,
+                             random_state=random_state)
+    
+    return U[:, :num_modes], s[:num_modes], Vt[:num_modes, :]
+
+
+def _is_zero(matrix):
+    """Check that a matrix is all zeros, one row block at a time, stopping early."""
+    block_size = max(1, DEFAULT_BLOCK_BYTES // (matrix.itemsize * max(matrix.shape[1], 1)))
+    
+    for start in range(0, matrix.shape[0], block_size):
+        if np.any(matrix[start:start + block_size]):
+            return False
+    
+    return True
+
+
+def _column_blocks(matrix, chunk_size=None):
+    """Yield column slices covering a matrix, in blocks for memory-mapped input."""
+    n_rows, n_cols = matrix.shape
+    
+    if chunk_size is None:
+        if isinstance(matrix, np.memmap):
+            chunk_size = max(1, DEFAULT_BLOCK_BYTES // (matrix.itemsize * n_rows))
+        else:
+            chunk_size = n_cols
+    
+    for start in range(0, n_cols, chunk_size):
+        yield slice(start, start + chunk_size)
+
+
+def snapshot_svd(matrix, num_modes=None, chunk_size=None, rcond=None):
+    """
+    Compute the SVD through the eigendecomposition of the temporal Gram matrix.
+    
+    For T time steps and N spatial locations with T much smaller than N, the
+    (T x T) matrix X Xᵀ is accumulated over column blocks and eigendecomposed.
+    Its eigenvectors are the left singular vectors U, and the EOFs follow from
+    one product Vt = diag(1/s) Uᵀ X.
+    
+    Squaring the matrix squares its condition number: singular values below
+    about sqrt(eps) times the largest one cannot be recovered, and dividing by
+    them would amplify rounding noise in the EOFs. Modes whose eigenvalue falls
+    below `rcond` times the largest eigenvalue are therefore dropped.
+    
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with rows as time steps and columns as spatial locations. May be
+        a numpy.memmap, which is then read in column blocks.
+    num_modes : int, optional
+        Number of singular triplets to compute. If None, computes all modes
+        above the cutoff.
+    chunk_size : int, optional
+        Number of columns read at a time. Default is all columns for in-memory
+        arrays and blocks of about 256 MiB for memory-mapped arrays.
+    rcond : float, optional
+        Relative eigenvalue cutoff. Default is max(T, N) * eps.
+        
+    Returns
+    -------
+    tuple
+        (U, s, Vt, total_variance), where total_variance is the trace of the
+        Gram matrix (the squared Frobenius norm of the matrix), including the
+        dropped modes.
+    """
+    n_rows = matrix.shape[0]
+    
+    gram = np.zeros((n_rows, n_rows))
+    for block in _column_blocks(matrix, chunk_size):
+        part = np.asarray(matrix[:, block], dtype=np.float64)
+        gram += part @ part.T
+    
+    eigenvalues, eigenvectors = linalg.eigh(gram)
+    eigenvalues, eigenvectors = eigenvalues[::-1], eigenvectors[:, ::-1]
+    
+    if rcond is None:
+        rcond = max(matrix.shape) * np.finfo(np.float64).eps
+    keep = eigenvalues > rcond * eigenvalues[0]
+    if num_modes is not None:
+        keep[num_modes:] = False
+    
+    s = np.sqrt(eigenvalues[keep])
+    U = eigenvectors[:, keep]
+    
+    # Vt = diag(1/s) Uᵀ X, one product per column block
+    projector = U.T / s[:, None]
+    Vt = np.empty((len(s), matrix.shape[1]))
+    for block in _column_blocks(matrix, chunk_size):
+        Vt[:, block] = projector @ matrix[:, block]
+    
+    return U, s, Vt, np.trace(gram)
+
+
+def lanczos_svd(matrix, num_modes, tol=0, maxiter=None, chunk_size=None, random_state=None,
+                known_vt=None):
+    """
+    Compute a few leading singular triplets with ARPACK (implicitly restarted Lanczos).
+    
+    The solver only sees the matrix through products X v and Xᵀ u, which are
+    evaluated over column blocks, so a memory-mapped super matrix is never
+    loaded as one dense block.
+    
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with rows as time steps and columns as spatial locations. May be
+        a numpy.memmap, which is then read in column blocks.
+    num_modes : int
+        Number of singular triplets to compute. Must be smaller than both
+        matrix dimensions.
+    tol : float, optional
+        Relative accuracy of the singular values. Default is 0 (machine precision).
+    maxiter : int, optional
+        Maximum number of restarts. Default is ARPACK's (10 times the size of
+        the smaller dimension).
+    chunk_size : int, optional
+        Number of columns read at a time. Default is all columns for in-memory
+        arrays and blocks of about 256 MiB for memory-mapped arrays.
+    random_state : int or Generator, optional
+        Seed for the starting vector, for reproducible results.
+    known_vt : ndarray, optional
+        Known right singular vectors with shape (k, columns). If given, the
+        solver runs on X (I - V Vᵀ) and returns the modes that follow them.
+        
+    Returns
+    -------
+    tuple
+        (U, s, Vt, convergence), where convergence is a dictionary containing:
+        - 'matvecs': Number of products with X and with Xᵀ
+        - 'residuals': Relative residual ||X v - s u|| / s of each mode
+        - 'tol': Requested tolerance
+        - 'total_variance': Squared Frobenius norm of the matrix
+    """
+    n_rows, n_cols = matrix.shape
+    
+    if not 0 < num_modes < min(n_rows, n_cols):
+        raise ValueError(f"The 'lanczos' method needs 0 < num_modes < {min(n_rows, n_cols)}, "
+                         f"got {num_modes}")
+    
+    blocks = list(_column_blocks(matrix, chunk_size))
+    counts = {'matvec': 0, 'rmatvec': 0}
+    
+    def deflate(vector):
+        # Remove the components along the known right singular vectors
+        if known_vt is None:
+            return vector
+        return vector - known_vt.T @ (known_vt @ vector)
+    
+    def matvec(v):
+        counts['matvec'] += 1
+        v = deflate(np.ravel(v))
+        out = np.zeros(n_rows)
+        for block in blocks:
+            out += matrix[:, block] @ v[block]
+        return out
+    
+    def rmatvec(u):
+        counts['rmatvec'] += 1
+        u = np.ravel(u)
+        out = np.empty(n_cols)
+        for block in blocks:
+            out[block] = u @ matrix[:, block]
+        return deflate(out)
+    
+    operator = LinearOperator((n_rows, n_cols), matvec=matvec, rmatvec=rmatvec,
+                              dtype=np.float64)
+    v0 = np.random.default_rng(random_state).standard_normal(min(n_rows, n_cols))
+    
+    try:
+        U, s, Vt = svds(operator, k=num_modes, tol=tol, maxiter=maxiter, v0=v0)
+    except ArpackNoConvergence:
+        raise SVDError(f"ARPACK did not converge to {num_modes} modes in {maxiter} "
+                       f"iterations; increase maxiter or tol")
+    
+    # svds returns the singular values in ascending order
+    order = np.argsort(s)[::-1]
+    U, s, Vt = U[:, order], s[order], Vt[order]
+    
+    # One more pass for the residuals and the total variance
+    residual = -U * s
+    total_variance = 0.0
+    for block in blocks:
+        part = matrix[:, block]
+        residual += part @ Vt[:, block].T
+        total_variance += np.einsum('ij,ij->', part, part)
+    
+    convergence = {
+        'matvecs': counts['matvec'] + counts['rmatvec'],
+        'residuals': np.linalg.norm(residual, axis=0) / s,
+        'tol': tol,
+        'total_variance': total_variance
+    }
+    
+    return U, s, Vt, convergence
+
+
+def _relative_residuals(matrix, U, s, Vt, chunk_size=None):
+    """Relative residuals ||X v - s u|| / s of each mode, in float64 over column blocks."""
+    residual = -U * s
+    for block in _column_blocks(matrix, chunk_size):
+        residual += np.asarray(matrix[:, block], dtype=np.float64) @ Vt[:, block].T
+    
+    return np.linalg.norm(residual, axis=0) / s
+
+
+def mixed_precision_svd(matrix, num_modes=None, refine_iter=2, oversampling=10,
+                        chunk_size=None):
+    """
+    Compute the SVD in float32 and refine the leading modes in float64.
+    
+    The float32 decomposition gives a right singular subspace accurate to
+    about 1e-7. Each refinement step is a float64 subspace iteration with a
+    Rayleigh-Ritz projection against the original matrix: orthonormalize
+    X V, project Qᵀ X, and take the exact SVD of that small (k x N) matrix.
+    Singular values converge quadratically in the subspace error, so one or
+    two steps usually reach float64 accuracy for well separated modes.
+    As in randomized_svd, the iteration runs on `num_modes + oversampling`
+    vectors and is truncated at the end, so the last requested modes
+    converge at the rate set by the gap to the oversampled ones.
+    
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with rows as time steps and columns as spatial locations.
+    num_modes : int, optional
+        Number of modes to refine and return. If None, refines all modes.
+    refine_iter : int, optional
+        Number of float64 refinement steps. Default is 2.
+    oversampling : int, optional
+        Extra vectors refined along with the requested modes. Default is 10.
+    chunk_size : int, optional
+        Number of columns converted to float64 at a time during refinement.
+        Default is all columns for in-memory arrays.
+        
+    Returns
+    -------
+    tuple
+        (U, s, Vt, convergence), where convergence is a dictionary containing:
+        - 'iterations': Number of refinement steps
+        - 'residuals_float32': Relative residual ||X v - s u|| / s of each mode
+          before refinement
+        - 'residuals': Relative residual of each mode after refinement
+        - 'total_variance': Squared Frobenius norm of the matrix
+    """
+    U32, s32, Vt32 = linalg.svd(np.asarray(matrix, dtype=np.float32), full_matrices=False)
+    
+    k = len(s32) if num_modes is None else min(num_modes, len(s32))
+    l = min(k + oversampling, len(s32))
+    U = U32[:, :l].astype(np.float64)
+    s = s32[:l].astype(np.float64)
+    Vt = Vt32[:l].astype(np.float64)
+    del U32, Vt32
+    
+    blocks = list(_column_blocks(matrix, chunk_size))
+    residuals_float32 = _relative_residuals(matrix, U[:, :k], s[:k], Vt[:k], chunk_size)
+    
+    for _ in range(refine_iter):
+        # Left subspace from the current right singular vectors
+        product = np.zeros((matrix.shape[0], l))
+        for block in blocks:
+            product += np.asarray(matrix[:, block], dtype=np.float64) @ Vt[:, block].T
+        Q, _ = linalg.qr(product, mode='economic')
+        
+        # Rayleigh-Ritz: exact SVD of the projection Qᵀ X
+        projected = np.empty((l, matrix.shape[1]))
+        for block in blocks:
+            projected[:, block] = Q.T @ np.asarray(matrix[:, block], dtype=np.float64)
+        Ub, s, Vt = linalg.svd(projected, full_matrices=False)
+        U = Q @ Ub
+    
+    U, s, Vt = U[:, :k], s[:k], Vt[:k]
+    
+    total_variance = 0.0
+    for block in blocks:
+        part = np.asarray(matrix[:, block], dtype=np.float64)
+        total_variance += np.einsum('ij,ij->', part, part)
+    
+    convergence = {
+        'iterations': refine_iter,
+        'residuals_float32': residuals_float32,
+        'residuals': _relative_residuals(matrix, U, s, Vt, chunk_size),
+        'total_variance': total_variance
+    }
+    
+    return U, s, Vt, convergence
+
+
+def incremental_svd(matrix, num_modes, block_size=None, oversampling=10):
+    """
+    Compute the leading singular triplets from row blocks with IncrementalSVD.
+    
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with rows as time steps and columns as spatial locations. May be
+        a numpy.memmap; only one block of rows is read at a time.
+    num_modes : int
+        Number of singular triplets to compute.
+    block_size : int, optional
+        Number of rows per update. Default is blocks of about 256 MiB.
+    oversampling : int, optional
+        Extra modes tracked during the updates. Default is 10.
+        
+    Returns
+    -------
+    tuple
+        (U, s, Vt, total_variance).
+    """
+    n_rows, n_cols = matrix.shape
+    if block_size is None:
+        block_size = max(1, DEFAULT_BLOCK_BYTES // (matrix.itemsize * n_cols))
+    
+    engine = IncrementalSVD(num_modes, oversampling=oversampling)
+    for start in range(0, n_rows, block_size):
+        engine.update(matrix[start:start + block_size])
+    
+    return (*engine.factors(), engine.total_variance)
+
+
+def update_svd(svd_results, new_rows, compute_surfaces=None):
+    """
+    Update SVD results with new time steps appended to the super matrix.
+    
+    The k modes of `svd_results` are updated with one Brand step (see
+    IncrementalSVD), which takes O(N k (k + new rows)) operations instead of a
+    new decomposition. The update is exact when the results hold all modes of
+    the previous super matrix. With truncated results, the variance outside
+    the k modes of the earlier rows is no longer available, so the modes drift
+    slowly from those of a full SVD as updates accumulate; recompute the SVD
+    from time to time to reset the drift.
+    
+    Parameters
+    ----------
+    svd_results : dict
+        Results from perform_svd (or an earlier update_svd).
+    new_rows : ndarray
+        New rows with the same columns (and preprocessing) as the super matrix.
+    compute_surfaces : bool, optional
+        Whether to provide corresponding surfaces. Default is to follow
+        `svd_results`.
+        
+    Returns
+    -------
+    dict
+        New SVD results for all rows, with the same keys as perform_svd.
+    """
+    s = svd_results['singular_values']
+    pcs = svd_results['pcs']
+    new_rows = np.atleast_2d(new_rows)
+    
+    if np.isnan(new_rows).any():
+        raise SVDError("Cannot update the SVD with rows that contain NaN")
+    
+    # Complete results gain the modes of the new rows; truncated ones keep k
+    num_modes = len(s)
+    if num_modes >= pcs.shape[0]:
+        num_modes += new_rows.shape[0]
+    
+    # Recover U and the total variance of the previous rows from the results
+    U = np.divide(pcs, s, out=np.zeros(pcs.shape), where=s > 0)
+    total_variance = np.sum(s**2) * 100 / svd_results['cumulative_variance'][-1]
+    
+    engine = IncrementalSVD.from_factors(U, s, svd_results['eofs'], total_variance,
+                                         num_modes=num_modes)
+    try:
+        engine.update(new_rows)
+    except Exception as e:
+        raise SVDError(f"Error during SVD update: {str(e)}")
+    
+    if compute_surfaces is None:
+        compute_surfaces = 'corresponding_surfaces' in svd_results
+    
+    return results_from_factors(*engine.factors(), total_variance=engine.total_variance,
+                                compute_surfaces=compute_surfaces)
+
+
+def deflated_svd(matrix, known_vt, num_modes, oversampling=10, n_iter=4, random_state=None):
+    """
+    Compute the leading singular triplets of X with known modes deflated.
+    
+    Runs a randomized range finder on the residual operator X (I - V Vᵀ),
+    where the rows of `known_vt` are the known right singular vectors. The
+    residual is never formed: every product with X is followed (or preceded)
+    by a projection against the known subspace.
+    
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with rows as time steps and columns as spatial locations.
+    known_vt : ndarray
+        Known right singular vectors with shape (k, columns).
+    num_modes : int
+        Number of additional singular triplets to compute.
+    oversampling : int, optional
+        Extra random vectors beyond num_modes. Default is 10.
+    n_iter : int, optional
+        Number of power iterations. Default is 4.
+    random_state : int or Generator, optional
+        Seed for the random test matrix.
+        
+    Returns
+    -------
+    tuple
+        (U, s, Vt) of the residual operator, with shapes (rows, num_modes),
+        (num_modes,) and (num_modes, columns).
+    """
+    def deflate(vectors):
+        # Remove the components along the known right singular vectors
+        return vectors - known_vt.T @ (known_vt @ vectors)
+    
+    n_rows, n_cols = matrix.shape
+    size = min(num_modes + oversampling, min(n_rows, n_cols) - known_vt.shape[0])
+    
+    rng = np.random.default_rng(random_state)
+    Q, _ = linalg.qr(matrix @ deflate(rng.standard_normal((n_cols, size))), mode='economic')
+    
+    for _ in range(n_iter):
+        Z, _ = linalg.qr(deflate(matrix.T @ Q), mode='economic')
+        Q, _ = linalg.qr(matrix @ Z, mode='economic')
+    
+    # Exact SVD of the small projected residual Qᵀ X (I - V Vᵀ)
+    projected = Q.T @ matrix
+    Ub, s, Vt = linalg.svd(projected - (projected @ known_vt.T) @ known_vt, full_matrices=False)
+    U = Q @ Ub
+    
+    return U[:, :num_modes], s[:num_modes], Vt[:num_modes]
+
+
+def extend_modes(svd_results, super_matrix, num_modes, compute_surfaces=None,
+                 method='randomized', random_state=None, **options):
+    """
+    Append more modes to SVD results without recomputing the known ones.
+    
+    The additional modes are the leading modes of the super matrix with the
+    known modes deflated (see deflated_svd). Explained and cumulative variance
+    are rebuilt for all modes, relative to the same total variance.
+    
+    Parameters
+    ----------
+    svd_results : dict
+        Results from perform_svd for `super_matrix`.
+    super_matrix : ndarray
+        Super matrix the results were computed from.
+    num_modes : int
+        Number of additional modes. Capped at the number of modes left.
+    compute_surfaces : bool, optional
+        Whether to provide corresponding surfaces. Default is to follow
+        `svd_results`.
+    method : str, optional
+        Solver for the deflated super matrix:
+        - 'randomized': randomized range finder (see deflated_svd)
+        - 'lanczos': ARPACK iterations (see lanczos_svd with `known_vt`)
+        - 'full': exact thin SVD of the deflated matrix
+        Default is 'randomized'.
+    random_state : int or Generator, optional
+        Seed for 'randomized' and 'lanczos', for reproducible results.
+    **options
+        Extra solver options: `oversampling` and `n_iter` for 'randomized', or
+        `tol`, `maxiter` and `chunk_size` for 'lanczos'.
+        
+    Returns
+    -------
+    dict
+        New SVD results with the known modes followed by the additional ones.
+    """
+    s = svd_results['singular_values']
+    pcs = svd_results['pcs']
+    eofs = svd_results['eofs']
+    
+    if pcs.shape[0] != super_matrix.shape[0] or eofs.shape[1] != super_matrix.shape[1]:
+        raise SVDError(f"SVD results of shape {pcs.shape[0]} x {eofs.shape[1]} do not match "
+                       f"the super matrix of shape {super_matrix.shape}")
+    
+    if method not in EXTEND_METHODS:
+        raise ValueError(f"Unknown method '{method}' for extending modes. "
+                         f"Choose from {', '.join(EXTEND_METHODS)}")
+    if method == 'full' and options:
+        raise ValueError(f"method='full' takes no options, got {', '.join(options)}")
+    
+    num_modes = min(num_modes, min(super_matrix.shape) - len(s))
+    if num_modes < 1:
+        raise ValueError("All modes of the super matrix have already been computed")
+    
+    try:
+        if method == 'randomized':
+            U_new, s_new, Vt_new = deflated_svd(super_matrix, eofs, num_modes,
+                                                random_state=random_state, **options)
+        elif method == 'lanczos':
+            U_new, s_new, Vt_new, _ = lanczos_svd(super_matrix, num_modes,
+                                                  random_state=random_state,
+                                                  known_vt=eofs, **options)
+        else:
+            residual = super_matrix - (super_matrix @ eofs.T) @ eofs
+            U_new, s_new, Vt_new = linalg.svd(residual, full_matrices=False)
+            U_new, s_new, Vt_new = U_new[:, :num_modes], s_new[:num_modes], Vt_new[:num_modes]
+    except Exception as e:
+        raise SVDError(f"Error during mode extension: {str(e)}")
+    
+    U = np.divide(pcs, s, out=np.zeros(pcs.shape), where=s > 0)
+    total_variance = np.sum(s**2) * 100 / svd_results['cumulative_variance'][-1]
+    
+    if compute_surfaces is None:
+        compute_surfaces = 'corresponding_surfaces' in svd_results
+    
+    return results_from_factors(np.hstack([U, U_new]), np.concatenate([s, s_new]),
+                                np.vstack([eofs, Vt_new]), total_variance=total_variance,
+                                compute_surfaces=compute_surfaces)
+
+
 def extract_modes(svd_results, modes_to_extract):
     """
     Extract specific modes from SVD results.
@@ -119,14 +891,10 @@ def extract_modes(svd_results, modes_to_extract):
     extracted['singular_values'] = extracted_values
     extracted['explained_variance'] = extracted_variance
     
-    # Extract corresponding surfaces if available
+    # Corresponding surfaces keep the original mode numbers
     if 'corresponding_surfaces' in svd_results:
-        extracted_surfaces = {}
-        for i, mode in enumerate(modes_to_extract):
-            key = f'mode_{mode}'
-            if key in svd_results['corresponding_surfaces']:
-                extracted_surfaces[key] = svd_results['corresponding_surfaces'][key]
-        
-        extracted['corresponding_surfaces'] = extracted_surfaces
+        extracted['corresponding_surfaces'] = CorrespondingSurfaces(
+            extracted_pcs, extracted_eofs, modes=modes_to_extract
+        )
     
     return extracted
\ No newline at end of file
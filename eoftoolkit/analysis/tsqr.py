@@ -0,0 +1,124 @@
+"""Module for the parallel tall-skinny QR (TSQR) SVD of wide super matrices."""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from scipy import linalg
+
+
+def _attach(name, shape):
+    """Attach to a shared float64 array."""
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _qr_block_worker(x_name, x_shape, q_name, start, stop):
+    """QR-factorize one column block of the shared matrix (as rows of its transpose)."""
+    x_shm, matrix = _attach(x_name, x_shape)
+    q_shm, q = _attach(q_name, (x_shape[1], x_shape[0]))
+    try:
+        Q, R = linalg.qr(matrix[:, start:stop].T, mode='economic')
+        q[start:stop, :Q.shape[1]] = Q
+        del matrix, q
+    finally:
+        x_shm.close()
+        q_shm.close()
+
+    return R
+
+
+def _project_block_worker(q_name, q_shape, out_name, out_shape, start, stop, rotation):
+    """Write the right singular vectors of one column block into the shared output."""
+    q_shm, q = _attach(q_name, q_shape)
+    out_shm, out = _attach(out_name, out_shape)
+    try:
+        out[:, start:stop] = (q[start:stop, :rotation.shape[0]] @ rotation).T
+        del q, out
+    finally:
+        q_shm.close()
+        out_shm.close()
+
+
+def _create_shared(shape):
+    """Create a shared memory block for a float64 array."""
+    return shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+
+
+def tsqr_svd(matrix, num_modes=None, n_workers=None):
+    """
+    Compute the thin SVD of a wide matrix with a parallel tall-skinny QR.
+
+    The transpose Xᵀ (spatial locations x time steps) is tall and skinny. It
+    is split into row blocks (column blocks of X), each block is QR-factorized
+    in a worker process, and the stacked small R factors are reduced with one
+    more QR and an SVD of a (time steps x time steps) matrix. A second
+    parallel pass rotates the block Q factors into the EOFs.
+
+    The matrix is copied once into shared memory; workers attach to it and to
+    a shared Q workspace, so no block is pickled. Only the small R factors and
+    rotations travel between processes. For best scaling, limit BLAS to one
+    thread per worker (e.g. OMP_NUM_THREADS=1).
+
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with rows as time steps and columns as spatial locations.
+    num_modes : int, optional
+        Number of singular triplets to return. If None, returns all.
+    n_workers : int, optional
+        Number of worker processes. If None, uses the number of CPUs.
+
+    Returns
+    -------
+    tuple
+        (U, s, Vt).
+    """
+    n_rows, n_cols = matrix.shape
+    n_workers = n_workers or os.cpu_count() or 1
+
+    # Blocks of at least n_rows columns keep every R factor square
+    n_blocks = max(1, min(n_workers, n_cols // max(n_rows, 1)))
+    bounds = np.linspace(0, n_cols, n_blocks + 1).astype(int)
+    blocks = list(zip(bounds[:-1], bounds[1:]))
+
+    q_shape = (n_cols, n_rows)
+    x_shm = _create_shared((n_rows, n_cols))
+    q_shm = _create_shared(q_shape)
+    out_shm = None
+    try:
+        shared = np.ndarray((n_rows, n_cols), dtype=np.float64, buffer=x_shm.buf)
+        shared[:] = matrix
+        del shared
+
+        with ProcessPoolExecutor(max_workers=min(n_workers, n_blocks)) as executor:
+            futures = [executor.submit(_qr_block_worker, x_shm.name, (n_rows, n_cols),
+                                       q_shm.name, start, stop)
+                       for start, stop in blocks]
+            factors = [future.result() for future in futures]
+
+            # Reduce the stacked R factors: Xᵀ = Q_blocks Q2 R and R = Ur S Vrt
+            Q2, R = linalg.qr(np.vstack(factors), mode='economic')
+            Ur, s, Vrt = linalg.svd(R, full_matrices=False)
+
+            k = len(s) if num_modes is None else min(num_modes, len(s))
+            out_shape = (k, n_cols)
+            out_shm = _create_shared(out_shape)
+
+            offsets = np.cumsum([0] + [f.shape[0] for f in factors])
+            futures = [executor.submit(_project_block_worker, q_shm.name, q_shape,
+                                       out_shm.name, out_shape, start, stop,
+                                       Q2[offsets[i]:offsets[i + 1]] @ Ur[:, :k])
+                       for i, (start, stop) in enumerate(blocks)]
+            for future in futures:
+                future.result()
+
+            Vt = np.ndarray(out_shape, dtype=np.float64, buffer=out_shm.buf).copy()
+    finally:
+        for shm in (x_shm, q_shm, out_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    # X = Vrtᵀ S (Q_blocks Q2 Ur)ᵀ
+    return Vrt.T[:, :k], s[:k], Vt
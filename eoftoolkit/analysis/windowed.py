@@ -0,0 +1,195 @@
+"""Module for running EOF analyses on sliding time windows of one super matrix."""
+
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from scipy import linalg
+
+from eoftoolkit.analysis.svd import perform_svd, results_from_factors
+from eoftoolkit.core.exceptions import DimensionError
+
+
+def sliding_windows(n_rows, window, step=1):
+    """
+    Get the row ranges of sliding windows.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows (time steps) in the super matrix.
+    window : int
+        Window length in rows.
+    step : int, optional
+        Offset between consecutive windows in rows. Default is 1.
+
+    Returns
+    -------
+    list
+        List of (start, stop) row ranges.
+    """
+    if window < 2 or window > n_rows:
+        raise DimensionError(f"Window length must be between 2 and {n_rows}, got {window}")
+    if step < 1:
+        raise ValueError("Window step must be at least 1")
+
+    return [(start, start + window) for start in range(0, n_rows - window + 1, step)]
+
+
+def _centered_subspace_svd(view, means, num_modes, subspace, n_iter, tol):
+    """
+    Subspace iteration on a window with its column means removed inside the products.
+
+    The centered window X - 1 mᵀ is never formed: (X - 1 mᵀ) v = X v - 1 (mᵀ v)
+    and (X - 1 mᵀ)ᵀ q = Xᵀ q - m (1ᵀ q). The iteration runs on all columns of
+    `subspace` (the modes plus oversampling vectors), so the leading
+    `num_modes` Ritz vectors converge at the rate of the gap to the
+    oversampled ones. It stops once the leading left Ritz subspace moves by
+    less than `tol` (sine of the largest principal angle between consecutive
+    iterates), or after `n_iter` iterations.
+
+    Returns all Ritz triplets; the caller truncates them to `num_modes`.
+    """
+    def product(vectors):
+        return view @ vectors - np.outer(np.ones(view.shape[0]), means @ vectors)
+
+    def rproduct(vectors):
+        return view.T @ vectors - np.outer(means, vectors.sum(axis=0))
+
+    def ritz(Q):
+        # Exact SVD of the small projected matrix Qᵀ (X - 1 mᵀ)
+        projected = rproduct(Q)
+        Ub, s, Vt = linalg.svd(projected.T, full_matrices=False)
+        return projected, Q @ Ub, s, Vt
+
+    Q, _ = linalg.qr(product(subspace), mode='economic')
+    projected, U, s, Vt = ritz(Q)
+
+    iterations, change = 0, np.inf
+    while iterations < n_iter and change > tol:
+        Z, _ = linalg.qr(projected, mode='economic')
+        Q, _ = linalg.qr(product(Z), mode='economic')
+        leading = U[:, :num_modes]
+        projected, U, s, Vt = ritz(Q)
+        change = np.linalg.norm(U[:, :num_modes] - leading @ (leading.T @ U[:, :num_modes]), 2)
+        iterations += 1
+
+    convergence = {'iterations': iterations, 'subspace_change': change, 'tol': tol}
+    return U, s, Vt, convergence
+
+
+def _window_svds(super_matrix, windows, num_modes, compute_surfaces, warm_start, n_iter,
+                 random_state, center, tol, oversampling):
+    """Run the SVDs of consecutive windows, warm-starting each from the previous one."""
+    results = {}
+    subspace = None
+    rng = np.random.default_rng(random_state)
+
+    for start, stop in windows:
+        # Basic slicing gives a view; truncated SVDs never copy the window
+        view = super_matrix[start:stop]
+        means = view.mean(axis=0) if center else np.zeros(view.shape[1])
+
+        if num_modes is None:
+            # The dense decomposition needs its own copy of the window anyway
+            result = perform_svd(view - means if center else view, None, compute_surfaces)
+        else:
+            k = min(num_modes, *view.shape)
+            if subspace is None or not warm_start:
+                size = min(k + oversampling, *view.shape)
+                subspace = rng.standard_normal((view.shape[1], size))
+            U, s, Vt, convergence = _centered_subspace_svd(view, means, k, subspace,
+                                                           n_iter, tol)
+            total_variance = np.einsum('ij,ij->', view, view) - len(view) * means @ means
+            result = results_from_factors(U, s, Vt, k, total_variance=total_variance,
+                                          compute_surfaces=compute_surfaces)
+            result['convergence'] = convergence
+            # The next window starts from all Ritz vectors, oversampling included
+            subspace = Vt.T
+
+        result['rows'] = (start, stop)
+        result['means'] = means
+        results[start] = result
+
+    return results
+
+
+def run_windowed_svd(super_matrix, window, step=1, num_modes=None, compute_surfaces=False,
+                     warm_start=True, n_workers=1, n_iter=10, random_state=None, center=True,
+                     tol=1e-6, oversampling=10):
+    """
+    Run separate SVDs on sliding row windows of one super matrix.
+
+    By default each window is analysed as anomalies from its own temporal
+    mean. With `num_modes` set, each window uses a truncated SVD by subspace
+    iteration on a row view of the super matrix, with the mean removed inside
+    the matrix products, so no window is copied. Consecutive windows share
+    most of their rows, so starting from the previous window's right singular
+    subspace usually converges in a few iterations. Without `num_modes`, each
+    window gets a full SVD of a centered copy (the dense decomposition copies
+    its input in any case).
+
+    Parameters
+    ----------
+    super_matrix : ndarray
+        Super matrix with rows as time steps and columns as spatial locations.
+    window : int
+        Window length in rows.
+    step : int, optional
+        Offset between consecutive windows in rows. Default is 1.
+    num_modes : int, optional
+        Number of modes per window. If None, runs a full SVD of each window
+        (no warm start).
+    compute_surfaces : bool, optional
+        Whether to compute corresponding surfaces. Default is False.
+    warm_start : bool, optional
+        Whether to start each window's truncated SVD from the previous window's
+        subspace. Default is True.
+    n_workers : int, optional
+        Number of threads. Windows are split into this many runs of consecutive
+        windows, each warm-started within the run. Threads share the super
+        matrix without copies. If None, uses the number of CPUs.
+        Default is 1.
+    n_iter : int, optional
+        Maximum number of subspace iterations per truncated SVD. Default is 10.
+    random_state : int or Generator, optional
+        Seed for the random starting subspace of each run.
+    center : bool, optional
+        Whether to subtract each window's own column means before its SVD.
+        Default is True.
+    tol : float, optional
+        Truncated SVDs stop iterating once the sine of the largest principal
+        angle between consecutive leading left subspaces falls below `tol`.
+        Default is 1e-6.
+    oversampling : int, optional
+        Extra vectors iterated along with the `num_modes` modes of truncated
+        SVDs, to speed up convergence. Default is 10.
+
+    Returns
+    -------
+    dict
+        Dictionary with the first row of each window as keys and SVD results as
+        values. Each result also holds 'rows', the (start, stop) row range, and
+        'means', the subtracted column means of the window. Truncated results
+        hold 'convergence' with the 'iterations' run, the final
+        'subspace_change' and the 'tol'.
+    """
+    windows = sliding_windows(super_matrix.shape[0], window, step)
+    args = (num_modes, compute_surfaces, warm_start, n_iter, random_state, center, tol,
+            oversampling)
+
+    if n_workers == 1:
+        return _window_svds(super_matrix, windows, *args)
+
+    # Contiguous runs of windows keep the warm start within each thread
+    n_runs = min(len(windows), n_workers or os.cpu_count() or 1)
+    runs = np.array_split(np.arange(len(windows)), n_runs)
+
+    with ThreadPoolExecutor(max_workers=n_runs) as executor:
+        futures = [executor.submit(_window_svds, super_matrix, [windows[i] for i in run], *args)
+                   for run in runs]
+
+        results = {}
+        for future in futures:
+            results.update(future.result())
+
+    return results
@@ -2,5 +2,6 @@
 
 from eoftoolkit.core.processor import EOFProcessor
 from eoftoolkit.core.exceptions import EOFToolkitError
+from eoftoolkit.core.pipeline import Pipeline
 
-__all__ = ['EOFProcessor', 'EOFToolkitError']
\ No newline at end of file
+__all__ = ['EOFProcessor', 'EOFToolkitError', 'Pipeline']
\ No newline at end of file
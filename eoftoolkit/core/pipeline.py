@@ -0,0 +1,166 @@
+"""Stage-level cache for the EOF processing pipeline."""
+
+import os
+import pickle
+import hashlib
+
+from eoftoolkit.core.exceptions import EOFToolkitError
+
+
+def _hash_items(*items):
+    """Return a stable hex digest for picklable items."""
+    digest = hashlib.sha1()
+    for item in items:
+        digest.update(pickle.dumps(item, protocol=4))
+    return digest.hexdigest()
+
+
+class Pipeline:
+    """
+    Run named stages and cache their outputs.
+
+    Each stage output is stored under a key derived from the stage name, its
+    own parameters and the keys of the stages it depends on. A stage is rerun
+    only when that key changes, so changing a late parameter (e.g. centering)
+    reuses everything upstream of it.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Directory where stage outputs are also pickled. Outputs found there are
+        reused across processor instances and sessions. If None, outputs are
+        cached in memory only.
+    verbose : bool, optional
+        Whether to print a message when a cached output is reused. Default is False.
+    """
+
+    def __init__(self, cache_dir=None, verbose=False):
+        """Initialize an empty pipeline cache."""
+        self.cache_dir = cache_dir
+        self.verbose = verbose
+        self._keys = {}
+        self._outputs = {}
+        self._depends = {}
+        self.last_run = {}
+
+    def run(self, name, func, params=None, depends=(), key_from_output=False):
+        """
+        Run a stage, or return its cached output if nothing it depends on changed.
+
+        Parameters
+        ----------
+        name : str
+            Stage name.
+        func : callable
+            Function computing the stage output. It is called with the outputs of
+            the stages in `depends` as positional arguments and `params` as
+            keyword arguments.
+        params : dict, optional
+            Stage parameters. They must be picklable.
+        depends : sequence of str, optional
+            Names of upstream stages.
+        key_from_output : bool, optional
+            If True, the stage always runs and its key is derived from its output.
+            Used for stages that observe external state, such as a directory scan.
+
+        Returns
+        -------
+        object
+            Stage output.
+        """
+        params = params or {}
+
+        for dep in depends:
+            if dep not in self._keys:
+                raise EOFToolkitError(f"Stage '{name}' depends on '{dep}', which has not been run")
+
+        self._depends[name] = tuple(depends)
+        upstream_keys = [self._keys[dep] for dep in depends]
+        upstream = [self._outputs[dep] for dep in depends]
+
+        if key_from_output:
+            output = func(*upstream, **params)
+            key = _hash_items(name, sorted(params.items()), upstream_keys, output)
+            if self._keys.get(name) != key:
+                self._drop_downstream(name)
+            self._store(name, key, output, to_disk=False)
+            self.last_run[name] = 'computed'
+            return output
+
+        key = _hash_items(name, sorted(params.items()), upstream_keys)
+
+        # In-memory hit
+        if self._keys.get(name) == key:
+            self.last_run[name] = 'cached'
+            if self.verbose:
+                print(f"Using cached {name} stage.")
+            return self._outputs[name]
+
+        # Parameters or upstream changed, so anything cached downstream is stale
+        self._drop_downstream(name)
+
+        # On-disk hit
+        path = self._cache_path(name, key)
+        if path is not None and os.path.exists(path):
+            with open(path, 'rb') as f:
+                output = pickle.load(f)
+            self._store(name, key, output, to_disk=False)
+            self.last_run[name] = 'cached'
+            if self.verbose:
+                print(f"Loaded cached {name} stage from {path}.")
+            return output
+
+        output = func(*upstream, **params)
+        self._store(name, key, output)
+        self.last_run[name] = 'computed'
+        return output
+
+    def key(self, name):
+        """Return the current key of a stage, or None if it has not been run."""
+        return self._keys.get(name)
+
+    def output(self, name):
+        """Return the current output of a stage, or None if it has not been run."""
+        return self._outputs.get(name)
+
+    def invalidate(self, name=None):
+        """
+        Drop cached outputs from memory.
+
+        Parameters
+        ----------
+        name : str, optional
+            Stage to drop, together with every stage that depends on it.
+            If None, drops all stages. Outputs on disk are kept.
+        """
+        if name is None:
+            self._keys.clear()
+            self._outputs.clear()
+            return
+
+        self._drop_downstream(name)
+        self._keys.pop(name, None)
+        self._outputs.pop(name, None)
+
+    def _drop_downstream(self, name):
+        """Drop every cached stage that (transitively) depends on a stage."""
+        for stage, deps in list(self._depends.items()):
+            if name in deps and stage in self._keys:
+                self.invalidate(stage)
+
+    def _store(self, name, key, output, to_disk=True):
+        """Store a stage output in memory and, if configured, on disk."""
+        self._keys[name] = key
+        self._outputs[name] = output
+
+        path = self._cache_path(name, key)
+        if to_disk and path is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path, 'wb') as f:
+                pickle.dump(output, f, protocol=4)
+
+    def _cache_path(self, name, key):
+        """Path of the on-disk cache file for a stage output."""
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, f"{name}-{key}.pkl")
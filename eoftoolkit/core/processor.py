@@ -1,20 +1,40 @@
 """Main processor class for EOFtoolkit."""
 
 import os
+import hashlib
 import numpy as np
 import pandas as pd
 from datetime import datetime
 
 from eoftoolkit.core.exceptions import EOFToolkitError, FileReadError, DimensionError
+from eoftoolkit.core.pipeline import Pipeline
 from eoftoolkit.io.sorter import sort_files_by_date
 from eoftoolkit.io.reader import read_netcdf
 from eoftoolkit.processor.dimensions import standardize_dimensions
-from eoftoolkit.processor.masking import create_binary_mask, create_super_mask
+from eoftoolkit.processor.coarsening import coarsen_matrix
+from eoftoolkit.processor.masking import (
+    create_binary_mask, count_valid_cells, super_mask_from_counts, threshold_curve
+)
 from eoftoolkit.processor.identification import create_id_matrix, get_id_coordinates
-from eoftoolkit.processor.flattener import flatten_matrices, center_matrices
-from eoftoolkit.processor.stacker import create_super_matrix
-from eoftoolkit.analysis.svd import perform_svd
+from eoftoolkit.processor.flattener import flatten_matrices
+from eoftoolkit.processor.centering import (
+    StreamingMean, center_super_matrix, climatology_groups
+)
+from eoftoolkit.processor.detrending import detrend_super_matrix, restore_trend
+from eoftoolkit.processor.filtering import filter_super_matrix
+from eoftoolkit.processor.sparse import (
+    SparseGrid, sparse_target_dims, count_sparse_valid_cells, flatten_sparse_grids
+)
+from eoftoolkit.analysis.svd import (
+    perform_svd, update_svd, extend_modes, results_from_factors, DEFAULT_BLOCK_BYTES
+)
+from eoftoolkit.analysis.incremental import IncrementalSVD
 from eoftoolkit.analysis.reconstruction import reconstruct_from_modes
+from eoftoolkit.analysis.regional import run_regional_svd, select_region_columns
+from eoftoolkit.analysis.gapfill import dineof_fill
+from eoftoolkit.analysis.windowed import run_windowed_svd
+from eoftoolkit.analysis.ensemble import run_ensemble_svd
+from eoftoolkit.geo.grid import compute_latitude_weights
 
 
 class EOFProcessor:
@@ -31,13 +51,17 @@ class EOFProcessor:
     7. Performing SVD analysis
     8. Reconstructing data
     
+    Each step runs as a cached stage (scan, read, standardize, mask, id,
+    flatten, center, stack, svd, reconstruct). A stage is recomputed only
+    when its own parameters or an upstream stage change.
+    
     Parameters
     ----------
     verbose : bool, optional
         Whether to print progress messages. Default is True.
     """
     
-    def __init__(self, verbose=True, projection='merc', projection_params=None):
+    def __init__(self, verbose=True, projection='merc', projection_params=None, cache_dir=None):
         """
         Initialize EOFProcessor.
         
@@ -49,10 +73,16 @@ class EOFProcessor:
             Map projection to use for visualization. Default is 'merc' (Mercator).
         projection_params : dict, optional
             Dictionary of projection parameters for visualization.
+        cache_dir : str, optional
+            Directory where pipeline stage outputs are also cached on disk.
+            If None, stages are cached in memory only.
         """
         self.verbose = verbose
         self.projection = projection
         self.projection_params = projection_params or {}
+        self._weight_cache = {}
+        self._pipeline = Pipeline(cache_dir=cache_dir, verbose=verbose)
+        self._variable_processors = {}
         self.reset()
     
     def reset(self):
@@ -63,6 +93,7 @@ class EOFProcessor:
         self.standardized_data = None
         self.target_dims = None
         self.mask_dict = None
+        self.valid_counts = None
         self.super_mask = None
         self.id_matrix = None
         self.id_coordinates = None
@@ -70,17 +101,37 @@ class EOFProcessor:
         self.latitude = None
         self.flattened_data = None
         self.flattened_id_matrix = None
-        self.centered_data = None
+        self.centering = None
+        self.detrending = None
         self.mean_dict = None
+        self.weights = None
+        self.gap_fill_info = None
+        self.temporal_filter = None
         self.super_matrix = None
         self.svd_results = None
+        self.svd_settings = None
+        self.svd_updates = 0
+        self._row_buffer = None
         self.reconstruction_results = None
-        # Keep projection settings
-        # self.projection and self.projection_params are preserved
+        self.regional_results = None
+        self.windowed_results = None
+        self.variables = None
+        self.ensemble_matrix = None
+        self.ensemble_members = None
+        self.ensemble_centering = None
+        self.ensemble_results = None
+        # Keep projection settings and caches
+        # self.projection, self.projection_params, self._weight_cache,
+        # self._pipeline and self._variable_processors are preserved;
+        # use clear_cache() to drop cached stages
     
     def process_directory(self, directory_path, file_extension='.nc', 
                         date_pattern=None, date_format=None,
-                        start_date=None, end_date=None):
+                        start_date=None, end_date=None, centering='spatial',
+                        climatology_period=12, climatology_by=None, detrend=None,
+                        weighting=None, coarsen=None,
+                        sparse=False, min_valid_fraction=None, gap_fill_modes=None,
+                        temporal_filter=None, as_masked=True, stream_svd=None):
         """
         Process a directory of NetCDF files.
         
@@ -98,129 +149,659 @@ class EOFProcessor:
             Start date for filtering files.
         end_date : str or datetime, optional
             End date for filtering files.
+        centering : str or None, optional
+            How to center the super matrix: 'spatial' (mean of each timestamp),
+            'temporal' (mean of each cell), 'climatology' (mean of each cell per
+            position in the seasonal cycle) or None to skip centering.
+            Default is 'spatial'.
+        climatology_period : int, optional
+            Number of timestamps per cycle for 'climatology' centering when
+            `climatology_by` is None. Default is 12 (monthly data).
+        climatology_by : str, optional
+            Group rows for 'climatology' centering by the dates parsed from the
+            file names instead of by position: 'month' or 'dayofyear'. The
+            climatology is then computed with a grouped reduction over the super
+            matrix rows and subtracted in place, which also handles missing or
+            irregular timestamps. Default is None.
+        detrend : int, optional
+            Order of a polynomial trend (1 for linear) removed from every cell
+            before centering, fitted for all cells in one least-squares solve.
+            The trend is kept in `detrending` and can be added back with
+            `get_reconstruction(add_trend=True)`. Default is None (no detrending).
+        weighting : str or None, optional
+            Area weighting applied to the super matrix. 'coslat' scales each cell
+            by sqrt(cos(latitude)); EOFs and reconstructions returned by the getters
+            are un-weighted again. Default is None (no weighting).
+        coarsen : int or tuple, optional
+            Block size for a NaN-aware block average applied to every grid and to
+            the coordinate grids as files are read, e.g. 4 for a 4x coarser preview.
+            Default is None (full resolution).
+        sparse : bool, optional
+            Whether to keep each grid as its valid cells only (SparseGrid) from the
+            moment it is read, instead of full (rows, cols) arrays. Recommended for
+            mostly-masked grids. Full grids are then only built by the getters and
+            plots, for the field requested. Default is False.
+        min_valid_fraction : float, optional
+            Keep cells that have data in at least this fraction of timestamps,
+            instead of only cells present in every timestamp. The remaining gaps
+            are filled DINEOF-style with a rank-`gap_fill_modes` reconstruction
+            (see `eoftoolkit.analysis.gapfill.dineof_fill`). Default is None
+            (cells must be present in every timestamp).
+        gap_fill_modes : int, optional
+            Number of modes used to fill gaps when `min_valid_fraction` is set.
+            If None, it is chosen by DINEOF cross-validation. Default is None.
+        temporal_filter : dict, optional
+            Keyword arguments for `eoftoolkit.processor.filtering.filter_super_matrix`,
+            applied to all cells of the finished super matrix right before the SVD,
+            e.g. {'method': 'butterworth', 'periods': (24, None)} to keep only
+            variability slower than 24 time steps. Default is None (no filtering).
+        as_masked : bool, optional
+            Whether grids are read as masked arrays. If False, fill values are
+            turned into NaN once on read and the pipeline works on plain float
+            arrays and boolean validity masks, which is faster and uses less
+            memory. Default is True.
+        stream_svd : dict, optional
+            Options for an incremental SVD (see `eoftoolkit.analysis.IncrementalSVD`)
+            fed with each block of rows as the super matrix is assembled, e.g.
+            {'num_modes': 5, 'block_size': 64}. 'num_modes' is required;
+            'oversampling' and 'compute_surfaces' (default False) are also
+            accepted. The SVD results are then available in `svd_results` without
+            another pass over the super matrix. Every row must be complete when it
+            is stacked, so `detrend`, `temporal_filter`, `climatology_by` and gaps
+            from `min_valid_fraction` are not supported. Default is None.
             
         Returns
         -------
         dict
             Processing results containing super_matrix, id_matrix, etc.
         """
-        # Sort files by date
+        stages = self._ingest_stages(
+            directory_path, file_extension, date_pattern, date_format, start_date,
+            end_date, centering, climatology_period, climatology_by, coarsen, sparse,
+            min_valid_fraction, as_masked
+        )
+        stages['stack'] = self._pipeline.run('stack', self._stack_stage, params={
+            'detrend': detrend,
+            'weighting': weighting,
+            'gap_fill_modes': gap_fill_modes,
+            'temporal_filter': temporal_filter,
+            'stream_svd': stream_svd
+        }, depends=['scan', 'read', 'mask', 'flatten', 'center'])
+        
+        self._expose_stages(stages)
+        self.variables = None
+        self.ensemble_matrix = None
+        self.ensemble_members = None
+        self.ensemble_centering = None
+        self.ensemble_results = None
+        
+        if centering == 'spatial':
+            self.mean_dict = {
+                key: self.centering['means'][i:i+1] for i, key in enumerate(self.file_keys)
+            }
+        
+        # Results downstream of the super matrix belong to the previous run
+        self.svd_results = stages['stack'].get('svd')
+        self.svd_settings = None
+        if self.svd_results is not None:
+            self.svd_results['super_matrix'] = self.super_matrix
+            self.svd_settings = {'method': 'incremental', 'random_state': None,
+                                 **{key: value for key, value in stream_svd.items()
+                                    if key in ('block_size', 'oversampling')}}
+        self.svd_updates = 0
+        self._row_buffer = None
+        self.reconstruction_results = None
+        self.regional_results = None
+        self.windowed_results = None
+        
+        if self.verbose:
+            print("Processing complete.")
+        
+        # Return processing results
+        return {
+            'super_matrix': self.super_matrix,
+            'id_matrix': self.id_matrix,
+            'super_mask': self.super_mask,
+            'longitude': self.longitude,
+            'latitude': self.latitude,
+            'file_keys': self.file_keys,
+            'target_dims': self.target_dims
+        }
+    
+    def _ingest_stages(self, directory_path, file_extension='.nc', date_pattern=None,
+                       date_format=None, start_date=None, end_date=None, centering='spatial',
+                       climatology_period=12, climatology_by=None, coarsen=None, sparse=False,
+                       min_valid_fraction=None, as_masked=True):
+        """Run the cached stages up to (not including) the super matrix."""
+        # Each stage is rerun only if its own parameters or an upstream stage changed
+        pipeline = self._pipeline
+        pipeline.verbose = self.verbose
+        
+        scan = pipeline.run('scan', self._scan_stage, params={
+            'directory_path': directory_path,
+            'file_extension': file_extension,
+            'date_pattern': date_pattern,
+            'date_format': date_format,
+            'start_date': start_date,
+            'end_date': end_date
+        }, key_from_output=True)
+        read = pipeline.run('read', self._read_stage, params={
+            'coarsen': coarsen,
+            'sparse': sparse,
+            'as_masked': as_masked
+        }, depends=['scan'])
+        standardized = pipeline.run('standardize', self._standardize_stage,
+                                    depends=['read'])
+        masks = pipeline.run('mask', self._mask_stage,
+                             params={'min_valid_fraction': min_valid_fraction,
+                                     'as_masked': as_masked},
+                             depends=['standardize'])
+        ids = pipeline.run('id', self._id_stage, depends=['mask', 'read'])
+        flattened = pipeline.run('flatten', self._flatten_stage,
+                                 depends=['standardize', 'mask', 'id'])
+        center = pipeline.run('center', self._center_stage, params={
+            'centering': centering,
+            'climatology_period': climatology_period,
+            'climatology_by': climatology_by
+        }, depends=['scan', 'flatten'])
+        
+        return {'scan': scan, 'read': read, 'standardize': standardized, 'mask': masks,
+                'id': ids, 'flatten': flattened, 'center': center}
+    
+    def _expose_stages(self, stages):
+        """Expose stage outputs as processor attributes."""
+        scan, read = stages['scan'], stages['read']
+        standardized, masks, ids = stages['standardize'], stages['mask'], stages['id']
+        flattened, stacked = stages['flatten'], stages['stack']
+        
+        self.file_paths = scan['file_paths']
+        self.file_keys = scan['file_keys']
+        self.data_dict = read['data_dict']
+        self.longitude = read['longitude']
+        self.latitude = read['latitude']
+        self.standardized_data = standardized['standardized_data']
+        self.target_dims = standardized['target_dims']
+        self.mask_dict = masks['mask_dict']
+        self.valid_counts = masks['valid_counts']
+        self.super_mask = masks['super_mask']
+        self.id_matrix = ids['id_matrix']
+        self.id_coordinates = ids['id_coordinates']
+        self.flattened_data = flattened['flattened_data']
+        self.flattened_id_matrix = flattened['flattened_id_matrix']
+        self.super_matrix = stacked['super_matrix']
+        self.centering = stacked['centering']
+        self.detrending = stacked['detrending']
+        self.weights = stacked['weights']
+        self.gap_fill_info = stacked['gap_fill']
+        self.temporal_filter = stacked['filtering']
+        self.mean_dict = None
+    
+    def _scan_stage(self, directory_path, file_extension, date_pattern, date_format,
+                    start_date, end_date):
+        """Find, sort and filter input files."""
         if self.verbose:
             print("Sorting files by date...")
         
-        self.file_paths = sort_files_by_date(
-            directory_path, file_extension, date_pattern, date_format
+        file_paths, dates = sort_files_by_date(
+            directory_path, file_extension, date_pattern, date_format, return_dates=True
         )
+        date_of = dict(zip(file_paths, dates))
         
-        if not self.file_paths:
+        if not file_paths:
             raise FileReadError(f"No {file_extension} files found in {directory_path}")
         
         # Filter files by date range if provided
         if start_date is not None and end_date is not None:
             from eoftoolkit.core.utils import filter_files_by_date_range
             
-            self.file_paths = filter_files_by_date_range(
-                self.file_paths, start_date, end_date, date_pattern, date_format
+            file_paths = filter_files_by_date_range(
+                file_paths, start_date, end_date, date_pattern, date_format
             )
             
-            if not self.file_paths:
+            if not file_paths:
                 raise FileReadError(f"No files found in date range {start_date} to {end_date}")
         
+        dates = [date_of[fp] for fp in file_paths]
+        
         # Extract file keys (basenames without extension)
-        self.file_keys = [os.path.splitext(os.path.basename(fp))[0] for fp in self.file_paths]
+        file_keys = [os.path.splitext(os.path.basename(fp))[0] for fp in file_paths]
+        
+        # Size and modification time let the cache notice edited files
+        signature = []
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            signature.append((file_path, stat.st_size, stat.st_mtime_ns))
+        
+        return {'file_paths': file_paths, 'file_keys': file_keys, 'dates': dates,
+                'signature': signature}
+    
+    def _read_stage(self, scan, coarsen, sparse, as_masked):
+        """Read all files, optionally coarsening or sparsifying each grid as it is read."""
+        file_paths = scan['file_paths']
         
-        # Read NetCDF files
         if self.verbose:
-            print(f"Reading {len(self.file_paths)} NetCDF files...")
+            print(f"Reading {len(file_paths)} NetCDF files...")
         
-        self.data_dict = {}
+        data_dict = {}
+        longitude = None
+        latitude = None
         
-        for i, (file_path, file_key) in enumerate(zip(self.file_paths, self.file_keys)):
+        for i, (file_path, file_key) in enumerate(zip(file_paths, scan['file_keys'])):
             if self.verbose:
                 from eoftoolkit.core.utils import print_progress
-                print_progress(i+1, len(self.file_paths), prefix='Reading files:', suffix='Complete')
+                print_progress(i+1, len(file_paths), prefix='Reading files:', suffix='Complete')
             
             # Read file
             try:
-                data = read_netcdf(file_path)
-                self.data_dict[file_key] = data
+                data = read_netcdf(file_path, as_masked=as_masked)
+                
+                # Coarsen before anything else touches the full-resolution grid
+                if coarsen is not None:
+                    data['z'] = coarsen_matrix(data['z'], coarsen)
+                    if i == 0:
+                        data['longitude'] = coarsen_matrix(data['longitude'], coarsen)
+                        data['latitude'] = coarsen_matrix(data['latitude'], coarsen)
+                
+                # Keep only the valid cells
+                if sparse:
+                    data['z'] = SparseGrid.from_dense(data['z'])
+                
+                data_dict[file_key] = data
                 
                 # Store longitude and latitude grids from the first file
                 if i == 0:
-                    self.longitude = data['longitude']
-                    self.latitude = data['latitude']
+                    longitude = data['longitude']
+                    latitude = data['latitude']
             
             except Exception as e:
                 raise FileReadError(f"Error reading file {file_path}: {str(e)}")
         
-        # Standardize dimensions
+        return {'data_dict': data_dict, 'longitude': longitude, 'latitude': latitude}
+    
+    def _standardize_stage(self, read):
+        """Pad all grids to common dimensions."""
         if self.verbose:
             print("Standardizing dimensions...")
         
         # Extract 'z' values from data_dict
-        z_dict = {key: data['z'] for key, data in self.data_dict.items()}
-        
-        # Standardize dimensions
-        self.standardized_data, self.target_dims = standardize_dimensions(z_dict)
-        
-        # Create binary masks
-        if self.verbose:
-            print("Creating binary masks...")
+        z_dict = {key: data['z'] for key, data in read['data_dict'].items()}
         
-        self.mask_dict = {}
-        for key, matrix in self.standardized_data.items():
-            self.mask_dict[key] = create_binary_mask(matrix)
+        # Sparse grids are aligned by index, so they are never padded
+        if all(isinstance(z, SparseGrid) for z in z_dict.values()):
+            return {'standardized_data': z_dict, 'target_dims': sparse_target_dims(z_dict)}
         
-        # Create super mask
-        if self.verbose:
-            print("Creating super mask...")
+        standardized_data, target_dims = standardize_dimensions(z_dict)
         
-        self.super_mask = create_super_mask(self.mask_dict)
+        return {'standardized_data': standardized_data, 'target_dims': target_dims}
+    
+    def _mask_stage(self, standardized, min_valid_fraction, as_masked):
+        """Create binary masks, the per-cell valid counts and the super mask."""
+        standardized_data = standardized['standardized_data']
+        
+        # Minimum number of timestamps a cell needs; by default only complete cells
+        threshold = len(standardized_data)
+        if min_valid_fraction is not None:
+            if not 0 < min_valid_fraction <= 1:
+                raise ValueError("min_valid_fraction must be in (0, 1]")
+            threshold = int(np.ceil(min_valid_fraction * len(standardized_data)))
+        
+        if all(isinstance(z, SparseGrid) for z in standardized_data.values()):
+            if self.verbose:
+                print("Creating super mask from valid cells...")
+            
+            mask_dict = None
+            valid_counts = count_sparse_valid_cells(standardized_data,
+                                                    standardized['target_dims'])
+        else:
+            if self.verbose:
+                print("Creating binary masks...")
+            
+            mask_dict = {}
+            for key, matrix in standardized_data.items():
+                mask_dict[key] = create_binary_mask(matrix, as_bool=not as_masked)
+            
+            if self.verbose:
+                print("Creating super mask...")
+            
+            valid_counts = count_valid_cells(mask_dict)
         
-        # Create ID matrix
+        # Counts are kept so other thresholds can be explored without re-reading
+        return {'mask_dict': mask_dict, 'valid_counts': valid_counts,
+                'super_mask': super_mask_from_counts(valid_counts, threshold)}
+    
+    def _id_stage(self, masks, read):
+        """Create the ID matrix and ID coordinates."""
         if self.verbose:
             print("Creating ID matrix...")
         
-        self.id_matrix = create_id_matrix(self.super_mask)
-        self.id_coordinates = get_id_coordinates(self.id_matrix, self.longitude, self.latitude)
+        id_matrix = create_id_matrix(masks['super_mask'])
+        id_coordinates = get_id_coordinates(id_matrix, read['longitude'], read['latitude'])
         
-        # Flatten matrices
+        return {'id_matrix': id_matrix, 'id_coordinates': id_coordinates}
+    
+    def _flatten_stage(self, standardized, masks, ids):
+        """Flatten each grid to its valid cells."""
         if self.verbose:
             print("Flattening matrices...")
         
-        self.flattened_data, self.flattened_id_matrix = flatten_matrices(
-            self.standardized_data, self.id_matrix, self.super_mask
-        )
+        standardized_data = standardized['standardized_data']
+        super_mask = masks['super_mask']
         
-        # Center matrices
-        if self.verbose:
-            print("Centering matrices...")
+        if all(isinstance(z, SparseGrid) for z in standardized_data.values()):
+            flattened_data = flatten_sparse_grids(standardized_data, super_mask)
+            flattened_id_matrix = ids['id_matrix'][super_mask == 1].reshape(1, -1)
+        else:
+            flattened_data, flattened_id_matrix = flatten_matrices(
+                standardized_data, ids['id_matrix'], super_mask
+            )
         
-        self.centered_data, self.mean_dict = center_matrices(
-            self.flattened_data, axis=1, return_means=True
-        )
+        return {'flattened_data': flattened_data, 'flattened_id_matrix': flattened_id_matrix}
+    
+    def _center_stage(self, scan, flattened, centering, climatology_period, climatology_by):
+        """Accumulate the means needed for centering in one streaming pass."""
+        groups = None
+        if centering == 'climatology':
+            if climatology_by is not None:
+                # Date-based groups are reduced over the stacked rows instead
+                groups = climatology_groups(scan['dates'], by=climatology_by)
+                return {'mode': centering, 'groups': groups, 'accumulator': None}
+            
+            groups = np.arange(len(scan['file_keys'])) % climatology_period
+        
+        accumulator = StreamingMean()
+        if centering in ('temporal', 'climatology'):
+            if self.verbose:
+                print(f"Accumulating {centering} means...")
+            
+            for i, key in enumerate(scan['file_keys']):
+                accumulator.update(flattened['flattened_data'][key],
+                                   None if groups is None else groups[i])
+        
+        return {'mode': centering, 'groups': groups, 'accumulator': accumulator}
+    
+    def _stack_stage(self, scan, read, masks, flattened, center, detrend=None, weighting=None,
+                     gap_fill_modes=None, temporal_filter=None, stream_svd=None, out=None):
+        """
+        Assemble the super matrix, then detrend, center, weight, gap-fill and filter it in place.
         
-        # Create super matrix
+        If `out` is given, the rows are written into it (e.g. a column block of a
+        larger matrix) instead of a new array. If `stream_svd` is given, rows are
+        centered and weighted block by block as they are written, and each block
+        updates an incremental SVD (see _stream_stack).
+        """
         if self.verbose:
             print("Creating super matrix...")
         
-        self.super_matrix, _ = create_super_matrix(self.centered_data, keys=self.file_keys)
+        file_keys = scan['file_keys']
+        flattened_data = flattened['flattened_data']
+        shape = (len(file_keys), flattened['flattened_id_matrix'].shape[1])
+        
+        if out is None:
+            super_matrix = np.empty(shape)
+        elif out.shape != shape:
+            raise DimensionError(f"Output block has shape {out.shape}, expected {shape}")
+        else:
+            super_matrix = out
+        
+        if stream_svd is not None:
+            if detrend is not None or temporal_filter is not None:
+                raise EOFToolkitError("stream_svd cannot be combined with detrend or "
+                                      "temporal_filter, which need every row first")
+            return self._stream_stack(file_keys, flattened_data, super_matrix, read, masks,
+                                      center, weighting, stream_svd)
+        
+        for i, key in enumerate(file_keys):
+            super_matrix[i, :] = flattened_data[key]
+        
+        # Remove trends in place before centering
+        detrending = None
+        if detrend is not None:
+            if self.verbose:
+                print(f"Removing order {detrend} trends...")
+            
+            detrending = detrend_super_matrix(super_matrix, order=detrend)
+        
+        # Center super matrix in place
+        centering = None
+        if center['mode'] is not None:
+            if self.verbose:
+                print(f"Centering super matrix ({center['mode']})...")
+            
+            # Means accumulated during ingest are those of the data before
+            # detrending, so a detrended matrix is centered from its own rows
+            centering = center_super_matrix(
+                super_matrix, mode=center['mode'], groups=center['groups'],
+                accumulator=None if detrending is not None else center['accumulator']
+            )
+        
+        # Apply area weights in place by broadcasting over rows
+        weights = None
+        if weighting is not None:
+            if self.verbose:
+                print(f"Applying {weighting} weights...")
+            
+            weights = self._get_weights(weighting, read['latitude'], masks['super_mask'])
+            super_matrix *= weights
+        
+        # Fill gaps left by a partial super mask, after weighting so the filling
+        # modes are the ones the SVD will see
+        gap_fill = None
+        if np.isnan(super_matrix).any():
+            if self.verbose:
+                print("Filling gaps...")
+            
+            gap_fill = dineof_fill(super_matrix, gap_fill_modes, verbose=self.verbose)
+            
+            if self.verbose:
+                print(f"Filled gaps with {gap_fill['num_modes']} modes "
+                      f"in {gap_fill['iterations']} iterations.")
+            
+            # The filled values shift the means, so center again in unweighted
+            # space and fold the extra means into the stored ones
+            if centering is not None:
+                scale = 1.0
+                if weights is not None:
+                    scale = np.where(weights > 0, weights, 1.0)
+                    super_matrix /= scale
+                
+                extra = center_super_matrix(super_matrix, mode=centering['mode'],
+                                            groups=centering['groups'])
+                super_matrix *= scale
+                centering = dict(centering, means=centering['means'] + extra['means'])
+        
+        # Filter along time last, once the matrix is complete; the filter is
+        # linear per cell, so it commutes with the per-cell weights
+        filtering = None
+        if temporal_filter is not None:
+            if self.verbose:
+                print(f"Applying {temporal_filter.get('method', 'butterworth')} temporal filter...")
+            
+            filtering = filter_super_matrix(super_matrix, **temporal_filter)
+        
+        return {'super_matrix': super_matrix, 'centering': centering,
+                'detrending': detrending, 'weights': weights, 'gap_fill': gap_fill,
+                'filtering': filtering}
+    
+    def _stream_stack(self, file_keys, flattened_data, super_matrix, read, masks, center,
+                      weighting, stream_svd):
+        """
+        Stack, center and weight the super matrix in row blocks, updating an incremental SVD.
+        
+        Centering means come from the ingest accumulator (or from each row for
+        'spatial'), so a block is final as soon as it is written and the SVD
+        needs no second pass over the super matrix.
+        """
+        options = dict(stream_svd)
+        if 'num_modes' not in options:
+            raise EOFToolkitError("stream_svd requires num_modes")
+        num_modes = options.pop('num_modes')
+        block_size = options.pop('block_size', None)
+        compute_surfaces = options.pop('compute_surfaces', False)
+        engine = IncrementalSVD(num_modes, **options)
+        
+        mode = center['mode']
+        if mode in ('temporal', 'climatology') and center['accumulator'] is None:
+            raise EOFToolkitError("stream_svd needs centering means accumulated during "
+                                  "ingest; climatology_by is not supported")
+        
+        weights = None
+        if weighting is not None:
+            weights = self._get_weights(weighting, read['latitude'], masks['super_mask'])
+        
+        n_rows, n_cols = super_matrix.shape
+        if block_size is None:
+            block_size = max(1, DEFAULT_BLOCK_BYTES // (super_matrix.itemsize * max(n_cols, 1)))
         
         if self.verbose:
-            print("Processing complete.")
+            print(f"Creating super matrix with a streamed {num_modes}-mode SVD...")
+        
+        block_means = []
+        for start in range(0, n_rows, block_size):
+            stop = min(start + block_size, n_rows)
+            block = super_matrix[start:stop]
+            for i in range(start, stop):
+                block[i - start] = flattened_data[file_keys[i]]
+            
+            if np.isnan(block).any():
+                raise EOFToolkitError("stream_svd needs complete rows, but the super "
+                                      "matrix has gaps (see min_valid_fraction)")
+            
+            if mode is not None:
+                groups = None if center['groups'] is None else center['groups'][start:stop]
+                block_centering = center_super_matrix(block, mode=mode, groups=groups,
+                                                      accumulator=center['accumulator'])
+                block_means.append(block_centering['means'])
+            if weights is not None:
+                block *= weights
+            
+            engine.update(block)
+        
+        # Centering information as center_super_matrix returns it for the whole matrix
+        centering = None
+        if mode == 'spatial':
+            centering = {'mode': mode, 'means': np.vstack(block_means), 'labels': None,
+                         'groups': None}
+        elif mode == 'temporal':
+            centering = {'mode': mode, 'means': block_means[0], 'labels': None,
+                         'groups': None}
+        elif mode == 'climatology':
+            labels, group_index = np.unique(center['groups'], return_inverse=True)
+            centering = {'mode': mode,
+                         'means': np.vstack([center['accumulator'].mean(label)
+                                             for label in labels]),
+                         'labels': labels, 'groups': group_index.ravel()}
+        
+        U, s, Vt = engine.factors()
+        svd_results = results_from_factors(U, s, Vt, num_modes,
+                                           total_variance=engine.total_variance,
+                                           compute_surfaces=compute_surfaces)
+        
+        return {'super_matrix': super_matrix, 'centering': centering, 'detrending': None,
+                'weights': weights, 'gap_fill': None, 'filtering': None, 'svd': svd_results}
+    
+    def _get_weights(self, weighting, latitude, super_mask):
+        """
+        Get per-cell weights for a grid, reusing cached weights.
         
-        # Return processing results
-        return {
-            'super_matrix': self.super_matrix,
-            'id_matrix': self.id_matrix,
-            'super_mask': self.super_mask,
-            'longitude': self.longitude,
-            'latitude': self.latitude,
-            'file_keys': self.file_keys,
-            'target_dims': self.target_dims
-        }
+        Parameters
+        ----------
+        weighting : str
+            Weighting scheme. Only 'coslat' is supported.
+        latitude : ndarray
+            2D grid of latitude values.
+        super_mask : ndarray
+            Super mask with 1 for valid cells.
+            
+        Returns
+        -------
+        ndarray
+            1D array of weights for the valid cells.
+        """
+        if weighting != 'coslat':
+            raise ValueError(f"Unknown weighting '{weighting}'. Only 'coslat' is supported")
+        
+        if latitude.shape != super_mask.shape:
+            raise DimensionError(
+                f"Latitude grid has shape {latitude.shape}, "
+                f"but the super mask has shape {super_mask.shape}"
+            )
+        
+        # Weights depend only on the grid and the super mask
+        grid_hash = hashlib.sha1(
+            np.ascontiguousarray(latitude).tobytes()
+            + np.ascontiguousarray(super_mask).tobytes()
+        ).hexdigest()
+        cache_key = (weighting, super_mask.shape, grid_hash)
+        
+        if cache_key not in self._weight_cache:
+            self._weight_cache[cache_key] = compute_latitude_weights(
+                latitude, super_mask
+            )
+        
+        return self._weight_cache[cache_key]
+    
+    def _unweight(self, values):
+        """
+        Divide flattened values by the area weights, if weighting was applied.
+        
+        Parameters
+        ----------
+        values : ndarray
+            Array whose last axis runs over the valid cells.
+            
+        Returns
+        -------
+        ndarray
+            Un-weighted values. Cells with zero weight are set to NaN.
+        """
+        if self.weights is None:
+            return values
+        
+        return np.divide(values, self.weights, out=np.full(values.shape, np.nan),
+                         where=self.weights > 0)
     
-    def perform_svd(self, num_modes=None, compute_surfaces=True):
+    def get_threshold_curve(self):
+        """
+        Number of cells the super mask would keep for every threshold.
+        
+        Uses the valid-count grid kept during ingest, so no file is read again.
+        
+        Returns
+        -------
+        ndarray
+            Array of length T + 1 (T timestamps) whose entry k is the number of
+            cells valid in at least k timestamps.
+        """
+        if self.valid_counts is None:
+            raise EOFToolkitError(
+                "Valid counts are not available. Run process_directory first."
+            )
+        
+        return threshold_curve(self.valid_counts, len(self.file_keys))
+    
+    def get_super_mask_at(self, threshold):
+        """
+        Super mask for a given threshold, from the valid-count grid kept during ingest.
+        
+        Parameters
+        ----------
+        threshold : int
+            Minimum number of timestamps a cell must be valid in.
+            
+        Returns
+        -------
+        ndarray
+            Super mask with 1 for cells that meet the threshold.
+        """
+        if self.valid_counts is None:
+            raise EOFToolkitError(
+                "Valid counts are not available. Run process_directory first."
+            )
+        
+        return super_mask_from_counts(self.valid_counts, threshold)
+    
+    def perform_svd(self, num_modes=None, compute_surfaces=True, method='full',
+                    random_state=None, **method_options):
         """
         Perform SVD analysis on the super matrix.
         
@@ -230,6 +811,19 @@ class EOFProcessor:
             Number of modes to extract. If None, extracts all modes.
         compute_surfaces : bool, optional
             Whether to compute corresponding surfaces. Default is True.
+        method : str, optional
+            SVD backend: 'full', 'snapshot' and 'tsqr' (for far fewer time
+            steps than cells), 'mixed' (float32 with float64 refinement), or
+            'randomized', 'lanczos' and 'incremental' (these require
+            num_modes), or 'auto' to choose from a cost model calibrated on
+            this machine. Default is 'full'.
+        random_state : int, optional
+            Seed for randomized backends, for reproducible results.
+        **method_options
+            Extra backend options, e.g. `oversampling` and `n_iter` for
+            'randomized', `tol` and `maxiter` for 'lanczos', `block_size` for
+            'incremental', `n_workers` for 'tsqr', `refine_iter` for 'mixed', or
+            `memory_limit` for 'auto'.
             
         Returns
         -------
@@ -244,11 +838,23 @@ class EOFProcessor:
         if self.verbose:
             print(f"Performing SVD analysis{'' if num_modes is None else f' with {num_modes} modes'}...")
         
-        # Perform SVD
-        self.svd_results = perform_svd(self.super_matrix, num_modes, compute_surfaces)
+        # Perform SVD, reusing the cached result if the super matrix is unchanged
+        params = {'num_modes': num_modes, 'compute_surfaces': compute_surfaces,
+                  'method': method, 'random_state': random_state, **method_options}
+        stacked = self._pipeline.output('stack')
+        
+        if stacked is not None and stacked['super_matrix'] is self.super_matrix:
+            self.svd_results = self._pipeline.run('svd', self._svd_stage, params=params,
+                                                  depends=['stack'])
+        else:
+            self.svd_results = self._svd_stage({'super_matrix': self.super_matrix}, **params)
         
         # Add super_matrix to results for reconstruction
         self.svd_results['super_matrix'] = self.super_matrix
+        self.svd_updates = 0
+        
+        # Later recomputations and extensions reuse the backend and its options
+        self.svd_settings = {'method': method, 'random_state': random_state, **method_options}
         
         if self.verbose:
             print("SVD analysis complete.")
@@ -263,6 +869,198 @@ class EOFProcessor:
         
         return self.svd_results
     
+    def _svd_stage(self, stacked, num_modes, compute_surfaces, method='full', random_state=None,
+                   **method_options):
+        """Run the SVD of the super matrix."""
+        return perform_svd(stacked['super_matrix'], num_modes, compute_surfaces, method=method,
+                           random_state=random_state, **method_options)
+    
+    def update_svd(self, new_rows, file_keys=None, recompute_every=None):
+        """
+        Append new time steps and update the SVD results without a new decomposition.
+        
+        The new data are preprocessed like the super matrix (super mask, centering
+        with the stored means, area weights), appended to it, and the existing
+        modes are updated with a rank-k update (see
+        `eoftoolkit.analysis.svd.update_svd`).
+        
+        Parameters
+        ----------
+        new_rows : ndarray
+            New time steps, either as grids with the target dimensions, shape
+            (n, ny, nx) or (ny, nx), or as rows over the super mask cells,
+            shape (n, cells) or (cells,).
+        file_keys : list, optional
+            Keys of the new time steps. Default is 'update_<row>' keys.
+        recompute_every : int, optional
+            Run a full SVD instead of an update once this many updates have
+            been applied since the last full SVD, to reset the drift of
+            truncated updates. Default is None (always update).
+            
+        Returns
+        -------
+        dict
+            Updated SVD results.
+        """
+        if self.svd_results is None:
+            raise EOFToolkitError("SVD results are not available. Run perform_svd first.")
+        
+        if self.variables is not None:
+            raise EOFToolkitError(
+                "Cannot append time steps to a combined multivariate super matrix; "
+                "run process_multivariate again"
+            )
+        
+        if self.detrending is not None or self.temporal_filter is not None:
+            raise EOFToolkitError(
+                "Cannot append time steps to a detrended or filtered super matrix; "
+                "run process_directory again"
+            )
+        
+        centering_mode = None if self.centering is None else self.centering['mode']
+        if centering_mode == 'climatology':
+            raise EOFToolkitError(
+                "Cannot append time steps to a climatology-centered super matrix; "
+                "run process_directory again"
+            )
+        
+        rows = np.array(np.ma.filled(np.ma.asarray(new_rows, dtype=np.float64), np.nan))
+        if rows.shape[-2:] == tuple(self.target_dims):
+            rows = rows.reshape(-1, *self.target_dims)[:, self.super_mask == 1]
+        rows = np.atleast_2d(rows)
+        
+        if rows.shape[1] != self.super_matrix.shape[1]:
+            raise DimensionError(
+                f"New rows have {rows.shape[1]} cells, "
+                f"but the super matrix has {self.super_matrix.shape[1]}"
+            )
+        
+        if np.isnan(rows).any():
+            raise EOFToolkitError("New time steps have missing values in super mask cells")
+        
+        n_old = self.super_matrix.shape[0]
+        if file_keys is None:
+            file_keys = [f'update_{n_old + i}' for i in range(rows.shape[0])]
+        elif len(file_keys) != rows.shape[0]:
+            raise DimensionError(f"Got {len(file_keys)} file keys for {rows.shape[0]} rows")
+        
+        # Same preprocessing as the existing rows
+        if centering_mode == 'temporal':
+            rows -= self.centering['means']
+        elif centering_mode == 'spatial':
+            means = rows.mean(axis=1, keepdims=True)
+            rows -= means
+            self.centering = dict(self.centering,
+                                  means=np.vstack([self.centering['means'], means]))
+            if self.mean_dict is not None:
+                self.mean_dict.update({key: means[i:i+1] for i, key in enumerate(file_keys)})
+        if self.weights is not None:
+            rows *= self.weights
+        
+        self._append_rows(rows)
+        self.file_keys = list(self.file_keys) + list(file_keys)
+        self.reconstruction_results = None
+        
+        compute_surfaces = 'corresponding_surfaces' in self.svd_results
+        
+        if recompute_every is not None and self.svd_updates + 1 >= recompute_every:
+            if self.verbose:
+                print(f"Recomputing the SVD after {self.svd_updates + 1} updates...")
+            
+            # Results with all modes stay complete, unless the backend needs num_modes
+            settings = dict(self.svd_settings or {})
+            num_modes = len(self.svd_results['singular_values'])
+            if num_modes >= n_old and settings.get('method') not in ('randomized', 'lanczos',
+                                                                     'incremental'):
+                num_modes = None
+            return self.perform_svd(num_modes=num_modes, compute_surfaces=compute_surfaces,
+                                    **settings)
+        
+        if self.verbose:
+            print(f"Updating SVD results with {rows.shape[0]} new time steps...")
+        
+        self.svd_results = update_svd(self.svd_results, rows, compute_surfaces)
+        self.svd_results['super_matrix'] = self.super_matrix
+        self.svd_updates += 1
+        
+        return self.svd_results
+    
+    def _append_rows(self, rows):
+        """
+        Append rows to the super matrix through a buffer with spare capacity.
+        
+        The buffer doubles when it is full, so repeated updates copy the
+        existing rows only O(log T) times instead of on every call. The super
+        matrix is a view of the filled rows of the buffer.
+        """
+        n_old, n_new = self.super_matrix.shape[0], rows.shape[0]
+        
+        buffer = self._row_buffer
+        if (buffer is None or self.super_matrix.base is not buffer
+                or buffer.shape[0] < n_old + n_new):
+            capacity = max(2 * n_old, n_old + n_new)
+            buffer = np.empty((capacity, self.super_matrix.shape[1]))
+            buffer[:n_old] = self.super_matrix
+            self._row_buffer = buffer
+        
+        buffer[n_old:n_old + n_new] = rows
+        self.super_matrix = buffer[:n_old + n_new]
+    
+    def extend_modes(self, num_modes, method=None, **options):
+        """
+        Compute more modes and append them to the SVD results.
+        
+        The modes already in `svd_results` are kept; the additional ones are
+        the leading modes of the super matrix with the known modes deflated
+        (see `eoftoolkit.analysis.svd.extend_modes`).
+        
+        Parameters
+        ----------
+        num_modes : int
+            Number of additional modes, e.g. 10 to go from modes 1-10 to 1-20.
+        method : str, optional
+            Solver for the deflated super matrix: 'randomized', 'lanczos' or
+            'full'. Default follows the backend of the last SVD: 'lanczos' and
+            'randomized' (also used for 'incremental') keep their solver and
+            its stored options, the exact backends use 'full'.
+        **options
+            Solver options, overriding the stored ones: `random_state`, plus
+            `oversampling` and `n_iter` for 'randomized', or `tol`, `maxiter`
+            and `chunk_size` for 'lanczos'.
+            
+        Returns
+        -------
+        dict
+            SVD results with the additional modes appended.
+        """
+        if self.svd_results is None:
+            raise EOFToolkitError("SVD results are not available. Run perform_svd first.")
+        
+        known = len(self.svd_results['singular_values'])
+        if self.verbose:
+            print(f"Computing modes {known + 1} to {known + num_modes}...")
+        
+        # Reuse the solver and convergence settings of the last SVD
+        settings = dict(self.svd_settings or {'method': 'randomized'})
+        backend = settings.pop('method')
+        if backend == 'auto':
+            backend = self.svd_results.get('method', 'full')
+        if method is None:
+            method = {'randomized': 'randomized', 'incremental': 'randomized',
+                      'lanczos': 'lanczos'}.get(backend, 'full')
+        
+        accepted = {'randomized': ('random_state', 'oversampling', 'n_iter'),
+                    'lanczos': ('random_state', 'tol', 'maxiter', 'chunk_size'),
+                    'full': ('random_state',)}.get(method, ())
+        stored = {key: value for key, value in settings.items() if key in accepted}
+        
+        self.svd_results = extend_modes(self.svd_results, self.super_matrix, num_modes,
+                                        method=method, **{**stored, **options})
+        self.svd_results['super_matrix'] = self.super_matrix
+        self.reconstruction_results = None
+        
+        return self.svd_results
+    
     def reconstruct(self, max_modes=None, metric='rmse'):
         """
         Reconstruct data from SVD results.
@@ -289,10 +1087,15 @@ class EOFProcessor:
         if self.verbose:
             print(f"Performing data reconstruction with up to {max_modes or 'all'} modes...")
         
-        # Reconstruct data
-        self.reconstruction_results = reconstruct_from_modes(
-            self.svd_results, max_modes, metric
-        )
+        # Reconstruct data, reusing the cached result if the SVD is unchanged
+        params = {'max_modes': max_modes, 'metric': metric}
+        
+        if self.svd_results is self._pipeline.output('svd'):
+            self.reconstruction_results = self._pipeline.run(
+                'reconstruct', self._reconstruct_stage, params=params, depends=['svd']
+            )
+        else:
+            self.reconstruction_results = self._reconstruct_stage(self.svd_results, **params)
         
         if self.verbose:
             print("Reconstruction complete.")
@@ -306,6 +1109,628 @@ class EOFProcessor:
         
         return self.reconstruction_results
     
+    def _reconstruct_stage(self, svd_results, max_modes, metric):
+        """Run the incremental reconstruction."""
+        return reconstruct_from_modes(svd_results, max_modes, metric)
+    
+    def clear_cache(self):
+        """
+        Drop all cached pipeline stages from memory.
+        
+        Stage outputs written to `cache_dir` are kept on disk.
+        """
+        self._pipeline.invalidate()
+        for processor in self._variable_processors.values():
+            processor.clear_cache()
+    
+    def process_multivariate(self, sources, normalize=True, **options):
+        """
+        Process several variables over the same timestamps for a combined EOF analysis.
+        
+        Each variable is ingested with its own cached pipeline, and its centered
+        (and optionally weighted, filled, filtered) rows are written directly into
+        a column block of one preallocated super matrix. Blocks are then scaled
+        so that each variable has unit total variance, so that no variable
+        dominates the combined modes because of its units or number of cells.
+        
+        Parameters
+        ----------
+        sources : dict
+            Dictionary with variable names as keys and either a directory path or
+            a dict of `process_directory` keyword arguments (including
+            'directory_path') as values.
+        normalize : bool, optional
+            Whether to divide each block by the square root of its total variance.
+            Default is True.
+        **options
+            Keyword arguments for `process_directory` shared by all variables.
+            Per-variable arguments in `sources` take precedence.
+            
+        Returns
+        -------
+        dict
+            Processing results containing the combined super_matrix, file_keys and
+            'variables', a dictionary with the 'columns' (slice) and 'scale' of
+            each variable's block.
+        """
+        stack_defaults = {'detrend': None, 'weighting': None, 'gap_fill_modes': None,
+                          'temporal_filter': None}
+        
+        if not sources:
+            raise EOFToolkitError("No variables provided")
+        
+        # Run the ingest stages of every variable before allocating the matrix
+        ingested = {}
+        for name, source in sources.items():
+            kwargs = dict(options)
+            kwargs.update(source if isinstance(source, dict) else {'directory_path': source})
+            stack_kwargs = {key: kwargs.pop(key, default) for key, default in stack_defaults.items()}
+            
+            if name not in self._variable_processors:
+                self._variable_processors[name] = EOFProcessor(
+                    verbose=self.verbose, projection=self.projection,
+                    projection_params=self.projection_params,
+                    cache_dir=self._pipeline.cache_dir
+                )
+            processor = self._variable_processors[name]
+            
+            if self.verbose:
+                print(f"Ingesting variable '{name}'...")
+            
+            ingested[name] = (processor, processor._ingest_stages(**kwargs), stack_kwargs)
+        
+        # All variables must cover the same timestamps
+        first_name, (_, first_stages, _) = next(iter(ingested.items()))
+        n_rows = len(first_stages['scan']['file_keys'])
+        for name, (_, stages, _) in ingested.items():
+            if len(stages['scan']['file_keys']) != n_rows:
+                raise DimensionError(f"Variable '{name}' has {len(stages['scan']['file_keys'])} "
+                                     f"timestamps, but '{first_name}' has {n_rows}")
+            
+            dates = stages['scan']['dates']
+            reference = first_stages['scan']['dates']
+            if all(isinstance(d, datetime) for d in dates + reference) and dates != reference:
+                raise DimensionError(f"Variable '{name}' does not cover the same dates "
+                                     f"as '{first_name}'")
+        
+        widths = [stages['flatten']['flattened_id_matrix'].shape[1]
+                  for _, stages, _ in ingested.values()]
+        
+        self.reset()
+        super_matrix = np.empty((n_rows, sum(widths)))
+        variables = {}
+        
+        # Write each variable's rows straight into its column block
+        start = 0
+        for (name, (processor, stages, stack_kwargs)), width in zip(ingested.items(), widths):
+            columns = slice(start, start + width)
+            block = super_matrix[:, columns]
+            stages['stack'] = processor._stack_stage(
+                stages['scan'], stages['read'], stages['mask'], stages['flatten'],
+                stages['center'], out=block, **stack_kwargs
+            )
+            processor._expose_stages(stages)
+            
+            scale = 1.0
+            if normalize:
+                # Total variance without a temporary copy of the block
+                means = block.mean(axis=0)
+                total = (np.einsum('ij,ij->', block, block) - n_rows * means @ means) / n_rows
+                if total > 0:
+                    scale = float(np.sqrt(total))
+                    block /= scale
+            
+            variables[name] = {'columns': columns, 'scale': scale}
+            start += width
+        
+        self.super_matrix = super_matrix
+        self.file_paths = first_stages['scan']['file_paths']
+        self.file_keys = first_stages['scan']['file_keys']
+        self.variables = variables
+        
+        if self.verbose:
+            print(f"Combined super matrix has {super_matrix.shape[1]} columns "
+                  f"from {len(variables)} variables.")
+        
+        return {
+            'super_matrix': self.super_matrix,
+            'file_keys': self.file_keys,
+            'variables': self.variables
+        }
+    
+    def get_variable_processor(self, name):
+        """
+        Get the processor holding the grid information of one variable.
+        
+        Parameters
+        ----------
+        name : str
+            Variable name used in `process_multivariate`.
+            
+        Returns
+        -------
+        EOFProcessor
+            Processor with that variable's id_matrix, target_dims, coordinates, etc.
+        """
+        if self.variables is None or name not in self.variables:
+            raise EOFToolkitError(f"Variable '{name}' is not available. "
+                                  "Run process_multivariate first.")
+        
+        return self._variable_processors[name]
+    
+    def get_variable_eof(self, name, mode_number, reshape=True):
+        """
+        Get the part of a combined EOF that belongs to one variable.
+        
+        The block is returned in the variable's original units, i.e. with the
+        block normalization and any area weighting undone.
+        
+        Parameters
+        ----------
+        name : str
+            Variable name used in `process_multivariate`.
+        mode_number : int
+            Mode number (1-based).
+        reshape : bool, optional
+            Whether to reshape the EOF to the variable's 2D grid. Default is True.
+            
+        Returns
+        -------
+        ndarray
+            EOF values for the variable.
+        """
+        processor = self.get_variable_processor(name)
+        
+        if self.svd_results is None:
+            raise EOFToolkitError(
+                "SVD results are not available. Run perform_svd first."
+            )
+        
+        idx = mode_number - 1
+        if idx < 0 or idx >= self.svd_results['eofs'].shape[0]:
+            raise IndexError(f"Mode number {mode_number} is out of range")
+        
+        variable = self.variables[name]
+        eof = self.svd_results['eofs'][idx, variable['columns']] * variable['scale']
+        eof = processor._unweight(eof)
+        
+        if reshape:
+            from eoftoolkit.processor.reshaper import reshape_to_spatial_grid
+            eof = reshape_to_spatial_grid(eof, processor.id_matrix, processor.target_dims)
+        
+        return eof
+    
+    def process_ensemble(self, members, file_extension='.nc', date_pattern=None,
+                         date_format=None, centering='spatial', climatology_period=12,
+                         weighting=None, as_masked=True):
+        """
+        Process the directories of several ensemble members on one shared grid.
+        
+        Masking and ID construction run once for the whole ensemble: the super
+        mask keeps the cells valid in every timestamp of every member. Members
+        are stacked into one (members, time steps, cells) array and each member
+        is centered in place on its own.
+        
+        Parameters
+        ----------
+        members : dict
+            Dictionary with member names as keys and directory paths as values.
+            All members must have the same number of timestamps.
+        file_extension : str, optional
+            Extension of files to process. Default is '.nc'.
+        date_pattern : str, optional
+            Regular expression pattern to extract date from filename.
+        date_format : str, optional
+            Format string for parsing the date if a pattern is provided.
+        centering : str or None, optional
+            Centering applied to each member: 'spatial', 'temporal', 'climatology'
+            or None. Default is 'spatial', as in `process_directory`, so one
+            member gives the same EOFs through either entry point.
+        climatology_period : int, optional
+            Number of timestamps per cycle for 'climatology' centering. Default is 12.
+        weighting : str or None, optional
+            Area weighting, as in `process_directory`. Default is None.
+        as_masked : bool, optional
+            Whether grids are read as masked arrays, as in `process_directory`.
+            Default is True.
+            
+        Returns
+        -------
+        dict
+            Processing results containing 'ensemble_matrix', 'members', id_matrix,
+            super_mask, etc. Per-member centering is kept in `ensemble_centering`.
+        """
+        if not members:
+            raise EOFToolkitError("No ensemble members provided")
+        
+        self.reset()
+        
+        scans = {}
+        reads = {}
+        for name, directory_path in members.items():
+            if self.verbose:
+                print(f"Reading member '{name}'...")
+            
+            scans[name] = self._scan_stage(directory_path, file_extension, date_pattern,
+                                           date_format, None, None)
+            reads[name] = self._read_stage(scans[name], None, False, as_masked)
+        
+        names = list(members)
+        n_rows = len(scans[names[0]]['file_keys'])
+        for name in names:
+            if len(scans[name]['file_keys']) != n_rows:
+                raise DimensionError(f"Member '{name}' has {len(scans[name]['file_keys'])} "
+                                     f"timestamps, but '{names[0]}' has {n_rows}")
+        
+        # One grid, super mask and ID matrix for all members
+        z_dict = {(name, key): data['z'] for name in names
+                  for key, data in reads[name]['data_dict'].items()}
+        standardized, target_dims = standardize_dimensions(z_dict)
+        del z_dict
+        
+        if self.verbose:
+            print("Creating shared super mask...")
+        
+        valid_counts = count_valid_cells(
+            {key: ~np.isnan(matrix) for key, matrix in standardized.items()}
+        )
+        super_mask = super_mask_from_counts(valid_counts, len(standardized))
+        valid = super_mask == 1
+        
+        first = reads[names[0]]
+        id_matrix = create_id_matrix(super_mask)
+        id_coordinates = get_id_coordinates(id_matrix, first['longitude'], first['latitude'])
+        
+        if self.verbose:
+            print(f"Stacking {len(names)} members...")
+        
+        groups = None
+        if centering == 'climatology':
+            groups = np.arange(n_rows) % climatology_period
+        
+        ensemble = np.empty((len(names), n_rows, int(valid.sum())))
+        ensemble_centering = {}
+        for m, name in enumerate(names):
+            for t, key in enumerate(scans[name]['file_keys']):
+                ensemble[m, t] = standardized.pop((name, key))[valid]
+            
+            # Each member view is centered in place on its own
+            if centering is not None:
+                ensemble_centering[name] = center_super_matrix(ensemble[m], mode=centering,
+                                                               groups=groups)
+        
+        weights = None
+        if weighting is not None:
+            weights = self._get_weights(weighting, first['latitude'], super_mask)
+            ensemble *= weights
+        
+        self.file_keys = scans[names[0]]['file_keys']
+        self.longitude = first['longitude']
+        self.latitude = first['latitude']
+        self.target_dims = target_dims
+        self.valid_counts = valid_counts
+        self.super_mask = super_mask
+        self.id_matrix = id_matrix
+        self.id_coordinates = id_coordinates
+        self.weights = weights
+        self.ensemble_matrix = ensemble
+        self.ensemble_members = names
+        self.ensemble_centering = ensemble_centering or None
+        
+        if self.verbose:
+            print("Ensemble processing complete.")
+        
+        return {
+            'ensemble_matrix': self.ensemble_matrix,
+            'members': self.ensemble_members,
+            'id_matrix': self.id_matrix,
+            'super_mask': self.super_mask,
+            'longitude': self.longitude,
+            'latitude': self.latitude,
+            'file_keys': self.file_keys,
+            'target_dims': self.target_dims
+        }
+    
+    def perform_ensemble_svd(self, num_modes=None, compute_surfaces=False, n_workers=None):
+        """
+        Perform the SVD analysis of every ensemble member.
+        
+        See `eoftoolkit.analysis.ensemble.run_ensemble_svd`: members are
+        decomposed in one batched call, or in a process pool when the
+        ensemble is too large to batch.
+        
+        Parameters
+        ----------
+        num_modes : int, optional
+            Number of modes to extract per member. If None, extracts all modes.
+        compute_surfaces : bool, optional
+            Whether to compute corresponding surfaces. Default is False.
+        n_workers : int, optional
+            Number of worker processes for ensembles too large to batch.
+            If None, uses the number of CPUs.
+            
+        Returns
+        -------
+        dict
+            Dictionary with member names as keys and SVD results as values.
+        """
+        if self.ensemble_matrix is None:
+            raise EOFToolkitError(
+                "Ensemble matrix is not available. Run process_ensemble first."
+            )
+        
+        if self.verbose:
+            print(f"Performing SVD analysis for {len(self.ensemble_members)} members...")
+        
+        results = run_ensemble_svd(self.ensemble_matrix, num_modes, compute_surfaces, n_workers)
+        self.ensemble_results = dict(zip(self.ensemble_members, results))
+        
+        if self.verbose:
+            print("Ensemble SVD analysis complete.")
+        
+        return self.ensemble_results
+    
+    def get_member_eof(self, member, mode_number, reshape=True):
+        """
+        Get a specific EOF of one ensemble member.
+        
+        Parameters
+        ----------
+        member : str
+            Member name used in `process_ensemble`.
+        mode_number : int
+            Mode number (1-based).
+        reshape : bool, optional
+            Whether to reshape the EOF to a 2D grid. Default is True.
+            
+        Returns
+        -------
+        ndarray
+            EOF values.
+        """
+        if self.ensemble_results is None:
+            raise EOFToolkitError(
+                "Ensemble SVD results are not available. Run perform_ensemble_svd first."
+            )
+        
+        if member not in self.ensemble_results:
+            raise KeyError(f"Unknown ensemble member '{member}'")
+        
+        eofs = self.ensemble_results[member]['eofs']
+        idx = mode_number - 1
+        if idx < 0 or idx >= eofs.shape[0]:
+            raise IndexError(f"Mode number {mode_number} is out of range")
+        
+        eof = self._unweight(eofs[idx, :])
+        
+        if reshape:
+            from eoftoolkit.processor.reshaper import reshape_to_spatial_grid
+            eof = reshape_to_spatial_grid(eof, self.id_matrix, self.target_dims)
+        
+        return eof
+    
+    def perform_regional_svd(self, regions, num_modes=None, compute_surfaces=False,
+                             n_workers=None):
+        """
+        Perform separate SVD analyses for several regional boxes.
+        
+        All regions are sliced from the super matrix that is already in memory,
+        so the files are read only once. The per-region SVDs run in a process
+        pool that shares the super matrix through shared memory.
+        
+        Parameters
+        ----------
+        regions : dict
+            Dictionary with region names as keys and (lon_min, lon_max, lat_min,
+            lat_max) boxes as values.
+        num_modes : int, optional
+            Number of modes to extract per region. If None, extracts all modes.
+        compute_surfaces : bool, optional
+            Whether to compute corresponding surfaces. Default is False.
+        n_workers : int, optional
+            Number of worker processes. If None, uses the number of CPUs.
+            
+        Returns
+        -------
+        dict
+            Dictionary with region names as keys and SVD results as values. Each
+            result also holds the region's 'columns' in the super matrix and its
+            own 'id_matrix'.
+        """
+        if self.super_matrix is None:
+            raise EOFToolkitError(
+                "Super matrix is not available. Run process_directory first."
+            )
+        
+        if self.variables is not None:
+            raise EOFToolkitError(
+                "Regions are defined on one grid, but the combined super matrix spans "
+                "several. Use get_variable_processor to analyse one variable."
+            )
+        
+        if self.longitude.shape != self.super_mask.shape:
+            raise DimensionError(
+                f"Coordinate grids have shape {self.longitude.shape}, "
+                f"but the super mask has shape {self.super_mask.shape}"
+            )
+        
+        # Coordinates of each super matrix column
+        valid = self.super_mask == 1
+        column_lons = self.longitude[valid]
+        column_lats = self.latitude[valid]
+        
+        region_columns = {
+            name: select_region_columns(column_lons, column_lats, box[:2], box[2:])
+            for name, box in regions.items()
+        }
+        
+        if self.verbose:
+            print(f"Performing SVD analysis for {len(regions)} regions...")
+        
+        # Row means of the full domain are not the row means of a region
+        center_rows = self.centering is not None and self.centering['mode'] == 'spatial'
+        
+        self.regional_results = run_regional_svd(
+            self.super_matrix, region_columns, num_modes, compute_surfaces,
+            n_workers, center_rows
+        )
+        
+        # Give each region its own ID matrix so its EOFs can be reshaped and plotted
+        cell_rows, cell_cols = np.nonzero(valid)
+        for name, columns in region_columns.items():
+            region_id_matrix = np.full(self.id_matrix.shape, '', dtype=object)
+            region_id_matrix[cell_rows[columns], cell_cols[columns]] = \
+                self.id_matrix[cell_rows[columns], cell_cols[columns]]
+            
+            self.regional_results[name]['columns'] = columns
+            self.regional_results[name]['id_matrix'] = region_id_matrix
+        
+        if self.verbose:
+            print("Regional SVD analysis complete.")
+        
+        return self.regional_results
+    
+    def get_regional_eof(self, region, mode_number, reshape=True):
+        """
+        Get a specific EOF of a regional analysis.
+        
+        Parameters
+        ----------
+        region : str
+            Region name used in perform_regional_svd.
+        mode_number : int
+            Mode number (1-based).
+        reshape : bool, optional
+            Whether to reshape the EOF to a 2D grid. Default is True.
+            
+        Returns
+        -------
+        ndarray
+            EOF values.
+        """
+        if self.regional_results is None:
+            raise EOFToolkitError(
+                "Regional results are not available. Run perform_regional_svd first."
+            )
+        
+        result = self.regional_results[region]
+        idx = mode_number - 1
+        
+        if idx < 0 or idx >= result['eofs'].shape[0]:
+            raise IndexError(f"Mode number {mode_number} is out of range")
+        
+        eof = result['eofs'][idx, :]
+        if self.weights is not None:
+            weights = self.weights[result['columns']]
+            eof = np.divide(eof, weights, out=np.full(eof.shape, np.nan), where=weights > 0)
+        
+        if reshape:
+            from eoftoolkit.processor.reshaper import reshape_to_spatial_grid
+            eof = reshape_to_spatial_grid(eof, result['id_matrix'], self.target_dims)
+        
+        return eof
+    
+    def perform_windowed_svd(self, window, step=1, num_modes=None, compute_surfaces=False,
+                             warm_start=True, n_workers=1, center=None):
+        """
+        Perform separate SVD analyses for sliding time windows.
+        
+        The files are read once. Truncated SVDs (with `num_modes`) work on row
+        views of the super matrix already in memory, so no window is copied. See
+        `eoftoolkit.analysis.windowed.run_windowed_svd`.
+        
+        Parameters
+        ----------
+        window : int
+            Window length in time steps, e.g. 360 for 30 years of monthly data.
+        step : int, optional
+            Offset between consecutive windows in time steps. Default is 1.
+        num_modes : int, optional
+            Number of modes per window. If None, runs a full SVD of each window.
+        compute_surfaces : bool, optional
+            Whether to compute corresponding surfaces. Default is False.
+        warm_start : bool, optional
+            Whether to start each window's truncated SVD from the previous
+            window's subspace. Only used when `num_modes` is set. Default is True.
+        n_workers : int, optional
+            Number of threads. If None, uses the number of CPUs. Default is 1.
+        center : bool, optional
+            Whether to subtract each window's own temporal mean. Default follows
+            the centering of the super matrix: True after 'temporal' centering,
+            False after 'spatial', 'climatology' or no centering, whose anomalies
+            are already the ones to analyse.
+            
+        Returns
+        -------
+        dict
+            Dictionary with the first row of each window as keys and SVD results
+            as values. Each result also holds its 'rows' (start, stop) and the
+            'file_keys' of its first and last timestamp.
+        """
+        if self.super_matrix is None:
+            raise EOFToolkitError(
+                "Super matrix is not available. Run process_directory first."
+            )
+        
+        if self.verbose:
+            print(f"Performing SVD analysis for sliding windows of {window} time steps...")
+        
+        if center is None:
+            center = self.centering is not None and self.centering['mode'] == 'temporal'
+        
+        self.windowed_results = run_windowed_svd(
+            self.super_matrix, window, step, num_modes, compute_surfaces,
+            warm_start, n_workers, center=center
+        )
+        
+        for result in self.windowed_results.values():
+            start, stop = result['rows']
+            result['file_keys'] = (self.file_keys[start], self.file_keys[stop - 1])
+        
+        if self.verbose:
+            print(f"Windowed SVD analysis complete ({len(self.windowed_results)} windows).")
+        
+        return self.windowed_results
+    
+    def get_window_eof(self, start, mode_number, reshape=True):
+        """
+        Get a specific EOF of one sliding window.
+        
+        Parameters
+        ----------
+        start : int
+            First row of the window, as used in the keys of `windowed_results`.
+        mode_number : int
+            Mode number (1-based).
+        reshape : bool, optional
+            Whether to reshape the EOF to a 2D grid. Default is True.
+            
+        Returns
+        -------
+        ndarray
+            EOF values.
+        """
+        if self.windowed_results is None:
+            raise EOFToolkitError(
+                "Windowed SVD results are not available. Run perform_windowed_svd first."
+            )
+        
+        if start not in self.windowed_results:
+            raise KeyError(f"No window starts at row {start}")
+        
+        eofs = self.windowed_results[start]['eofs']
+        idx = mode_number - 1
+        if idx < 0 or idx >= eofs.shape[0]:
+            raise IndexError(f"Mode number {mode_number} is out of range")
+        
+        eof = self._unweight(eofs[idx, :])
+        
+        if reshape:
+            from eoftoolkit.processor.reshaper import reshape_to_spatial_grid
+            eof = reshape_to_spatial_grid(eof, self.id_matrix, self.target_dims)
+        
+        return eof
+    
     def get_eof(self, mode_number, reshape=True):
         """
         Get a specific EOF.
@@ -333,8 +1758,13 @@ class EOFProcessor:
         if idx < 0 or idx >= self.svd_results['eofs'].shape[0]:
             raise IndexError(f"Mode number {mode_number} is out of range")
         
+        if reshape and self.variables is not None:
+            raise EOFToolkitError(
+                "Combined EOFs span several grids. Use get_variable_eof instead."
+            )
+        
         # Get EOF
-        eof = self.svd_results['eofs'][idx, :]
+        eof = self._unweight(self.svd_results['eofs'][idx, :])
         
         # Reshape if requested
         if reshape:
@@ -373,7 +1803,8 @@ class EOFProcessor:
         
         return pc
     
-    def get_reconstruction(self, mode_count=None, timestamp_index=0, reshape=True):
+    def get_reconstruction(self, mode_count=None, timestamp_index=0, reshape=True,
+                           add_trend=False):
         """
         Get a specific reconstruction.
         
@@ -385,6 +1816,9 @@ class EOFProcessor:
             Index of the timestamp to get. Default is 0.
         reshape : bool, optional
             Whether to reshape the reconstruction to a 2D grid. Default is True.
+        add_trend : bool, optional
+            Whether to add back the trend removed with `detrend`. Only applies
+            to a single timestamp. Default is False.
             
         Returns
         -------
@@ -396,6 +1830,11 @@ class EOFProcessor:
                 "Reconstruction results are not available. Run reconstruct first."
             )
         
+        if reshape and self.variables is not None:
+            raise EOFToolkitError(
+                "Combined reconstructions span several grids. Use reshape=False instead."
+            )
+        
         # Determine which reconstruction to use
         if mode_count is None:
             mode_count = self.reconstruction_results['optimal_mode_count']
@@ -410,6 +1849,11 @@ class EOFProcessor:
         if len(reconstruction.shape) > 1:
             reconstruction = reconstruction[timestamp_index, :]
         
+        reconstruction = self._unweight(reconstruction)
+        
+        if add_trend and self.detrending is not None and reconstruction.ndim == 1:
+            reconstruction = restore_trend(reconstruction, self.detrending, rows=timestamp_index)
+        
         # Reshape if requested
         if reshape:
             from eoftoolkit.processor.reshaper import reshape_to_spatial_grid
@@ -438,8 +1882,13 @@ class EOFProcessor:
                 "Super matrix is not available. Run process_directory first."
             )
         
+        if reshape and self.variables is not None:
+            raise EOFToolkitError(
+                "Combined data span several grids. Use reshape=False instead."
+            )
+        
         # Get original data
-        original = self.super_matrix[timestamp_index, :]
+        original = self._unweight(self.super_matrix[timestamp_index, :])
         
         # Reshape if requested
         if reshape:
@@ -716,7 +2165,7 @@ class EOFProcessor:
         # Add SVD results if available
         if self.svd_results is not None:
             results.update({
-                'eofs': self.svd_results['eofs'],
+                'eofs': self._unweight(self.svd_results['eofs']),
                 'pcs': self.svd_results['pcs'],
                 'singular_values': self.svd_results['singular_values'],
                 'explained_variance': self.svd_results['explained_variance']
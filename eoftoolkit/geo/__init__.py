@@ -1,11 +1,12 @@
 """Geographic utilities module for EOFtoolkit."""
 
 from eoftoolkit.geo.projections import create_projection, transform_coordinates
-from eoftoolkit.geo.grid import create_grid, get_grid_info
+from eoftoolkit.geo.grid import create_grid, get_grid_info, compute_latitude_weights
 
 __all__ = [
     'create_projection',
     'transform_coordinates',
     'create_grid',
-    'get_grid_info'
+    'get_grid_info',
+    'compute_latitude_weights'
 ]
\ No newline at end of file
@@ -74,6 +74,33 @@ def get_grid_info(lons, lats):
     }
 
 
+def compute_latitude_weights(lats, super_mask=None):
+    """
+    Compute sqrt(cos(latitude)) area weights for grid cells.
+    
+    Parameters
+    ----------
+    lats : ndarray
+        2D grid of latitude values in degrees.
+    super_mask : ndarray, optional
+        Super mask with 1 for valid cells. If provided, weights are returned
+        only for valid cells, in the same order as the flattened data.
+        
+    Returns
+    -------
+    ndarray
+        Weights as a 2D grid, or a 1D vector of valid-cell weights if
+        super_mask is provided.
+    """
+    # Clip tiny negative values at the poles caused by rounding
+    weights = np.sqrt(np.clip(np.cos(np.deg2rad(lats)), 0.0, None))
+    
+    if super_mask is not None:
+        weights = weights[super_mask == 1]
+    
+    return weights
+
+
 def interpolate_to_grid(data, lons, lats, target_lons, target_lats, method='linear'):
     """
     Interpolate data to a different grid.
@@ -5,7 +5,34 @@ import numpy as np
 from eoftoolkit.core.exceptions import FileReadError
 
 
-def read_netcdf(file_path):
+def _read_as_nan(variable):
+    """
+    Read a NetCDF variable as a plain float64 array with NaN for missing values.
+    
+    Fill and missing values are detected on the raw packed values, before
+    scale_factor/add_offset are applied, so no masked array is ever built.
+    """
+    variable.set_auto_maskandscale(False)
+    raw = variable[:]
+    
+    values = raw.astype(np.float64)
+    invalid = ~np.isfinite(values)
+    for attr in ('_FillValue', 'missing_value'):
+        if attr in variable.ncattrs():
+            for fill in np.atleast_1d(variable.getncattr(attr)):
+                invalid |= raw == fill
+    
+    if 'scale_factor' in variable.ncattrs():
+        values *= variable.getncattr('scale_factor')
+    if 'add_offset' in variable.ncattrs():
+        values += variable.getncattr('add_offset')
+    
+    values[invalid] = np.nan
+    
+    return values
+
+
+def read_netcdf(file_path, as_masked=True):
     """
     Read a NetCDF file and extract its content.
     
@@ -13,12 +40,18 @@ def read_netcdf(file_path):
     ----------
     file_path : str
         Path to the NetCDF file.
+    as_masked : bool, optional
+        Whether to return 'z' as a masked array. If False, 'z' is a plain
+        float64 array with NaN for fill, missing and non-finite values, which
+        is cheaper to process and avoids masked-array copies downstream.
+        Default is True.
         
     Returns
     -------
     dict
         Dictionary containing extracted data with the following keys:
-        - 'z': The data values (masked array)
+        - 'z': The data values (masked array, or ndarray with NaN if
+          `as_masked` is False)
         - 'longitude': 2D grid of longitude values
         - 'latitude': 2D grid of latitude values
         - 'dimensions': Original dimensions of the data
@@ -39,7 +72,10 @@ def read_netcdf(file_path):
             else:
                 raise FileReadError(f"Could not find main data variable in {file_path}")
         
-        z_data = data.variables[z_var_name][:]
+        if as_masked:
+            z_data = data.variables[z_var_name][:]
+        else:
+            z_data = _read_as_nan(data.variables[z_var_name])
         
         # Extract coordinate information
         lon_range = data.variables['x_range'][:] if 'x_range' in data.variables else None
@@ -67,7 +103,7 @@ def read_netcdf(file_path):
                 lons_grid, lats_grid = np.meshgrid(np.arange(z_data.shape[1]), np.arange(z_data.shape[0]))
         
         # Mask invalid values
-        z = np.ma.masked_invalid(z_data)
+        z = np.ma.masked_invalid(z_data) if as_masked else z_data
         
         return {
             "z": z,
@@ -4,7 +4,8 @@ import os
 import re
 from datetime import datetime
 
-def sort_files_by_date(directory_path, file_extension='.nc', date_pattern=None, date_format=None):
+def sort_files_by_date(directory_path, file_extension='.nc', date_pattern=None, date_format=None,
+                       return_dates=False):
     """
     Sort files in a directory by date embedded in filenames.
     
@@ -20,17 +21,22 @@ def sort_files_by_date(directory_path, file_extension='.nc', date_pattern=None,
     date_format : str, optional
         Format string for parsing the date if a pattern is provided.
         For example, '%Y%m' for dates like '199301'.
+    return_dates : bool, optional
+        Whether to also return the date parsed for each file. Default is False.
         
     Returns
     -------
     list
         List of sorted file paths.
+    list
+        Parsed dates (datetime, int or str) matching the file paths.
+        Only returned if `return_dates` is True.
     """
     # Find all files with the specified extension
     files = [f for f in os.listdir(directory_path) if f.endswith(file_extension)]
     
     if not files:
-        return []
+        return ([], []) if return_dates else []
     
     if date_pattern:
         # Extract dates using the provided pattern
@@ -68,4 +74,9 @@ def sort_files_by_date(directory_path, file_extension='.nc', date_pattern=None,
         sorted_files = sorted(date_map.keys(), key=lambda x: date_map[x])
     
     # Return full paths
-    return [os.path.join(directory_path, f) for f in sorted_files]
\ No newline at end of file
+    file_paths = [os.path.join(directory_path, f) for f in sorted_files]
+    
+    if return_dates:
+        return file_paths, [date_map[f] for f in sorted_files]
+    
+    return file_paths
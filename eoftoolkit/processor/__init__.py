@@ -1,18 +1,38 @@
 """Processor module for EOFtoolkit."""
 
 from eoftoolkit.processor.dimensions import standardize_dimensions
-from eoftoolkit.processor.masking import create_binary_mask, create_super_mask
+from eoftoolkit.processor.coarsening import coarsen_matrix, coarsen_matrices
+from eoftoolkit.processor.masking import (
+    create_binary_mask, create_super_mask, count_valid_cells, threshold_curve
+)
 from eoftoolkit.processor.identification import create_id_matrix
 from eoftoolkit.processor.flattener import flatten_matrices
+from eoftoolkit.processor.sparse import SparseGrid
+from eoftoolkit.processor.centering import (
+    StreamingMean, center_super_matrix, climatology_groups
+)
+from eoftoolkit.processor.detrending import detrend_super_matrix, restore_trend
+from eoftoolkit.processor.filtering import filter_super_matrix
 from eoftoolkit.processor.reshaper import reshape_to_spatial_grid
 from eoftoolkit.processor.stacker import create_super_matrix
 
 __all__ = [
     'standardize_dimensions',
+    'coarsen_matrix',
+    'coarsen_matrices',
     'create_binary_mask',
     'create_super_mask',
+    'count_valid_cells',
+    'threshold_curve',
     'create_id_matrix',
     'flatten_matrices',
+    'SparseGrid',
+    'StreamingMean',
+    'center_super_matrix',
+    'climatology_groups',
+    'detrend_super_matrix',
+    'restore_trend',
+    'filter_super_matrix',
     'reshape_to_spatial_grid',
     'create_super_matrix'
 ]
\ No newline at end of file
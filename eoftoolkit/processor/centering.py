@@ -0,0 +1,261 @@
+"""Module for centering super matrices in place."""
+
+import numpy as np
+import pandas as pd
+from eoftoolkit.core.exceptions import DimensionError
+
+
+CENTERING_MODES = ('spatial', 'temporal', 'climatology')
+
+CLIMATOLOGY_GROUPINGS = ('month', 'dayofyear')
+
+
+class StreamingMean:
+    """
+    Numerically stable running mean accumulated one row (or block of rows) at a time.
+
+    Uses Welford's update in its blockwise form (Chan et al.), so means can be
+    accumulated while rows are ingested without a second pass over the data.
+    Statistics are tracked separately per group label, and NaN entries are
+    ignored column by column.
+    """
+
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self._stats = {}
+
+    def update(self, values, group=None):
+        """
+        Add one row or a block of rows to the running statistics.
+
+        Parameters
+        ----------
+        values : ndarray
+            1D row or 2D block with rows as time steps.
+        group : hashable, optional
+            Group label the rows belong to. Default is a single group.
+        """
+        block = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        valid = ~np.isnan(block)
+        filled = np.where(valid, block, 0.0)
+
+        block_count = valid.sum(axis=0)
+        block_mean = np.divide(filled.sum(axis=0), block_count,
+                               out=np.zeros(block.shape[1]), where=block_count > 0)
+        block_m2 = np.sum(np.where(valid, (block - block_mean) ** 2, 0.0), axis=0)
+
+        if group not in self._stats:
+            self._stats[group] = [block_count, block_mean, block_m2]
+            return
+
+        count, mean, m2 = self._stats[group]
+        if count.shape != block_count.shape:
+            raise DimensionError(f"Row has {block.shape[1]} columns, "
+                                 f"but expected {count.shape[0]}")
+
+        total = count + block_count
+        delta = block_mean - mean
+        weight = np.divide(block_count, total, out=np.zeros(total.shape), where=total > 0)
+
+        mean += delta * weight
+        m2 += block_m2 + delta ** 2 * count * weight
+        self._stats[group] = [total, mean, m2]
+
+    @property
+    def groups(self):
+        """List of group labels seen so far."""
+        return list(self._stats.keys())
+
+    def count(self, group=None):
+        """Number of valid values per column for a group."""
+        return self._stats[group][0]
+
+    def mean(self, group=None):
+        """Running mean per column for a group."""
+        return self._stats[group][1]
+
+    def variance(self, group=None):
+        """Running population variance per column for a group."""
+        count, _, m2 = self._stats[group]
+        return np.divide(m2, count, out=np.full(m2.shape, np.nan), where=count > 0)
+
+
+def _to_datetime_index(dates):
+    """Convert parsed file dates (datetime, int or str) to a DatetimeIndex."""
+    converted = []
+    for date in dates:
+        if isinstance(date, (int, np.integer)):
+            # Integer file dates such as 199301 or 19930115
+            text = str(date)
+            formats = {4: '%Y', 6: '%Y%m', 8: '%Y%m%d'}
+            if len(text) not in formats:
+                raise ValueError(f"Cannot interpret integer date {date}")
+            date = pd.to_datetime(text, format=formats[len(text)])
+        converted.append(date)
+
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(converted))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Cannot interpret file dates: {str(e)}")
+
+
+def climatology_groups(dates, by='month'):
+    """
+    Get the climatology group of each time step from its date.
+
+    Parameters
+    ----------
+    dates : sequence
+        Date of each row, as datetime objects, integers like 199301 or 19930115,
+        or date strings (e.g. as returned by sort_files_by_date).
+    by : str, optional
+        'month' (1-12) or 'dayofyear' (1-365). Day of year is counted on a
+        365-day calendar, so 29 February shares a group with 28 February and
+        later days line up across leap and non-leap years. Default is 'month'.
+
+    Returns
+    -------
+    ndarray
+        Integer group label for each row.
+    """
+    if by not in CLIMATOLOGY_GROUPINGS:
+        raise ValueError(f"Unknown climatology grouping '{by}'. "
+                         f"Choose from {', '.join(CLIMATOLOGY_GROUPINGS)}")
+
+    index = _to_datetime_index(dates)
+
+    if by == 'month':
+        return np.asarray(index.month)
+
+    day = np.asarray(index.dayofyear)
+    after_feb = np.asarray(index.is_leap_year) & (day >= 60)
+    return day - after_feb
+
+
+def grouped_means(matrix, group_index, n_groups):
+    """
+    Mean of the rows of a matrix within each group, ignoring NaN.
+
+    The per-group sums are taken in one matrix product with a (groups x rows)
+    indicator matrix rather than a Python loop over groups.
+
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with rows as time steps and columns as spatial locations.
+    group_index : ndarray
+        Group index (0 to n_groups - 1) of each row.
+    n_groups : int
+        Number of groups.
+
+    Returns
+    -------
+    ndarray
+        Means with shape (n_groups, columns). NaN where a group has no data.
+    """
+    indicator = np.zeros((n_groups, matrix.shape[0]))
+    indicator[group_index, np.arange(matrix.shape[0])] = 1.0
+
+    valid = ~np.isnan(matrix)
+    if valid.all():
+        sums = indicator @ matrix
+        counts = indicator.sum(axis=1, keepdims=True)
+    else:
+        sums = indicator @ np.where(valid, matrix, 0.0)
+        counts = indicator @ valid
+
+    return np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+
+
+def center_super_matrix(super_matrix, mode='temporal', groups=None, accumulator=None):
+    """
+    Center a super matrix in place.
+
+    Parameters
+    ----------
+    super_matrix : ndarray
+        Super matrix with rows as time steps and columns as spatial locations.
+        Modified in place. NaN entries are ignored when computing means.
+    mode : str, optional
+        Centering mode:
+        - 'spatial': subtract the spatial mean of each time step
+        - 'temporal': subtract the temporal mean of each cell
+        - 'climatology': subtract the temporal mean of each cell within each group
+        Default is 'temporal'.
+    groups : array_like, optional
+        Group label for each row. Required for 'climatology'.
+    accumulator : StreamingMean, optional
+        Means accumulated during ingest. If None, they are computed here with a
+        grouped reduction over the rows.
+
+    Returns
+    -------
+    dict
+        Dictionary containing:
+        - 'mode': Centering mode used
+        - 'means': Subtracted means, (T, 1) for 'spatial', (1, N) for 'temporal'
+          and (G, N) for 'climatology'
+        - 'labels': Group labels matching the rows of 'means' (climatology only)
+        - 'groups': Index into 'labels' for each row (climatology only)
+    """
+    if mode not in CENTERING_MODES:
+        raise ValueError(f"Unknown centering mode '{mode}'. "
+                         f"Choose from {', '.join(CENTERING_MODES)}")
+
+    if mode == 'spatial':
+        means = np.nanmean(super_matrix, axis=1, keepdims=True)
+        super_matrix -= means
+        return {'mode': mode, 'means': means, 'labels': None, 'groups': None}
+
+    if mode == 'climatology':
+        if groups is None:
+            raise ValueError("Climatology centering requires a group label for each row")
+        groups = np.asarray(groups)
+        if len(groups) != super_matrix.shape[0]:
+            raise DimensionError(f"Got {len(groups)} group labels for "
+                                 f"{super_matrix.shape[0]} rows")
+    else:
+        groups = np.zeros(super_matrix.shape[0], dtype=int)
+
+    labels, group_index = np.unique(groups, return_inverse=True)
+    group_index = group_index.ravel()
+
+    if accumulator is None:
+        means = grouped_means(super_matrix, group_index, len(labels))
+    elif mode == 'temporal':
+        means = accumulator.mean().reshape(1, -1)
+    else:
+        means = np.vstack([accumulator.mean(label) for label in labels])
+
+    if mode == 'temporal':
+        super_matrix -= means
+        return {'mode': mode, 'means': means, 'labels': None, 'groups': None}
+
+    for g in range(len(labels)):
+        super_matrix[group_index == g] -= means[g]
+
+    return {'mode': mode, 'means': means, 'labels': labels, 'groups': group_index}
+
+
+def restore_means(matrix, centering):
+    """
+    Add the means removed by center_super_matrix back to a matrix.
+
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with the same shape as the centered super matrix.
+    centering : dict
+        Centering information returned by center_super_matrix.
+
+    Returns
+    -------
+    ndarray
+        New matrix with the means added back.
+    """
+    means = centering['means']
+
+    if centering['mode'] == 'climatology':
+        return matrix + means[centering['groups']]
+
+    return matrix + means
@@ -0,0 +1,89 @@
+"""Module for coarsening spatial grids by block averaging."""
+
+import numpy as np
+from eoftoolkit.core.exceptions import DimensionError
+
+
+def _normalize_factor(factor):
+    """Return the coarsening factor as a (row_factor, col_factor) tuple."""
+    if np.isscalar(factor):
+        factor = (factor, factor)
+
+    row_factor, col_factor = int(factor[0]), int(factor[1])
+
+    if row_factor < 1 or col_factor < 1:
+        raise DimensionError(f"Invalid coarsening factor {factor}")
+
+    return row_factor, col_factor
+
+
+def coarsen_matrix(matrix, factor, min_valid=1):
+    """
+    Coarsen a 2D matrix by averaging non-overlapping blocks, ignoring NaN values.
+
+    Parameters
+    ----------
+    matrix : ndarray
+        2D array to coarsen. Masked values are treated as missing.
+    factor : int or tuple
+        Block size as a single integer or as (rows, cols).
+    min_valid : int, optional
+        Minimum number of valid cells a block needs to get a value.
+        Blocks with fewer valid cells are set to NaN. Default is 1.
+
+    Returns
+    -------
+    ndarray
+        Coarsened matrix. Edges that do not fill a whole block are averaged
+        over the cells they contain.
+    """
+    row_factor, col_factor = _normalize_factor(factor)
+
+    if isinstance(matrix, np.ma.MaskedArray):
+        matrix = matrix.astype(np.float64).filled(np.nan)
+    else:
+        matrix = np.asarray(matrix, dtype=np.float64)
+
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+
+    rows, cols = matrix.shape
+    out_rows = -(-rows // row_factor)
+    out_cols = -(-cols // col_factor)
+
+    # Pad with NaN so every block is complete
+    padded = np.full((out_rows * row_factor, out_cols * col_factor), np.nan)
+    padded[:rows, :cols] = matrix
+
+    blocks = padded.reshape(out_rows, row_factor, out_cols, col_factor)
+    valid = ~np.isnan(blocks)
+
+    counts = valid.sum(axis=(1, 3))
+    sums = np.where(valid, blocks, 0.0).sum(axis=(1, 3))
+
+    return np.divide(sums, counts, out=np.full(counts.shape, np.nan),
+                     where=counts >= max(min_valid, 1))
+
+
+def coarsen_matrices(matrices_dict, factor, min_valid=1):
+    """
+    Coarsen all matrices in a dictionary.
+
+    Parameters
+    ----------
+    matrices_dict : dict
+        Dictionary with keys as matrix identifiers and values as 2D arrays.
+    factor : int or tuple
+        Block size as a single integer or as (rows, cols).
+    min_valid : int, optional
+        Minimum number of valid cells a block needs to get a value. Default is 1.
+
+    Returns
+    -------
+    dict
+        Dictionary with same keys and coarsened matrices as values.
+    """
+    return {
+        key: None if matrix is None else coarsen_matrix(matrix, factor, min_valid)
+        for key, matrix in matrices_dict.items()
+    }
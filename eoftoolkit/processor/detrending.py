@@ -0,0 +1,135 @@
+"""Module for removing polynomial trends from super matrices in place."""
+
+import numpy as np
+from eoftoolkit.core.exceptions import DimensionError
+
+
+# Columns are detrended in blocks of about this size by default
+DEFAULT_CHUNK_BYTES = 64 * 1024 ** 2
+
+
+def trend_design_matrix(times, order=1):
+    """
+    Build the polynomial design matrix for a set of sample times.
+
+    Times are rescaled to [-1, 1] first, which keeps the design matrix well
+    conditioned for higher orders and long records.
+
+    Parameters
+    ----------
+    times : array_like
+        Sample time of each row.
+    order : int, optional
+        Polynomial order. Default is 1 (linear).
+
+    Returns
+    -------
+    ndarray
+        Design matrix with shape (rows, order + 1), columns ordered from the
+        constant term up.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    span = times.max() - times.min()
+    scaled = 2.0 * (times - times.min()) / span - 1.0 if span > 0 else np.zeros_like(times)
+
+    return np.vander(scaled, order + 1, increasing=True)
+
+
+def detrend_super_matrix(super_matrix, order=1, times=None, chunk_size=None):
+    """
+    Remove a polynomial trend from every column of a super matrix in place.
+
+    All columns are fitted at once: the coefficients are the product of the
+    small pseudo-inverse of the (rows x order + 1) design matrix with the super
+    matrix, rather than one polyfit per cell. Columns with NaN are fitted from
+    their valid rows with batched normal equations; columns with too few valid
+    rows are left unchanged.
+
+    Parameters
+    ----------
+    super_matrix : ndarray
+        Super matrix with rows as time steps and columns as spatial locations.
+        Modified in place.
+    order : int, optional
+        Polynomial order of the trend. Default is 1 (linear).
+    times : array_like, optional
+        Sample time of each row. Default is evenly spaced rows.
+    chunk_size : int, optional
+        Number of columns processed at a time, to bound the size of temporary
+        arrays. Default is blocks of about 64 MiB.
+
+    Returns
+    -------
+    dict
+        Dictionary containing:
+        - 'order': Polynomial order
+        - 'design': Design matrix with shape (rows, order + 1)
+        - 'coefficients': Trend coefficients with shape (order + 1, columns)
+    """
+    n_rows, n_cols = super_matrix.shape
+
+    if order < 0:
+        raise ValueError("Trend order must be non-negative")
+
+    if times is None:
+        times = np.arange(n_rows)
+    elif len(times) != n_rows:
+        raise DimensionError(f"Got {len(times)} times for {n_rows} rows")
+
+    if n_rows <= order:
+        raise DimensionError(f"Cannot fit an order {order} trend to {n_rows} time steps")
+
+    design = trend_design_matrix(times, order)
+    pinv = np.linalg.pinv(design)
+    coefficients = np.empty((order + 1, n_cols))
+
+    if chunk_size is None:
+        chunk_size = max(1, DEFAULT_CHUNK_BYTES // (super_matrix.itemsize * n_rows))
+
+    for start in range(0, n_cols, chunk_size):
+        block = super_matrix[:, start:start + chunk_size]
+        valid = ~np.isnan(block)
+
+        if valid.all():
+            coef = pinv @ block
+        else:
+            # Per-column normal equations restricted to the valid rows
+            weights = valid.astype(np.float64)
+            gram = np.einsum('ti,tj,tn->nij', design, design, weights)
+            rhs = design.T @ np.where(valid, block, 0.0)
+            coef = np.zeros(rhs.shape)
+            solvable = np.linalg.matrix_rank(gram) == order + 1
+            if solvable.any():
+                coef[:, solvable] = np.linalg.solve(gram[solvable],
+                                                    rhs.T[solvable][..., None])[..., 0].T
+
+        coefficients[:, start:start + chunk_size] = coef
+        block -= design @ coef
+
+    return {'order': order, 'design': design, 'coefficients': coefficients}
+
+
+def restore_trend(matrix, detrending, rows=None):
+    """
+    Add the trend removed by detrend_super_matrix back to a matrix.
+
+    Parameters
+    ----------
+    matrix : ndarray
+        Matrix with the columns of the detrended super matrix, either all rows
+        or the rows selected by `rows`.
+    detrending : dict
+        Detrending information returned by detrend_super_matrix.
+    rows : int or array_like, optional
+        Rows of the super matrix that `matrix` holds. Default is all rows.
+
+    Returns
+    -------
+    ndarray
+        New matrix with the trend added back.
+    """
+    design = detrending['design']
+    if rows is not None:
+        design = design[rows]
+
+    return matrix + design @ detrending['coefficients']
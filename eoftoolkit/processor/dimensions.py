@@ -66,6 +66,16 @@ def standardize_dimensions(matrices_dict, target_dims=None):
             
         rows, cols = matrix.shape[:2]
         
+        # Plain float grids that already match are used as-is, without a copy
+        if (not isinstance(matrix, np.ma.MaskedArray) and matrix.dtype == np.float64
+                and matrix.shape == tuple(target_dims)):
+            standardized_dict[key] = matrix
+            continue
+        
+        # Masked cells become NaN rather than exposing their fill values
+        if isinstance(matrix, np.ma.MaskedArray):
+            matrix = matrix.astype(np.float64).filled(np.nan)
+        
         # Create a new matrix filled with NaN values
         standardized = np.full(target_dims, np.nan, dtype=np.float64)
         
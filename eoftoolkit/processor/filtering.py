@@ -0,0 +1,124 @@
+"""Module for temporal filtering of super matrices in place."""
+
+import numpy as np
+from scipy import fft, signal
+from scipy.ndimage import uniform_filter1d
+
+
+FILTER_METHODS = ('running_mean', 'butterworth', 'fft')
+
+# Columns are filtered in blocks of about this size by default
+DEFAULT_CHUNK_BYTES = 64 * 1024 ** 2
+
+
+def _band_frequencies(periods):
+    """Convert a (min_period, max_period) pair to (low, high) frequencies."""
+    if periods is None or len(periods) != 2:
+        raise ValueError("periods must be a (min_period, max_period) pair")
+
+    min_period, max_period = periods
+    if min_period is None and max_period is None:
+        raise ValueError("At least one of min_period and max_period is required")
+    if min_period is not None and min_period < 2:
+        raise ValueError("min_period must be at least 2 time steps (the Nyquist period)")
+    if min_period is not None and max_period is not None and max_period <= min_period:
+        raise ValueError("max_period must be larger than min_period")
+
+    low = None if max_period is None else 1.0 / max_period
+    high = None if min_period is None else 1.0 / min_period
+
+    return low, high
+
+
+def filter_super_matrix(super_matrix, method='butterworth', periods=None, window=None,
+                        order=4, chunk_size=None):
+    """
+    Filter every column of a super matrix along time, in place.
+
+    Parameters
+    ----------
+    super_matrix : ndarray
+        Super matrix with rows as time steps and columns as spatial locations.
+        Modified in place. Must not contain NaN.
+    method : str, optional
+        Filter to apply:
+        - 'running_mean': centered running mean over `window` time steps
+        - 'butterworth': zero-phase Butterworth filter (sosfiltfilt)
+        - 'fft': ideal spectral filter that zeroes frequencies outside the band
+        Default is 'butterworth'.
+    periods : tuple, optional
+        (min_period, max_period) in time steps for 'butterworth' and 'fft'.
+        Variability with periods in this range is kept. Use (min_period, None)
+        for a low-pass and (None, max_period) for a high-pass filter, e.g.
+        (24, None) keeps interannual variability of monthly data. For
+        'butterworth', a min_period of 2 (the Nyquist period) means no
+        low-pass side.
+    window : int, optional
+        Window length in time steps for 'running_mean'.
+    order : int, optional
+        Butterworth filter order. Default is 4.
+    chunk_size : int, optional
+        Number of columns filtered at a time, to bound the size of temporary
+        arrays. Default is blocks of about 64 MiB.
+
+    Returns
+    -------
+    dict
+        Dictionary describing the applied filter ('method', 'periods',
+        'window', 'order').
+    """
+    if method not in FILTER_METHODS:
+        raise ValueError(f"Unknown filter method '{method}'. "
+                         f"Choose from {', '.join(FILTER_METHODS)}")
+
+    if np.isnan(super_matrix).any():
+        raise ValueError("Cannot filter a super matrix that contains NaN; fill gaps first")
+
+    n_rows, n_cols = super_matrix.shape
+
+    if method == 'running_mean':
+        if window is None or window < 1:
+            raise ValueError("Running mean filtering requires a positive window")
+
+        def apply(block):
+            return uniform_filter1d(block, size=window, axis=0, mode='nearest')
+
+    elif method == 'butterworth':
+        low, high = _band_frequencies(periods)
+        if high is not None and high >= 0.5:
+            # A low-pass cutoff at the Nyquist frequency keeps every frequency
+            high = None
+        if low is None and high is None:
+            return {'method': method, 'periods': periods, 'window': window, 'order': order}
+        if low is None:
+            sos = signal.butter(order, high, btype='lowpass', output='sos', fs=1.0)
+        elif high is None:
+            sos = signal.butter(order, low, btype='highpass', output='sos', fs=1.0)
+        else:
+            sos = signal.butter(order, [low, high], btype='bandpass', output='sos', fs=1.0)
+
+        def apply(block):
+            return signal.sosfiltfilt(sos, block, axis=0)
+
+    else:
+        low, high = _band_frequencies(periods)
+        frequencies = fft.rfftfreq(n_rows)
+        keep = np.ones(len(frequencies), dtype=bool)
+        if low is not None:
+            keep &= frequencies >= low
+        if high is not None:
+            keep &= frequencies <= high
+
+        def apply(block):
+            spectrum = fft.rfft(block, axis=0)
+            spectrum[~keep] = 0.0
+            return fft.irfft(spectrum, n=n_rows, axis=0)
+
+    if chunk_size is None:
+        chunk_size = max(1, DEFAULT_CHUNK_BYTES // (super_matrix.itemsize * n_rows))
+
+    for start in range(0, n_cols, chunk_size):
+        block = super_matrix[:, start:start + chunk_size]
+        block[:] = apply(block)
+
+    return {'method': method, 'periods': periods, 'window': window, 'order': order}
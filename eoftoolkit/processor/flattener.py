@@ -27,24 +27,22 @@ def flatten_matrices(matrices_dict, id_matrix, super_mask=None):
     if super_mask is None:
         super_mask = np.where(id_matrix != '', 1, 0)
     
+    valid = super_mask == 1
+    
     # Flatten ID matrix
-    fl_id_matrix = id_matrix[super_mask == 1].reshape(1, -1)
+    fl_id_matrix = id_matrix[valid].reshape(1, -1)
     
     # Flatten each matrix
     flattened_dict = {}
     for key, matrix in matrices_dict.items():
         if isinstance(matrix, np.ma.MaskedArray):
-            # For masked arrays, extract only unmasked values in valid cells
-            # First create a view to avoid modifying the original
-            matrix_view = matrix.copy()
-            # Apply super_mask to the data (not the mask)
-            values = matrix_view.data[super_mask == 1]
-            # Keep only values that are not masked
-            values = values[~matrix_view.mask.flat[super_mask.flat == 1]]
+            # For masked arrays, masked values in valid cells become NaN
+            values = matrix.data[valid].astype(np.float64)
+            values[np.ma.getmaskarray(matrix)[valid]] = np.nan
             flattened = values.reshape(1, -1)
         else:
             # For regular arrays, extract values in valid cells
-            flattened = matrix[super_mask == 1].reshape(1, -1)
+            flattened = matrix[valid].reshape(1, -1)
         
         flattened_dict[key] = flattened
     
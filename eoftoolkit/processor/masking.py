@@ -3,7 +3,7 @@
 import numpy as np
 
 
-def create_binary_mask(matrix):
+def create_binary_mask(matrix, as_bool=False):
     """
     Create a binary mask for a matrix.
     
@@ -11,12 +11,21 @@ def create_binary_mask(matrix):
     ----------
     matrix : ndarray
         Input matrix.
+    as_bool : bool, optional
+        Whether to return a boolean validity mask instead of an integer one.
+        Boolean masks take an eighth of the memory. Default is False.
         
     Returns
     -------
     ndarray
         Binary mask with 1 for valid data and 0 for NaN/invalid data.
     """
+    if as_bool:
+        valid = ~np.isnan(np.asarray(matrix, dtype=np.float64))
+        if isinstance(matrix, np.ma.MaskedArray):
+            valid &= ~np.ma.getmaskarray(matrix)
+        return valid
+    
     # Convert masked arrays if needed
     if isinstance(matrix, np.ma.MaskedArray):
         mask = np.where(matrix.mask, 0, 1)
@@ -33,7 +42,8 @@ def create_super_mask(mask_dict, threshold=None):
     Parameters
     ----------
     mask_dict : dict
-        Dictionary with keys as mask identifiers and values as binary masks.
+        Dictionary with keys as mask identifiers and values as binary (integer
+        or boolean) masks.
     threshold : int, optional
         Minimum number of matrices that must have data for a cell to be included.
         If None, all matrices must have data (logical AND of all masks).
@@ -43,15 +53,85 @@ def create_super_mask(mask_dict, threshold=None):
     ndarray
         Super mask with 1 for cells that meet the threshold criteria.
     """
-    # Stack all masks
-    masks = list(mask_dict.values())
-    masks_sum = np.sum(masks, axis=0)
+    # Count valid matrices per cell without stacking all masks
+    valid_counts = count_valid_cells(mask_dict)
     
     # If threshold is not provided, use the total number of masks
     if threshold is None:
-        threshold = len(masks)
+        threshold = len(mask_dict)
+    
+    return super_mask_from_counts(valid_counts, threshold)
+
+
+def count_dtype(n_timestamps):
+    """Smallest unsigned integer type that can count up to n_timestamps."""
+    return np.uint16 if n_timestamps <= np.iinfo(np.uint16).max else np.uint32
+
+
+def count_valid_cells(mask_dict):
+    """
+    Count in how many masks each cell is valid.
+    
+    Parameters
+    ----------
+    mask_dict : dict
+        Dictionary with keys as mask identifiers and values as binary (integer
+        or boolean) masks.
+        
+    Returns
+    -------
+    ndarray
+        Valid-count grid as uint16 (uint32 for more than 65535 masks), a quarter
+        of the memory of a default integer grid.
+    """
+    valid_counts = None
+    for mask in mask_dict.values():
+        if valid_counts is None:
+            valid_counts = np.zeros(mask.shape, dtype=count_dtype(len(mask_dict)))
+        np.add(valid_counts, mask, out=valid_counts, casting='unsafe')
+    
+    return valid_counts
+
+
+def super_mask_from_counts(valid_counts, threshold):
+    """
+    Create a super mask from a valid-count grid.
+    
+    Parameters
+    ----------
+    valid_counts : ndarray
+        Number of timestamps each cell is valid in.
+    threshold : int
+        Minimum number of timestamps a cell must be valid in.
+        
+    Returns
+    -------
+    ndarray
+        Super mask with 1 for cells that meet the threshold.
+    """
+    return np.where(valid_counts >= threshold, 1, 0)
+
+
+def threshold_curve(valid_counts, n_timestamps=None):
+    """
+    Number of cells kept by the super mask for every possible threshold.
+    
+    Parameters
+    ----------
+    valid_counts : ndarray
+        Number of timestamps each cell is valid in.
+    n_timestamps : int, optional
+        Total number of timestamps. If None, uses the largest count.
+        
+    Returns
+    -------
+    ndarray
+        Array of length n_timestamps + 1 whose entry k is the number of cells
+        valid in at least k timestamps.
+    """
+    if n_timestamps is None:
+        n_timestamps = int(valid_counts.max()) if valid_counts.size else 0
     
-    # Create super mask
-    super_mask = np.where(masks_sum >= threshold, 1, 0)
+    histogram = np.bincount(valid_counts.ravel(), minlength=n_timestamps + 1)
     
-    return super_mask
\ No newline at end of file
+    return np.cumsum(histogram[::-1])[::-1]
\ No newline at end of file
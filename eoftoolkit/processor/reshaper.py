@@ -31,40 +31,21 @@ def reshape_to_spatial_grid(flattened_data, id_matrix, target_dims=None, flip_y=
     # Create empty grid filled with NaN - ENSURE float64 dtype
     reshaped_grid = np.full(target_dims, np.nan, dtype=np.float64)
     
-    # Get flattened ID matrix to use as a reference
-    fl_id_values = id_matrix[id_matrix != ''].flatten()
+    # Valid cells in row-major order, the same order used when flattening
+    rows, cols = np.nonzero(id_matrix != '')
     
     # Make sure flattened_data is 1D
     if len(flattened_data.shape) > 1:
         flattened_data = flattened_data.flatten()
     
     # Check that the lengths match
-    if len(fl_id_values) != len(flattened_data):
+    if len(rows) != len(flattened_data):
         raise ValueError(f"Length mismatch: flattened_data has {len(flattened_data)} elements, "
-                         f"but ID matrix has {len(fl_id_values)} valid cells")
+                         f"but ID matrix has {len(rows)} valid cells")
     
-    # Map the values back to the grid based on the ID
-    for idx, cell_id in enumerate(fl_id_values):
-        try:
-            # Ensure cell_id is a string
-            cell_id = str(cell_id)
-            
-            # Extract row and column indices from the ID
-            if len(cell_id) >= 4:
-                # Parse the ID (format should be RRCC)
-                row = int(cell_id[:2]) - 1  # Convert to 0-based index
-                col = int(cell_id[2:4]) - 1  # Convert to 0-based index
-            else:
-                # Handle unexpected ID format
-                continue
-                
-        except (ValueError, IndexError) as e:
-            # If parsing fails, skip this ID
-            continue
-        
-        # Assign the value to the grid (with bounds checking)
-        if 0 <= row < target_dims[0] and 0 <= col < target_dims[1]:
-            reshaped_grid[row, col] = flattened_data[idx]
+    # Scatter the values back to the grid (with bounds checking)
+    in_bounds = (rows < target_dims[0]) & (cols < target_dims[1])
+    reshaped_grid[rows[in_bounds], cols[in_bounds]] = flattened_data[in_bounds]
     
     #print(f"Before flip: reshaped_grid[0,0] = {reshaped_grid[0,0]}")
     #print(f"Before flip: reshaped_grid shape = {reshaped_grid.shape}")
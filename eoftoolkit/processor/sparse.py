@@ -0,0 +1,200 @@
+"""Module for storing grids as valid cells only."""
+
+import numpy as np
+from eoftoolkit.core.exceptions import DimensionError
+from eoftoolkit.processor.masking import count_dtype
+
+
+class SparseGrid:
+    """
+    A 2D grid stored as the flat indices and values of its valid cells.
+
+    For mostly-masked grids (e.g. coastal ocean products) this avoids keeping
+    full (rows, cols) arrays for every timestamp. Full grids are only
+    materialized on request with `to_dense`.
+
+    Parameters
+    ----------
+    indices : ndarray
+        Row-major flat indices of the valid cells in a grid of `shape`.
+    values : ndarray
+        Values of the valid cells.
+    shape : tuple
+        Shape (rows, cols) of the full grid.
+    """
+
+    def __init__(self, indices, values, shape):
+        """Initialize a sparse grid."""
+        if len(indices) != len(values):
+            raise DimensionError(f"Got {len(indices)} indices for {len(values)} values")
+
+        self.indices = indices
+        self.values = values
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """
+        Create a sparse grid from a 2D array, dropping NaN and masked cells.
+
+        Parameters
+        ----------
+        matrix : ndarray or MaskedArray
+            2D (or 1D, treated as one row) input grid.
+
+        Returns
+        -------
+        SparseGrid
+            Sparse representation of the valid cells.
+        """
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+
+        if isinstance(matrix, np.ma.MaskedArray):
+            data = np.asarray(matrix.data, dtype=np.float64)
+            valid = ~np.ma.getmaskarray(matrix) & ~np.isnan(data)
+        else:
+            data = np.asarray(matrix, dtype=np.float64)
+            valid = ~np.isnan(data)
+
+        index_dtype = np.int32 if data.size < np.iinfo(np.int32).max else np.int64
+        indices = np.flatnonzero(valid).astype(index_dtype)
+
+        return cls(indices, data.ravel()[indices], data.shape[:2])
+
+    @property
+    def nnz(self):
+        """Number of valid cells."""
+        return len(self.indices)
+
+    def flat_indices(self, target_dims=None):
+        """
+        Flat indices of the valid cells in a (possibly larger) target grid.
+
+        Grids are aligned at the top-left corner, matching the padding done by
+        standardize_dimensions.
+
+        Parameters
+        ----------
+        target_dims : tuple, optional
+            Target dimensions as (rows, cols). If None, uses the grid's own shape.
+
+        Returns
+        -------
+        ndarray
+            Flat indices into the target grid.
+        """
+        if target_dims is None or tuple(target_dims) == self.shape:
+            return self.indices
+
+        if target_dims[0] < self.shape[0] or target_dims[1] < self.shape[1]:
+            raise DimensionError(f"Target dimensions {target_dims} are smaller "
+                                 f"than the grid shape {self.shape}")
+
+        rows, cols = np.divmod(self.indices.astype(np.int64), self.shape[1])
+        return rows * target_dims[1] + cols
+
+    def to_dense(self, target_dims=None):
+        """
+        Materialize the full grid with NaN in invalid cells.
+
+        Parameters
+        ----------
+        target_dims : tuple, optional
+            Target dimensions as (rows, cols). If None, uses the grid's own shape.
+
+        Returns
+        -------
+        ndarray
+            Dense 2D grid.
+        """
+        if target_dims is None:
+            target_dims = self.shape
+
+        dense = np.full(target_dims[0] * target_dims[1], np.nan)
+        dense[self.flat_indices(target_dims)] = self.values
+
+        return dense.reshape(target_dims)
+
+
+def sparse_target_dims(grids_dict):
+    """
+    Get the common dimensions of a set of sparse grids.
+
+    Parameters
+    ----------
+    grids_dict : dict
+        Dictionary with keys as grid identifiers and SparseGrid values.
+
+    Returns
+    -------
+    tuple
+        Maximum (rows, cols) over all grids.
+    """
+    if not grids_dict:
+        raise DimensionError("No grids provided for standardization")
+
+    shapes = np.array([grid.shape for grid in grids_dict.values()])
+    return tuple(int(n) for n in shapes.max(axis=0))
+
+
+def count_sparse_valid_cells(grids_dict, target_dims):
+    """
+    Count in how many grids each cell is valid, without dense per-grid masks.
+
+    Parameters
+    ----------
+    grids_dict : dict
+        Dictionary with keys as grid identifiers and SparseGrid values.
+    target_dims : tuple
+        Target dimensions as (rows, cols).
+
+    Returns
+    -------
+    ndarray
+        Valid-count grid as uint16 (uint32 for more than 65535 grids).
+    """
+    counts = np.zeros(target_dims[0] * target_dims[1], dtype=count_dtype(len(grids_dict)))
+
+    for grid in grids_dict.values():
+        # Indices are unique within a grid, so plain fancy indexing is safe
+        counts[grid.flat_indices(target_dims)] += 1
+
+    return counts.reshape(target_dims)
+
+
+def flatten_sparse_grids(grids_dict, super_mask):
+    """
+    Flatten sparse grids to 1D vectors over the cells of the super mask.
+
+    Parameters
+    ----------
+    grids_dict : dict
+        Dictionary with keys as grid identifiers and SparseGrid values.
+    super_mask : ndarray
+        Super mask with 1 for valid cells.
+
+    Returns
+    -------
+    dict
+        Dictionary with same keys and flattened (1, N) arrays as values, in the
+        same cell order as flatten_matrices. Cells of the super mask a grid has
+        no value for are NaN.
+    """
+    target_dims = super_mask.shape
+
+    # Map every grid cell to its column in the flattened vector (-1 if excluded)
+    column_of = np.full(super_mask.size, -1, dtype=np.int64)
+    valid_cells = np.flatnonzero(super_mask == 1)
+    column_of[valid_cells] = np.arange(len(valid_cells))
+
+    flattened_dict = {}
+    for key, grid in grids_dict.items():
+        columns = column_of[grid.flat_indices(target_dims)]
+        keep = columns >= 0
+
+        flattened = np.full(len(valid_cells), np.nan)
+        flattened[columns[keep]] = grid.values[keep]
+        flattened_dict[key] = flattened.reshape(1, -1)
+
+    return flattened_dict
@@ -6,6 +6,7 @@ Tests how different EOFProcessor methods work together
 import unittest
 import tempfile
 import shutil
+import os
 import numpy as np
 import netCDF4 as nc
 from pathlib import Path
@@ -16,6 +17,9 @@ project_dir = Path(__file__).parents[2]
 sys.path.insert(0, str(project_dir))
 
 from eoftoolkit.core.processor import EOFProcessor
+from eoftoolkit.analysis.svd import perform_svd
+from eoftoolkit.core.exceptions import EOFToolkitError
+from eoftoolkit.io.reader import read_netcdf
 
 
 class TestEOFProcessorIntegration(unittest.TestCase):
@@ -165,6 +169,401 @@ class TestEOFProcessorIntegration(unittest.TestCase):
         for i in range(1, len(errors)):
             self.assertLess(errors[i], errors[i-1])
     
+    def test_temporal_centering(self):
+        """Test per-cell temporal centering of the super matrix"""
+        self.processor.process_directory(str(self.data_dir), centering='temporal')
+        
+        np.testing.assert_allclose(self.processor.super_matrix.mean(axis=0), 0, atol=1e-10)
+        self.assertEqual(self.processor.centering['mode'], 'temporal')
+        
+        # SVD still runs on the centered matrix
+        results = self.processor.perform_svd(num_modes=3)
+        self.assertEqual(results['eofs'].shape[0], 3)
+    
+    def test_latitude_weighting(self):
+        """Test sqrt(cos(lat)) weighting and un-weighted EOF output"""
+        self.processor.process_directory(str(self.data_dir), weighting='coslat')
+        weights = self.processor.weights
+        self.assertEqual(weights.shape, (self.processor.super_matrix.shape[1],))
+        
+        self.processor.perform_svd(num_modes=2)
+        eof = self.processor.get_eof(1, reshape=False)
+        np.testing.assert_allclose(eof, self.processor.svd_results['eofs'][0] / weights)
+        
+        # Weights are reused for the same grid
+        self.processor.process_directory(str(self.data_dir), weighting='coslat')
+        self.assertIs(self.processor.weights, weights)
+    
+    def test_coarsened_preview(self):
+        """Test coarsening keeps grids, IDs and getters consistent"""
+        self.processor.process_directory(str(self.data_dir), coarsen=2)
+        
+        self.assertEqual(self.processor.target_dims, (13, 15))
+        self.assertEqual(self.processor.id_matrix.shape, (13, 15))
+        self.assertEqual(self.processor.latitude.shape, (13, 15))
+        
+        self.processor.perform_svd(num_modes=2)
+        eof = self.processor.get_eof(1, reshape=True)
+        self.assertEqual(eof.shape, (13, 15))
+        self.assertEqual(np.sum(~np.isnan(eof)), self.processor.super_matrix.shape[1])
+    
+    def test_cached_stages_rerun_only_tail(self):
+        """Test that changing centering reuses reading, masking and flattening"""
+        self.processor.process_directory(str(self.data_dir))
+        self.processor.perform_svd(num_modes=3)
+        first_matrix = self.processor.super_matrix.copy()
+        
+        self.processor.process_directory(str(self.data_dir), centering='temporal')
+        last_run = self.processor._pipeline.last_run
+        
+        for stage in ['read', 'standardize', 'mask', 'id', 'flatten']:
+            self.assertEqual(last_run[stage], 'cached')
+        self.assertEqual(last_run['center'], 'computed')
+        self.assertEqual(last_run['stack'], 'computed')
+        self.assertFalse(np.allclose(first_matrix, self.processor.super_matrix))
+        
+        # SVD is recomputed for the new super matrix
+        self.assertIsNone(self.processor.svd_results)
+        self.processor.perform_svd(num_modes=3)
+        self.assertEqual(last_run['svd'], 'computed')
+    
+    def test_sparse_matches_dense(self):
+        """Test that the valid-cells-only path gives the same super matrix"""
+        dense = self.processor.process_directory(str(self.data_dir))['super_matrix'].copy()
+        
+        sparse_processor = EOFProcessor(verbose=False)
+        result = sparse_processor.process_directory(str(self.data_dir), sparse=True)
+        
+        self.assertIsNone(sparse_processor.mask_dict)
+        np.testing.assert_allclose(result['super_matrix'], dense)
+        
+        sparse_processor.perform_svd(num_modes=2)
+        self.assertEqual(sparse_processor.get_eof(1).shape, sparse_processor.target_dims)
+    
+    def test_regional_svd_shared_ingest(self):
+        """Test regional EOFs sliced from one ingest"""
+        self.processor.process_directory(str(self.data_dir), centering='temporal')
+        regions = {
+            'west': (0, 15, 0, 25),
+            'east': (15, 30, 0, 25)
+        }
+        results = self.processor.perform_regional_svd(regions, num_modes=2, n_workers=2)
+        
+        self.assertEqual(set(results), {'west', 'east'})
+        n_west = len(results['west']['columns'])
+        self.assertEqual(results['west']['eofs'].shape, (2, n_west))
+        
+        eof = self.processor.get_regional_eof('west', 1)
+        self.assertEqual(eof.shape, self.processor.target_dims)
+        self.assertEqual(np.sum(~np.isnan(eof)), n_west)
+    
+    def test_gap_filling(self):
+        """Test keeping cells with partial coverage and filling their gaps"""
+        # Knock out a block of cells in two of the ten timestamps
+        for t in (2, 7):
+            with nc.Dataset(str(self.data_dir / f"synthetic_{t:03d}.nc"), 'a') as ds:
+                ds.variables['z'][5:10, 5:10] = np.nan
+        
+        strict = EOFProcessor(verbose=False)
+        strict.process_directory(str(self.data_dir))
+        self.assertEqual(np.sum(strict.super_mask), 25 * 30 - 25)
+        self.assertIsNone(strict.gap_fill_info)
+        
+        result = self.processor.process_directory(str(self.data_dir), min_valid_fraction=0.8,
+                                                  gap_fill_modes=3)
+        
+        self.assertEqual(np.sum(self.processor.super_mask), 25 * 30)
+        self.assertFalse(np.isnan(result['super_matrix']).any())
+        self.assertEqual(np.sum(self.processor.gap_fill_info['gap_mask']), 2 * 25)
+        
+        self.processor.perform_svd(num_modes=3)
+        self.assertEqual(self.processor.get_eof(1).shape, self.processor.target_dims)
+        
+        # Other thresholds can be explored from the kept valid counts
+        self.assertEqual(self.processor.valid_counts.dtype, np.uint16)
+        curve = self.processor.get_threshold_curve()
+        self.assertEqual(curve[10], 25 * 30 - 25)
+        self.assertEqual(curve[8], 25 * 30)
+        np.testing.assert_array_equal(self.processor.get_super_mask_at(10), strict.super_mask)
+    
+    def test_gap_filling_keeps_centering(self):
+        """Test that filled cells are centered again with the rest of the matrix"""
+        for t in (2, 7):
+            with nc.Dataset(str(self.data_dir / f"synthetic_{t:03d}.nc"), 'a') as ds:
+                ds.variables['z'][5:10, 5:10] = np.nan
+        
+        result = self.processor.process_directory(str(self.data_dir), centering='temporal',
+                                                  weighting='coslat', min_valid_fraction=0.8)
+        
+        self.assertIsNotNone(self.processor.gap_fill_info['num_modes'])
+        unweighted = self.processor._unweight(result['super_matrix'])
+        np.testing.assert_allclose(unweighted.mean(axis=0), 0, atol=1e-10)
+    
+    def test_monthly_climatology_from_dates(self):
+        """Test removing a monthly climatology grouped by file dates"""
+        # Rename the files to Jan-May of two years
+        for t in range(10):
+            year, month = 2021 + t // 5, t % 5 + 1
+            os.rename(self.data_dir / f"synthetic_{t:03d}.nc",
+                      self.data_dir / f"sst_{year}{month:02d}.nc")
+        
+        result = self.processor.process_directory(
+            str(self.data_dir), date_pattern=r'(\d{6})', date_format='%Y%m',
+            centering='climatology', climatology_by='month'
+        )
+        
+        self.assertEqual(self.processor.centering['means'].shape[0], 5)
+        np.testing.assert_array_equal(self.processor.centering['labels'], [1, 2, 3, 4, 5])
+        np.testing.assert_allclose(result['super_matrix'][:5], -result['super_matrix'][5:],
+                                   atol=1e-10)
+    
+    def test_detrending(self):
+        """Test removing a linear trend before the SVD and adding it back"""
+        self.processor.process_directory(str(self.data_dir), centering=None)
+        raw = self.processor.super_matrix.copy()
+        
+        detrended = EOFProcessor(verbose=False)
+        result = detrended.process_directory(str(self.data_dir), centering=None, detrend=1)
+        
+        self.assertEqual(detrended.detrending['coefficients'].shape, (2, raw.shape[1]))
+        np.testing.assert_allclose(result['super_matrix'].mean(axis=0), 0, atol=1e-10)
+        
+        detrended.perform_svd()
+        detrended.reconstruct()
+        n_modes = len(detrended.svd_results['singular_values'])
+        restored = detrended.get_reconstruction(n_modes, timestamp_index=4, reshape=False,
+                                                add_trend=True)
+        np.testing.assert_allclose(restored, raw[4], atol=1e-8)
+    
+    def test_detrending_with_centering(self):
+        """Test that centering after detrending uses the detrended rows"""
+        result = self.processor.process_directory(str(self.data_dir), centering='temporal',
+                                                  detrend=1)
+        np.testing.assert_allclose(result['super_matrix'].mean(axis=0), 0, atol=1e-10)
+        
+        climatology = EOFProcessor(verbose=False)
+        result = climatology.process_directory(str(self.data_dir), centering='climatology',
+                                               climatology_period=2, detrend=1)
+        matrix = result['super_matrix']
+        np.testing.assert_allclose(matrix[0::2].mean(axis=0), 0, atol=1e-10)
+        np.testing.assert_allclose(matrix[1::2].mean(axis=0), 0, atol=1e-10)
+    
+    def test_temporal_filter(self):
+        """Test low-pass filtering the super matrix before the SVD"""
+        result = self.processor.process_directory(
+            str(self.data_dir), centering='temporal',
+            temporal_filter={'method': 'fft', 'periods': (5, None)}
+        )
+        
+        self.assertEqual(self.processor.temporal_filter['method'], 'fft')
+        spectrum = np.abs(np.fft.rfft(result['super_matrix'], axis=0))
+        np.testing.assert_allclose(spectrum[3:], 0, atol=1e-8)
+        
+        self.processor.perform_svd(num_modes=2)
+    
+    def test_nan_native_ingest(self):
+        """Test that NaN-native ingest matches the masked-array path"""
+        for t in (1, 4):
+            with nc.Dataset(str(self.data_dir / f"synthetic_{t:03d}.nc"), 'a') as ds:
+                ds.variables['z'][0:3, 0:4] = np.nan
+        
+        masked = self.processor.process_directory(str(self.data_dir))['super_matrix'].copy()
+        
+        nan_processor = EOFProcessor(verbose=False)
+        result = nan_processor.process_directory(str(self.data_dir), as_masked=False)
+        
+        self.assertTrue(all(m.dtype == bool for m in nan_processor.mask_dict.values()))
+        self.assertEqual(np.sum(nan_processor.super_mask), 25 * 30 - 12)
+        np.testing.assert_allclose(result['super_matrix'], masked)
+    
+    def test_multivariate_combined_eof(self):
+        """Test combined EOFs of two variables with blockwise normalization"""
+        # Second variable: same timestamps, different units
+        other_dir = Path(self.test_dir) / 'other'
+        shutil.copytree(self.data_dir, other_dir)
+        for path in other_dir.glob('*.nc'):
+            with nc.Dataset(str(path), 'a') as ds:
+                ds.variables['z'][:] = ds.variables['z'][:] * 100.0
+        
+        result = self.processor.process_multivariate(
+            {'sst': str(self.data_dir), 'slp': str(other_dir)}, centering='temporal'
+        )
+        
+        combined = result['super_matrix']
+        self.assertEqual(combined.shape, (10, 2 * 25 * 30))
+        for name, variable in result['variables'].items():
+            block = combined[:, variable['columns']]
+            self.assertAlmostEqual(np.sum(np.var(block, axis=0)), 1.0)
+        self.assertAlmostEqual(result['variables']['slp']['scale'] /
+                               result['variables']['sst']['scale'], 100.0, places=3)
+        
+        self.processor.perform_svd(num_modes=2)
+        sst_eof = self.processor.get_variable_eof('sst', 1)
+        slp_eof = self.processor.get_variable_eof('slp', 1)
+        self.assertEqual(sst_eof.shape, self.processor.get_variable_processor('sst').target_dims)
+        np.testing.assert_allclose(slp_eof, 100.0 * sst_eof, rtol=1e-3, atol=1e-8)
+        
+        with self.assertRaises(EOFToolkitError):
+            self.processor.get_eof(1)
+        
+        # Single-field operations either work on the combined matrix or say why not
+        self.assertEqual(len(self.processor.extend_modes(1)['singular_values']), 3)
+        self.assertEqual(self.processor.get_original_data(0, reshape=False).shape,
+                         (2 * 25 * 30,))
+        with self.assertRaises(EOFToolkitError):
+            self.processor.update_svd(combined[0])
+        with self.assertRaises(EOFToolkitError):
+            self.processor.get_original_data(0)
+        with self.assertRaises(EOFToolkitError):
+            self.processor.perform_regional_svd({'north': (0, 10, 0, 10)})
+    
+    def test_windowed_svd(self):
+        """Test sliding-window EOFs from one ingest"""
+        self.processor.process_directory(str(self.data_dir), centering='temporal')
+        results = self.processor.perform_windowed_svd(6, step=2, num_modes=2)
+        
+        self.assertEqual(sorted(results), [0, 2, 4])
+        self.assertEqual(results[2]['file_keys'], ('synthetic_002', 'synthetic_007'))
+        self.assertEqual(self.processor.get_window_eof(4, 1).shape, self.processor.target_dims)
+        self.assertGreater(np.abs(results[2]['means']).max(), 0)
+        
+        # Spatially centered rows are not re-centered in time by default
+        self.processor.process_directory(str(self.data_dir), centering='spatial')
+        results = self.processor.perform_windowed_svd(6, step=2, num_modes=2)
+        np.testing.assert_array_equal(results[2]['means'], 0)
+        results = self.processor.perform_windowed_svd(6, step=2, num_modes=2, center=True)
+        self.assertGreater(np.abs(results[2]['means']).max(), 0)
+    
+    def test_ensemble_shared_grid(self):
+        """Test ensemble members sharing one super mask and ID matrix"""
+        member_dir = Path(self.test_dir) / 'member2'
+        shutil.copytree(self.data_dir, member_dir)
+        with nc.Dataset(str(member_dir / 'synthetic_003.nc'), 'a') as ds:
+            ds.variables['z'][0, 0] = np.nan
+        
+        result = self.processor.process_ensemble(
+            {'m1': str(self.data_dir), 'm2': str(member_dir)}
+        )
+        
+        # The cell missing in one member is dropped for all members
+        self.assertEqual(result['ensemble_matrix'].shape, (2, 10, 25 * 30 - 1))
+        np.testing.assert_allclose(result['ensemble_matrix'][0], result['ensemble_matrix'][1])
+        
+        # Members are centered like process_directory by default (spatially)
+        np.testing.assert_allclose(result['ensemble_matrix'].mean(axis=2), 0, atol=1e-10)
+        self.assertEqual(self.processor.ensemble_centering['m1']['mode'], 'spatial')
+        
+        results = self.processor.perform_ensemble_svd(num_modes=2)
+        self.assertEqual(set(results), {'m1', 'm2'})
+        eof = self.processor.get_member_eof('m2', 1)
+        self.assertEqual(eof.shape, self.processor.target_dims)
+        self.assertTrue(np.isnan(eof[-1, 0]))  # getters flip rows
+    
+    def test_randomized_svd(self):
+        """Test the randomized SVD backend through the processor"""
+        self.processor.process_directory(str(self.data_dir), centering='temporal')
+        full = self.processor.perform_svd(num_modes=2)
+        randomized = self.processor.perform_svd(num_modes=2, method='randomized', random_state=0)
+        
+        np.testing.assert_allclose(randomized['singular_values'], full['singular_values'],
+                                   rtol=1e-6)
+        self.assertEqual(self.processor.get_eof(1).shape, self.processor.target_dims)
+    
+    def test_update_svd_with_new_files(self):
+        """Test appending new timestamps to the SVD results"""
+        new_files = [self.data_dir / f'synthetic_{i:03d}.nc' for i in (8, 9)]
+        new_grids = [read_netcdf(str(path))['z'] for path in new_files]
+        for path in new_files:
+            path.rename(Path(self.test_dir) / path.name)
+        
+        self.processor.process_directory(str(self.data_dir), centering='temporal')
+        self.processor.perform_svd(num_modes=3)
+        results = self.processor.update_svd(np.ma.stack(new_grids),
+                                            file_keys=['synthetic_008', 'synthetic_009'])
+        
+        self.assertEqual(results['pcs'].shape, (10, 3))
+        self.assertEqual(self.processor.file_keys[-1], 'synthetic_009')
+        self.assertEqual(self.processor.svd_updates, 1)
+        self.assertEqual(self.processor.get_eof(1).shape, self.processor.target_dims)
+        
+        # A periodic full recomputation resets the update counter
+        self.processor.update_svd(self.processor.get_original_data(0, reshape=False),
+                                  recompute_every=2)
+        self.assertEqual(self.processor.svd_updates, 0)
+        self.assertEqual(self.processor.svd_results['pcs'].shape, (11, 3))
+    
+    def test_update_svd_reuses_buffer_and_method(self):
+        """Test that updates append in place and recomputations keep the backend"""
+        self.processor.process_directory(str(self.data_dir), centering='temporal')
+        self.processor.perform_svd(num_modes=2, compute_surfaces=False, method='lanczos',
+                                   random_state=0, tol=1e-10)
+        row = self.processor.super_matrix[0] + self.processor.centering['means'][0]
+        
+        self.processor.update_svd(row)
+        buffer = self.processor.super_matrix.base
+        self.processor.update_svd(row)
+        
+        self.assertIs(self.processor.super_matrix.base, buffer)
+        self.assertEqual(self.processor.super_matrix.shape[0], 12)
+        np.testing.assert_allclose(self.processor.super_matrix[-1],
+                                   self.processor.super_matrix[0])
+        
+        results = self.processor.update_svd(row, recompute_every=3)
+        self.assertEqual(self.processor.svd_updates, 0)
+        self.assertIn('convergence', results)
+        self.assertEqual(results['convergence']['tol'], 1e-10)
+        self.assertEqual(self.processor.svd_settings['method'], 'lanczos')
+    
+    def test_extend_modes(self):
+        """Test extending the computed modes through the processor"""
+        self.processor.process_directory(str(self.data_dir), centering='temporal')
+        self.processor.perform_svd(num_modes=2)
+        results = self.processor.extend_modes(2, random_state=0)
+        
+        self.assertEqual(len(results['singular_values']), 4)
+        self.assertIs(results['super_matrix'], self.processor.super_matrix)
+        self.assertEqual(self.processor.get_eof(4).shape, self.processor.target_dims)
+        
+        # The extension follows the backend and settings of the last SVD
+        full = perform_svd(self.processor.super_matrix, num_modes=4, compute_surfaces=False)
+        np.testing.assert_allclose(results['singular_values'], full['singular_values'],
+                                   rtol=1e-10)
+        self.processor.perform_svd(num_modes=2, method='lanczos', random_state=0, tol=1e-12)
+        results = self.processor.extend_modes(2)
+        np.testing.assert_allclose(results['singular_values'], full['singular_values'],
+                                   rtol=1e-10)
+    
+    def test_stream_svd_during_ingest(self):
+        """Test that the streamed SVD matches a separate SVD of the same super matrix"""
+        for centering in ('spatial', 'temporal', 'climatology'):
+            with self.subTest(centering=centering):
+                streamed = self.processor.process_directory(
+                    str(self.data_dir), centering=centering, climatology_period=3,
+                    weighting='coslat', stream_svd={'num_modes': 2, 'block_size': 3}
+                )['super_matrix'].copy()
+                stream_results = self.processor.svd_results
+                stream_means = self.processor.centering['means']
+                
+                self.processor.process_directory(str(self.data_dir), centering=centering,
+                                                 climatology_period=3, weighting='coslat')
+                self.assertIsNone(self.processor.svd_results)
+                results = self.processor.perform_svd(num_modes=2)
+                
+                np.testing.assert_allclose(streamed, self.processor.super_matrix, atol=1e-12)
+                np.testing.assert_allclose(stream_means, self.processor.centering['means'],
+                                           atol=1e-12)
+                np.testing.assert_allclose(stream_results['singular_values'],
+                                           results['singular_values'], rtol=1e-8)
+                np.testing.assert_allclose(stream_results['explained_variance'],
+                                           results['explained_variance'], rtol=1e-8)
+                np.testing.assert_allclose(
+                    np.abs(np.sum(stream_results['eofs'] * results['eofs'], axis=1)), 1.0,
+                    rtol=1e-8)
+        
+        with self.assertRaises(EOFToolkitError):
+            self.processor.process_directory(str(self.data_dir), detrend=1,
+                                             stream_svd={'num_modes': 2})
+    
     def test_date_handling(self):
         """Test date extraction and handling"""
         # Process with specific date pattern
@@ -14,21 +14,47 @@ import tempfile
 import os
 from datetime import datetime
 import shutil
+from unittest import mock
 
 # Import EOFtoolkit modules
-from eoftoolkit.analysis.svd import perform_svd, extract_modes
+from eoftoolkit.analysis.svd import (
+    perform_svd, extract_modes, truncated_svd, snapshot_svd, lanczos_svd, CorrespondingSurfaces,
+    update_svd, extend_modes, mixed_precision_svd
+)
 from eoftoolkit.analysis.reconstruction import reconstruct_from_modes, add_means_back
+from eoftoolkit.analysis.regional import run_regional_svd, select_region_columns
+from eoftoolkit.analysis.gapfill import dineof_fill
+from eoftoolkit.analysis.windowed import run_windowed_svd, sliding_windows
+from eoftoolkit.analysis.ensemble import run_ensemble_svd
+from eoftoolkit.analysis.incremental import IncrementalSVD
+from eoftoolkit.analysis.tsqr import tsqr_svd
+from eoftoolkit.analysis.costmodel import (
+    AUTO_METHODS, cost_model_path, load_cost_model, estimate_svd_costs, select_svd_method
+)
 from eoftoolkit.analysis.validation import calculate_error_metrics, calculate_temporal_error_metrics, calculate_spatial_error_metrics
 from eoftoolkit.processor.dimensions import standardize_dimensions
-from eoftoolkit.processor.masking import create_binary_mask, create_super_mask
+from eoftoolkit.processor.coarsening import coarsen_matrix, coarsen_matrices
+from eoftoolkit.processor.masking import (
+    create_binary_mask, create_super_mask, count_valid_cells, threshold_curve,
+    super_mask_from_counts
+)
 from eoftoolkit.processor.identification import create_id_matrix, get_id_coordinates
 from eoftoolkit.processor.flattener import flatten_matrices, center_matrices
+from eoftoolkit.processor.centering import (
+    StreamingMean, center_super_matrix, restore_means, climatology_groups, grouped_means
+)
+from eoftoolkit.processor.detrending import detrend_super_matrix, restore_trend
+from eoftoolkit.processor.filtering import filter_super_matrix
+from eoftoolkit.processor.sparse import SparseGrid, count_sparse_valid_cells, flatten_sparse_grids
 from eoftoolkit.processor.reshaper import reshape_to_spatial_grid, reshape_all_to_spatial_grid
 from eoftoolkit.processor.stacker import create_super_matrix
 from eoftoolkit.io.reader import read_netcdf
 from eoftoolkit.io.sorter import sort_files_by_date
+from eoftoolkit.geo.grid import compute_latitude_weights
+from eoftoolkit.core.pipeline import Pipeline
 from eoftoolkit.core.utils import extract_date_from_filename, filter_files_by_date_range
-from eoftoolkit.core.exceptions import EOFToolkitError, FileReadError, DimensionError, SVDError, ReconstructionError
+from eoftoolkit.core.exceptions import EOFToolkitError, FileReadError, DimensionError, SVDError
+
 
 class TestSVD(unittest.TestCase):
     """Test SVD analysis functions"""
@@ -114,6 +140,24 @@ class TestSVD(unittest.TestCase):
         expected_shape = (self.simple_matrix.shape[0], self.simple_matrix.shape[1])
         self.assertEqual(mode_1_surface.shape, expected_shape)
     
+    def test_corresponding_surfaces_on_access(self):
+        """Test that surfaces are computed lazily, in full or in blocks"""
+        results = perform_svd(self.random_matrix, num_modes=4)
+        surfaces = results['corresponding_surfaces']
+        
+        self.assertIsInstance(surfaces, CorrespondingSurfaces)
+        self.assertEqual(list(surfaces), ['mode_1', 'mode_2', 'mode_3', 'mode_4'])
+        full = np.outer(results['pcs'][:, 1], results['eofs'][1])
+        np.testing.assert_allclose(surfaces['mode_2'], full)
+        np.testing.assert_allclose(surfaces.surface(2, rows=slice(2, 5), columns=[0, 7]),
+                                   full[2:5][:, [0, 7]])
+        with self.assertRaises(KeyError):
+            surfaces['mode_5']
+        
+        extracted = extract_modes(results, [2, 4])['corresponding_surfaces']
+        self.assertEqual(list(extracted), ['mode_2', 'mode_4'])
+        np.testing.assert_allclose(extracted['mode_2'], full)
+    
     def test_extract_modes(self):
         """Test extracting specific modes"""
         results = perform_svd(self.random_matrix)
@@ -220,6 +264,499 @@ class TestReconstruction(unittest.TestCase):
         np.testing.assert_array_equal(result[1][1], [5, 6, 7])
 
 
+class TestRegional(unittest.TestCase):
+    """Test regional SVD functions"""
+    
+    def setUp(self):
+        """Create test data for regional tests"""
+        np.random.seed(42)
+        self.matrix = np.random.rand(12, 40)
+        self.lons = np.tile(np.arange(10.0), 4)
+        self.lats = np.repeat(np.arange(4.0), 10)
+    
+    def test_select_region_columns(self):
+        """Test selecting columns inside a lon/lat box"""
+        columns = select_region_columns(self.lons, self.lats, (2, 4), (1, 2))
+        
+        self.assertEqual(len(columns), 6)
+        self.assertTrue(np.all((self.lons[columns] >= 2) & (self.lons[columns] <= 4)))
+        self.assertTrue(np.all((self.lats[columns] >= 1) & (self.lats[columns] <= 2)))
+    
+    def test_run_regional_svd_matches_direct(self):
+        """Test that pooled regional SVDs match direct SVDs of the subsets"""
+        regions = {
+            'west': select_region_columns(self.lons, self.lats, (0, 4), (0, 3)),
+            'east': select_region_columns(self.lons, self.lats, (5, 9), (0, 3))
+        }
+        results = run_regional_svd(self.matrix, regions, num_modes=3, n_workers=2)
+        
+        for name, columns in regions.items():
+            expected = perform_svd(self.matrix[:, columns], num_modes=3, compute_surfaces=False)
+            np.testing.assert_allclose(results[name]['singular_values'],
+                                       expected['singular_values'])
+    
+    def test_run_regional_svd_empty_region(self):
+        """Test error handling for regions without cells"""
+        with self.assertRaises(DimensionError):
+            run_regional_svd(self.matrix, {'empty': np.array([], dtype=int)}, n_workers=1)
+
+
+class TestGapFill(unittest.TestCase):
+    """Test truncated SVD and DINEOF gap filling"""
+    
+    def setUp(self):
+        """Create a low-rank test matrix"""
+        rng = np.random.default_rng(0)
+        self.matrix = rng.standard_normal((30, 3)) @ rng.standard_normal((3, 50))
+    
+    def test_truncated_svd_matches_full(self):
+        """Test that subspace iteration recovers the leading singular values"""
+        U, s, Vt = truncated_svd(self.matrix, 3, random_state=0)
+        expected = np.linalg.svd(self.matrix, compute_uv=False)[:3]
+        
+        self.assertEqual(U.shape, (30, 3))
+        self.assertEqual(Vt.shape, (3, 50))
+        np.testing.assert_allclose(s, expected, rtol=1e-8)
+    
+    def test_truncated_svd_warm_start(self):
+        """Test that a warm start from the exact subspace converges without iterations"""
+        _, _, Vt = np.linalg.svd(self.matrix, full_matrices=False)
+        _, s, _ = truncated_svd(self.matrix, 3, initial_subspace=Vt[:3].T, n_iter=0)
+        
+        np.testing.assert_allclose(s, np.linalg.svd(self.matrix, compute_uv=False)[:3])
+    
+    def test_dineof_fill_recovers_low_rank(self):
+        """Test that gaps in a low-rank matrix are filled with the missing values"""
+        gappy = self.matrix.copy()
+        rng = np.random.default_rng(1)
+        gaps = rng.random(gappy.shape) < 0.1
+        gappy[gaps] = np.nan
+        
+        info = dineof_fill(gappy, 3, max_iter=500, tol=1e-8, random_state=0)
+        
+        self.assertTrue(info['converged'])
+        self.assertFalse(np.isnan(gappy).any())
+        np.testing.assert_array_equal(info['gap_mask'], gaps)
+        np.testing.assert_allclose(gappy[gaps], self.matrix[gaps], atol=1e-4)
+    
+    def test_dineof_fill_without_gaps(self):
+        """Test that a complete matrix is left untouched"""
+        matrix = self.matrix.copy()
+        info = dineof_fill(matrix, 3)
+        
+        self.assertEqual(info['iterations'], 0)
+        np.testing.assert_array_equal(matrix, self.matrix)
+    
+    def test_dineof_fill_cross_validates_modes(self):
+        """Test that the default mode count follows the signal, not the noise"""
+        rng = np.random.default_rng(2)
+        signal = rng.standard_normal((36, 3)) @ rng.standard_normal((3, 400))
+        noisy = signal + 0.1 * rng.standard_normal(signal.shape)
+        gaps = np.zeros(signal.shape, dtype=bool)
+        gaps[[5, 17, 29], :100] = True
+        
+        gappy = np.where(gaps, np.nan, noisy)
+        info = dineof_fill(gappy, random_state=0)
+        
+        self.assertEqual(info['num_modes'], 3)
+        self.assertEqual(np.argmin(info['cv_errors']) + 1, 3)
+        self.assertTrue(info['converged'])
+        
+        # Extra modes fit the noise and fill the gaps worse
+        overfit = np.where(gaps, np.nan, noisy)
+        with self.assertWarns(RuntimeWarning):
+            dineof_fill(overfit, 8, random_state=0)
+        
+        error = np.sqrt(np.mean((gappy[gaps] - signal[gaps]) ** 2))
+        self.assertLess(error, np.sqrt(np.mean((overfit[gaps] - signal[gaps]) ** 2)))
+    
+    def test_dineof_fill_warns_without_convergence(self):
+        """Test that stopping at max_iter before convergence warns"""
+        gappy = self.matrix.copy()
+        gappy[::4, ::5] = np.nan
+        
+        with self.assertWarns(RuntimeWarning):
+            info = dineof_fill(gappy, 3, max_iter=2, tol=1e-12, random_state=0)
+        
+        self.assertFalse(info['converged'])
+        self.assertEqual(info['iterations'], 2)
+
+
+class TestWindowed(unittest.TestCase):
+    """Test sliding-window SVD functions"""
+    
+    def setUp(self):
+        """Create a slowly changing low-rank matrix"""
+        rng = np.random.default_rng(5)
+        self.matrix = rng.standard_normal((40, 3)) @ rng.standard_normal((3, 25))
+        self.matrix += 0.01 * rng.standard_normal((40, 25))
+    
+    def test_sliding_windows(self):
+        """Test window row ranges"""
+        self.assertEqual(sliding_windows(10, 4, step=3), [(0, 4), (3, 7), (6, 10)])
+        with self.assertRaises(DimensionError):
+            sliding_windows(10, 11)
+    
+    def test_windowed_svd_matches_direct(self):
+        """Test warm-started, threaded windows against direct SVDs"""
+        results = run_windowed_svd(self.matrix, 20, step=5, num_modes=3, n_workers=2,
+                                   random_state=0)
+        
+        self.assertEqual(sorted(results), [0, 5, 10, 15, 20])
+        for start, result in results.items():
+            self.assertEqual(result['rows'], (start, start + 20))
+            window = self.matrix[start:start + 20]
+            np.testing.assert_allclose(result['means'], window.mean(axis=0))
+            expected = np.linalg.svd(window - window.mean(axis=0), compute_uv=False)
+            np.testing.assert_allclose(result['singular_values'], expected[:3], rtol=1e-6)
+            np.testing.assert_allclose(result['explained_variance'],
+                                       expected[:3] ** 2 / np.sum(expected ** 2) * 100,
+                                       rtol=1e-6)
+            self.assertLessEqual(result['convergence']['subspace_change'], 1e-6)
+    
+    def test_windowed_warm_start_converges_early(self):
+        """Test that oversampled warm starts stop well before the iteration limit"""
+        rng = np.random.default_rng(1)
+        scales = [8, 5, 3, 2, 1.5]
+        matrix = (rng.standard_normal((120, 5)) * scales) @ rng.standard_normal((5, 300))
+        matrix += 0.5 * rng.standard_normal((120, 300))
+        
+        warm = run_windowed_svd(matrix, 36, step=4, num_modes=3, random_state=0)
+        exact = run_windowed_svd(matrix, 36, step=4, num_modes=3, random_state=0,
+                                 oversampling=0)
+        
+        warm_iterations = [result['convergence']['iterations'] for result in warm.values()]
+        exact_iterations = [result['convergence']['iterations'] for result in exact.values()]
+        self.assertLessEqual(max(warm_iterations[1:]), 3)
+        self.assertLess(sum(warm_iterations), sum(exact_iterations))
+        for start, result in warm.items():
+            window = matrix[start:start + 36]
+            expected = np.linalg.svd(window - window.mean(axis=0), compute_uv=False)
+            np.testing.assert_allclose(result['singular_values'], expected[:3], rtol=1e-6)
+    
+    def test_windowed_full_svd(self):
+        """Test full SVDs of each window without truncation"""
+        results = run_windowed_svd(self.matrix, 30, step=10)
+        
+        self.assertEqual(results[10]['eofs'].shape, (25, 25))
+        expected = np.linalg.svd(self.matrix[10:40], compute_uv=False)
+        uncentered = run_windowed_svd(self.matrix, 30, step=10, center=False)
+        np.testing.assert_allclose(uncentered[10]['singular_values'], expected, rtol=1e-10)
+
+
+class TestEnsemble(unittest.TestCase):
+    """Test batched ensemble SVD"""
+    
+    def setUp(self):
+        """Create a small ensemble"""
+        rng = np.random.default_rng(9)
+        self.ensemble = rng.standard_normal((4, 12, 20))
+    
+    def test_batched_matches_per_member(self):
+        """Test that one batched call matches separate SVDs"""
+        results = run_ensemble_svd(self.ensemble, num_modes=3)
+        
+        self.assertEqual(len(results), 4)
+        for member, result in zip(self.ensemble, results):
+            expected = perform_svd(member, num_modes=3, compute_surfaces=False)
+            np.testing.assert_allclose(result['singular_values'], expected['singular_values'])
+            np.testing.assert_allclose(result['explained_variance'],
+                                       expected['explained_variance'])
+    
+    def test_process_pool_matches_batched(self):
+        """Test that the pooled path gives the same singular values"""
+        batched = run_ensemble_svd(self.ensemble, num_modes=2)
+        pooled = run_ensemble_svd(self.ensemble, num_modes=2, n_workers=2, max_batch_bytes=0)
+        
+        for a, b in zip(batched, pooled):
+            np.testing.assert_allclose(a['singular_values'], b['singular_values'])
+    
+    def test_invalid_shape(self):
+        """Test error handling for non-3D input"""
+        with self.assertRaises(DimensionError):
+            run_ensemble_svd(self.ensemble[0])
+
+
+class TestSVDBackends(unittest.TestCase):
+    """Test alternative SVD backends of perform_svd"""
+    
+    def setUp(self):
+        """Create a matrix with decaying singular values"""
+        rng = np.random.default_rng(3)
+        self.matrix = (rng.standard_normal((40, 5)) * [10, 6, 3, 1, 0.5]) @ rng.standard_normal((5, 60))
+        self.matrix += 0.01 * rng.standard_normal((40, 60))
+        self.full = perform_svd(self.matrix, num_modes=3, compute_surfaces=False)
+    
+    def test_randomized_matches_full(self):
+        """Test that the randomized backend recovers the leading modes"""
+        results = perform_svd(self.matrix, num_modes=3, compute_surfaces=False,
+                              method='randomized', random_state=0)
+        
+        np.testing.assert_allclose(results['singular_values'], self.full['singular_values'],
+                                   rtol=1e-8)
+        np.testing.assert_allclose(results['explained_variance'], self.full['explained_variance'],
+                                   rtol=1e-8)
+        np.testing.assert_allclose(np.abs(np.sum(results['eofs'] * self.full['eofs'], axis=1)),
+                                   1.0, rtol=1e-8)
+    
+    def test_randomized_reproducible(self):
+        """Test that a seed gives identical results"""
+        a = perform_svd(self.matrix, num_modes=2, method='randomized', random_state=7,
+                        oversampling=2, n_iter=0)
+        b = perform_svd(self.matrix, num_modes=2, method='randomized', random_state=7,
+                        oversampling=2, n_iter=0)
+        
+        np.testing.assert_array_equal(a['eofs'], b['eofs'])
+        np.testing.assert_array_equal(a['pcs'], b['pcs'])
+    
+    def test_snapshot_matches_full(self):
+        """Test that the Gram matrix backend matches the thin SVD"""
+        results = perform_svd(self.matrix, num_modes=3, compute_surfaces=False, method='snapshot')
+        
+        np.testing.assert_allclose(results['singular_values'], self.full['singular_values'],
+                                   rtol=1e-10)
+        np.testing.assert_allclose(results['explained_variance'], self.full['explained_variance'],
+                                   rtol=1e-10)
+        np.testing.assert_allclose(np.abs(np.sum(results['eofs'] * self.full['eofs'], axis=1)),
+                                   1.0, rtol=1e-8)
+    
+    def test_snapshot_memmap_blocks(self):
+        """Test the blockwise path on a memory-mapped matrix"""
+        with tempfile.TemporaryDirectory() as tmp:
+            mapped = np.memmap(os.path.join(tmp, 'matrix.dat'), dtype=np.float64, mode='w+',
+                               shape=self.matrix.shape)
+            mapped[:] = self.matrix
+            U, s, Vt, total = snapshot_svd(mapped, 3, chunk_size=7)
+            del mapped
+        
+        np.testing.assert_allclose(s, self.full['singular_values'], rtol=1e-10)
+        np.testing.assert_allclose(total, np.sum(self.matrix ** 2))
+    
+    def test_snapshot_drops_tiny_modes(self):
+        """Test that modes lost to rounding in the Gram matrix are dropped"""
+        rank_two = self.matrix[:, :2] @ self.matrix[:2, :]
+        results = perform_svd(rank_two, method='snapshot', compute_surfaces=False)
+        
+        self.assertEqual(len(results['singular_values']), 2)
+        self.assertTrue(np.isfinite(results['eofs']).all())
+        np.testing.assert_allclose(results['cumulative_variance'][-1], 100.0)
+    
+    def test_lanczos_matches_full(self):
+        """Test the ARPACK backend and its convergence diagnostics"""
+        results = perform_svd(self.matrix, num_modes=3, compute_surfaces=False, method='lanczos',
+                              random_state=0)
+        
+        np.testing.assert_allclose(results['singular_values'], self.full['singular_values'],
+                                   rtol=1e-10)
+        np.testing.assert_allclose(results['explained_variance'], self.full['explained_variance'],
+                                   rtol=1e-10)
+        convergence = results['convergence']
+        self.assertGreater(convergence['matvecs'], 0)
+        self.assertTrue(np.all(convergence['residuals'] < 1e-8))
+    
+    def test_lanczos_column_blocks(self):
+        """Test that blockwise products give the same modes"""
+        U, s, Vt, _ = lanczos_svd(self.matrix, 2, chunk_size=7, random_state=0)
+        
+        np.testing.assert_allclose(s, self.full['singular_values'][:2], rtol=1e-10)
+        np.testing.assert_allclose(U * s, self.matrix @ Vt.T, atol=1e-8)
+        with self.assertRaises(ValueError):
+            lanczos_svd(self.matrix, 40)
+    
+    def test_incremental_matches_full(self):
+        """Test Brand updates over row blocks against the thin SVD"""
+        results = perform_svd(self.matrix, num_modes=3, compute_surfaces=False,
+                              method='incremental', block_size=7)
+        
+        np.testing.assert_allclose(results['singular_values'], self.full['singular_values'],
+                                   rtol=1e-10)
+        np.testing.assert_allclose(results['explained_variance'], self.full['explained_variance'],
+                                   rtol=1e-10)
+        self.assertEqual(results['pcs'].shape, (40, 3))
+    
+    def test_incremental_row_stream(self):
+        """Test feeding single rows and checking column counts"""
+        engine = IncrementalSVD(2, oversampling=3)
+        for row in self.matrix:
+            engine.update(row)
+        U, s, Vt = engine.factors()
+        
+        self.assertEqual(engine.n_rows, 40)
+        np.testing.assert_allclose(s, self.full['singular_values'][:2], rtol=1e-8)
+        np.testing.assert_allclose(engine.total_variance, np.sum(self.matrix ** 2))
+        with self.assertRaises(DimensionError):
+            engine.update(self.matrix[:2, :10])
+    
+    def test_tsqr_matches_full(self):
+        """Test the parallel TSQR backend against the thin SVD"""
+        results = perform_svd(self.matrix, num_modes=3, compute_surfaces=False, method='tsqr',
+                              n_workers=1)
+        
+        np.testing.assert_allclose(results['singular_values'], self.full['singular_values'],
+                                   rtol=1e-10)
+        np.testing.assert_allclose(results['explained_variance'], self.full['explained_variance'],
+                                   rtol=1e-10)
+    
+    def test_tsqr_worker_blocks(self):
+        """Test that several worker blocks reproduce the matrix"""
+        wide = np.hstack([self.matrix] * 4)
+        U, s, Vt = tsqr_svd(wide, n_workers=2)
+        
+        self.assertEqual(Vt.shape, (40, 240))
+        np.testing.assert_allclose((U * s) @ Vt, wide, atol=1e-8)
+        np.testing.assert_allclose(Vt @ Vt.T, np.eye(40), atol=1e-8)
+    
+    def test_update_svd_complete(self):
+        """Test that updating complete results matches the SVD of all rows"""
+        results = update_svd(perform_svd(self.matrix[:36]), self.matrix[36:])
+        full = perform_svd(self.matrix)
+        
+        self.assertEqual(len(results['singular_values']), 40)
+        np.testing.assert_allclose(results['singular_values'], full['singular_values'],
+                                   rtol=1e-8, atol=1e-10)
+        np.testing.assert_allclose(results['pcs'] @ results['eofs'], self.matrix, atol=1e-8)
+    
+    def test_update_svd_truncated(self):
+        """Test monthly-style single-row updates of truncated results"""
+        results = perform_svd(self.matrix[:30], num_modes=3, compute_surfaces=False)
+        for row in self.matrix[30:]:
+            results = update_svd(results, row)
+        
+        self.assertEqual(results['pcs'].shape, (40, 3))
+        self.assertNotIn('corresponding_surfaces', results)
+        # Truncated updates drift slightly from the full SVD
+        np.testing.assert_allclose(results['singular_values'], self.full['singular_values'],
+                                   rtol=1e-4)
+        np.testing.assert_allclose(results['explained_variance'], self.full['explained_variance'],
+                                   rtol=1e-4)
+    
+    def test_mixed_precision_refinement(self):
+        """Test that float64 refinement recovers double-precision modes"""
+        results = perform_svd(self.matrix, num_modes=3, compute_surfaces=False, method='mixed')
+        unrefined = perform_svd(self.matrix, num_modes=3, compute_surfaces=False, method='mixed',
+                                refine_iter=0)
+        
+        np.testing.assert_allclose(results['singular_values'], self.full['singular_values'],
+                                   rtol=1e-12)
+        np.testing.assert_allclose(np.abs(np.sum(results['eofs'] * self.full['eofs'], axis=1)),
+                                   1.0, rtol=1e-12)
+        convergence = results['convergence']
+        self.assertEqual(convergence['iterations'], 2)
+        self.assertTrue(np.all(convergence['residuals'] < convergence['residuals_float32']))
+        self.assertGreater(np.max(np.abs(unrefined['singular_values']
+                                         - self.full['singular_values'])), 1e-10)
+    
+    def test_mixed_precision_oversampling(self):
+        """Test that refining extra vectors speeds up convergence of the last modes"""
+        oversampled = mixed_precision_svd(self.matrix, 3, refine_iter=1)[3]
+        exact = mixed_precision_svd(self.matrix, 3, refine_iter=1, oversampling=0)[3]
+        
+        self.assertEqual(oversampled['residuals'].shape, (3,))
+        self.assertLess(np.max(oversampled['residuals']), 0.1 * np.max(exact['residuals']))
+    
+    def test_extend_modes(self):
+        """Test appending deflated modes to existing results"""
+        results = extend_modes(perform_svd(self.matrix, num_modes=3), self.matrix, 2,
+                               random_state=0)
+        full = perform_svd(self.matrix, num_modes=5, compute_surfaces=False)
+        
+        for key in ('singular_values', 'explained_variance', 'cumulative_variance'):
+            np.testing.assert_allclose(results[key], full[key], rtol=1e-10)
+        np.testing.assert_allclose(results['eofs'] @ results['eofs'].T, np.eye(5), atol=1e-10)
+        self.assertEqual(list(results['corresponding_surfaces']),
+                         [f'mode_{i}' for i in range(1, 6)])
+        with self.assertRaises(ValueError):
+            extend_modes(perform_svd(self.matrix), self.matrix, 1)
+    
+    def test_extend_modes_methods(self):
+        """Test the Lanczos and exact solvers for extending modes"""
+        known = perform_svd(self.matrix, num_modes=2, compute_surfaces=False)
+        full = perform_svd(self.matrix, num_modes=4, compute_surfaces=False)
+        
+        for method, options in (('lanczos', {'tol': 1e-12}), ('full', {})):
+            results = extend_modes(known, self.matrix, 2, method=method, random_state=0,
+                                   **options)
+            np.testing.assert_allclose(results['singular_values'], full['singular_values'],
+                                       rtol=1e-10)
+            np.testing.assert_allclose(np.abs(np.sum(results['eofs'] * full['eofs'], axis=1)),
+                                       1.0, rtol=1e-8)
+        with self.assertRaises(ValueError):
+            extend_modes(known, self.matrix, 2, method='snapshot')
+        with self.assertRaises(ValueError):
+            extend_modes(known, self.matrix, 2, method='full', n_iter=2)
+    
+    def test_invalid_method(self):
+        """Test errors for unknown methods and missing num_modes"""
+        with self.assertRaises(ValueError):
+            perform_svd(self.matrix, method='qr')
+        with self.assertRaises(ValueError):
+            perform_svd(self.matrix, method='randomized')
+
+
+class TestCostModel(unittest.TestCase):
+    """Test automatic SVD backend selection"""
+    
+    def setUp(self):
+        """Point the config directory to a temporary directory"""
+        self.config_dir = tempfile.mkdtemp()
+        self.env = mock.patch.dict(os.environ, {'XDG_CONFIG_HOME': self.config_dir})
+        self.env.start()
+        self.model = {'version': 1, 'gemm_rate': 1e10, 'svd_rate': 2e9, 'gemv_rate': 1e9}
+    
+    def tearDown(self):
+        """Restore the environment"""
+        self.env.stop()
+        shutil.rmtree(self.config_dir)
+    
+    def test_calibration_is_cached(self):
+        """Test that the micro-benchmark runs once and is read back"""
+        model = load_cost_model()
+        
+        self.assertTrue(cost_model_path().startswith(self.config_dir))
+        self.assertTrue(os.path.exists(cost_model_path()))
+        self.assertEqual(load_cost_model(), model)
+    
+    def test_selection_by_shape_and_memory(self):
+        """Test backend choices for typical shapes and memory limits"""
+        # Few timestamps, many cells: the Gram matrix is cheapest for many modes,
+        # but only 'full' is guaranteed to return all of them
+        self.assertEqual(select_svd_method(300, 10**6, 200, model=self.model,
+                                           memory_limit=np.inf), 'snapshot')
+        self.assertEqual(select_svd_method(300, 10**6, model=self.model, memory_limit=np.inf),
+                         'full')
+        # A few modes avoid the full decomposition
+        self.assertNotEqual(select_svd_method(300, 10**6, 5, model=self.model,
+                                              memory_limit=np.inf), 'full')
+        # Without enough memory for a dense copy, only blockwise backends remain
+        method = select_svd_method(2000, 10**6, 5, in_memory=False, memory_limit=6e8,
+                                   model=self.model)
+        self.assertIn(method, ('snapshot', 'lanczos', 'incremental'))
+        
+        costs = estimate_svd_costs(2000, 10**6, 5, in_memory=False, model=self.model)
+        self.assertGreater(costs['full'][1], 6e8)
+    
+    def test_auto_perform_svd(self):
+        """Test that method='auto' reports its choice and matches the full SVD"""
+        rng = np.random.default_rng(4)
+        matrix = rng.standard_normal((30, 4)) @ rng.standard_normal((4, 80))
+        
+        results = perform_svd(matrix, num_modes=3, method='auto', compute_surfaces=False)
+        full = perform_svd(matrix, num_modes=3, compute_surfaces=False)
+        
+        self.assertIn(results['method'], AUTO_METHODS)
+        np.testing.assert_allclose(results['singular_values'], full['singular_values'],
+                                   rtol=1e-6)
+        with self.assertRaises(ValueError):
+            perform_svd(matrix, num_modes=3, method='auto', n_iter=2)
+        
+        # Centered data are rank deficient; all modes must still match 'full'
+        centered = rng.standard_normal((12, 400))
+        centered -= centered.mean(axis=0)
+        results = perform_svd(centered, method='auto', compute_surfaces=False)
+        self.assertEqual(results['method'], 'full')
+        self.assertEqual(len(results['singular_values']), 12)
+
+
 class TestValidation(unittest.TestCase):
     """Test validation functions"""
     
@@ -365,6 +902,64 @@ class TestProcessor(unittest.TestCase):
         super_mask = create_super_mask(masks, threshold=2)
         expected = np.array([[1, 1, 0], [0, 1, 1]])
         np.testing.assert_array_equal(super_mask, expected)
+    
+    def test_valid_counts_and_threshold_curve(self):
+        """Test the compact valid-count grid and cells kept per threshold"""
+        masks = {
+            'mask1': np.array([[1, 1, 0], [0, 1, 1]]),
+            'mask2': np.array([[1, 0, 0], [1, 1, 1]]),
+            'mask3': np.array([[1, 1, 1], [0, 0, 1]])
+        }
+        counts = count_valid_cells(masks)
+        
+        self.assertEqual(counts.dtype, np.uint16)
+        np.testing.assert_array_equal(counts, [[3, 2, 1], [1, 2, 3]])
+        np.testing.assert_array_equal(threshold_curve(counts, 3), [6, 6, 4, 2])
+    
+    def test_boolean_masks(self):
+        """Test boolean validity masks give the same super mask"""
+        mask = create_binary_mask(self.nan_matrix, as_bool=True)
+        
+        self.assertEqual(mask.dtype, bool)
+        np.testing.assert_array_equal(mask, create_binary_mask(self.nan_matrix) == 1)
+        
+        masks = {'a': mask, 'b': np.ones_like(mask)}
+        np.testing.assert_array_equal(create_super_mask(masks),
+                                      create_binary_mask(self.nan_matrix))
+
+
+class TestCoarsening(unittest.TestCase):
+    """Test grid coarsening functions"""
+    
+    def test_coarsen_matrix_block_mean(self):
+        """Test block averaging of a divisible grid"""
+        matrix = np.arange(16, dtype=float).reshape(4, 4)
+        coarse = coarsen_matrix(matrix, 2)
+        
+        expected = np.array([[2.5, 4.5], [10.5, 12.5]])
+        np.testing.assert_allclose(coarse, expected)
+    
+    def test_coarsen_matrix_ignores_nan(self):
+        """Test NaN cells are left out of block means"""
+        matrix = np.array([[1.0, np.nan], [3.0, np.nan]])
+        
+        np.testing.assert_allclose(coarsen_matrix(matrix, 2), [[2.0]])
+        self.assertTrue(np.isnan(coarsen_matrix(matrix, 2, min_valid=3)[0, 0]))
+    
+    def test_coarsen_matrix_uneven_edges(self):
+        """Test grids that are not a multiple of the factor"""
+        matrix = np.ones((5, 7))
+        coarse = coarsen_matrix(matrix, (2, 3))
+        
+        self.assertEqual(coarse.shape, (3, 3))
+        np.testing.assert_allclose(coarse, 1.0)
+    
+    def test_coarsen_masked_matrices(self):
+        """Test masked values are treated as missing"""
+        masked = np.ma.masked_array([[1.0, 100.0], [3.0, 5.0]], mask=[[0, 1], [0, 0]])
+        coarse = coarsen_matrices({'a': masked}, 2)
+        
+        np.testing.assert_allclose(coarse['a'], [[3.0]])
 
 
 class TestIdentification(unittest.TestCase):
@@ -469,6 +1064,264 @@ class TestFlattener(unittest.TestCase):
         np.testing.assert_allclose(centered['mat2'], [[-1.5, -0.5, 0.5, 1.5]])
 
 
+class TestCentering(unittest.TestCase):
+    """Test in-place centering functions"""
+    
+    def setUp(self):
+        """Create test data for centering tests"""
+        np.random.seed(42)
+        self.matrix = np.random.rand(24, 6) + 10.0
+    
+    def test_streaming_mean_matches_numpy(self):
+        """Test that streaming means match a direct computation"""
+        accumulator = StreamingMean()
+        for row in self.matrix:
+            accumulator.update(row)
+        
+        np.testing.assert_allclose(accumulator.mean(), self.matrix.mean(axis=0))
+        np.testing.assert_allclose(accumulator.variance(), self.matrix.var(axis=0))
+        
+        # Blocks of rows give the same result
+        blocked = StreamingMean()
+        blocked.update(self.matrix[:10])
+        blocked.update(self.matrix[10:])
+        np.testing.assert_allclose(blocked.mean(), accumulator.mean())
+    
+    def test_streaming_mean_ignores_nan(self):
+        """Test that NaN entries are skipped per column"""
+        accumulator = StreamingMean()
+        accumulator.update(np.array([1.0, np.nan]))
+        accumulator.update(np.array([3.0, 4.0]))
+        
+        np.testing.assert_allclose(accumulator.mean(), [2.0, 4.0])
+        np.testing.assert_array_equal(accumulator.count(), [2, 1])
+    
+    def test_center_spatial_in_place(self):
+        """Test per-timestamp centering modifies the matrix in place"""
+        matrix = self.matrix.copy()
+        centering = center_super_matrix(matrix, mode='spatial')
+        
+        np.testing.assert_allclose(matrix.mean(axis=1), 0, atol=1e-12)
+        self.assertEqual(centering['means'].shape, (24, 1))
+        np.testing.assert_allclose(restore_means(matrix, centering), self.matrix)
+    
+    def test_center_temporal(self):
+        """Test per-cell temporal centering"""
+        matrix = self.matrix.copy()
+        centering = center_super_matrix(matrix, mode='temporal')
+        
+        np.testing.assert_allclose(matrix.mean(axis=0), 0, atol=1e-12)
+        np.testing.assert_allclose(centering['means'][0], self.matrix.mean(axis=0))
+    
+    def test_center_climatology(self):
+        """Test centering by group climatology"""
+        matrix = self.matrix.copy()
+        groups = np.arange(24) % 12
+        centering = center_super_matrix(matrix, mode='climatology', groups=groups)
+        
+        self.assertEqual(centering['means'].shape, (12, 6))
+        np.testing.assert_allclose(matrix[:12], -matrix[12:], atol=1e-12)
+        np.testing.assert_allclose(restore_means(matrix, centering), self.matrix)
+    
+    def test_center_invalid_mode(self):
+        """Test error handling for unknown modes"""
+        with self.assertRaises(ValueError):
+            center_super_matrix(self.matrix.copy(), mode='unknown')
+    
+    def test_grouped_means_match_loop(self):
+        """Test grouped reduction against per-group means, with NaN"""
+        matrix = self.matrix.copy()
+        matrix[3, 2] = np.nan
+        group_index = np.arange(24) % 5
+        means = grouped_means(matrix, group_index, 5)
+        
+        for g in range(5):
+            np.testing.assert_allclose(means[g], np.nanmean(matrix[group_index == g], axis=0))
+    
+    def test_climatology_groups_from_dates(self):
+        """Test month and day-of-year groups from parsed file dates"""
+        np.testing.assert_array_equal(
+            climatology_groups([199301, 199302, 199401], by='month'), [1, 2, 1])
+        
+        dates = [datetime(2019, 3, 1), datetime(2020, 3, 1), datetime(2020, 2, 29)]
+        np.testing.assert_array_equal(climatology_groups(dates, by='dayofyear'), [60, 60, 59])
+        
+        with self.assertRaises(ValueError):
+            climatology_groups(['not-a-date'], by='month')
+
+
+class TestDetrending(unittest.TestCase):
+    """Test whole-matrix polynomial detrending"""
+    
+    def setUp(self):
+        """Create columns with known trends"""
+        rng = np.random.default_rng(3)
+        t = np.arange(40.0)
+        self.trend = np.outer(t, np.linspace(-1, 1, 8)) + 0.01 * np.outer(t ** 2, np.ones(8))
+        self.noise = 0.1 * rng.standard_normal((40, 8))
+        self.matrix = self.trend + self.noise
+    
+    def test_detrend_matches_polyfit(self):
+        """Test that the single solve matches per-column polyfit"""
+        matrix = self.matrix.copy()
+        detrend_super_matrix(matrix, order=2, chunk_size=3)
+        
+        t = np.arange(40.0)
+        for j in range(8):
+            fit = np.polyval(np.polyfit(t, self.matrix[:, j], 2), t)
+            np.testing.assert_allclose(matrix[:, j], self.matrix[:, j] - fit, atol=1e-8)
+    
+    def test_restore_trend(self):
+        """Test adding the trend back, for all rows and for one row"""
+        matrix = self.matrix.copy()
+        detrending = detrend_super_matrix(matrix, order=1)
+        
+        np.testing.assert_allclose(restore_trend(matrix, detrending), self.matrix)
+        np.testing.assert_allclose(restore_trend(matrix[5], detrending, rows=5), self.matrix[5])
+    
+    def test_detrend_with_nan(self):
+        """Test that columns with NaN are fitted from their valid rows"""
+        matrix = self.matrix.copy()
+        matrix[[3, 10, 20], 2] = np.nan
+        expected = self.matrix.copy()
+        detrend_super_matrix(expected, order=1)
+        
+        detrend_super_matrix(matrix, order=1)
+        
+        self.assertTrue(np.isnan(matrix[3, 2]))
+        np.testing.assert_allclose(matrix[:, 0], expected[:, 0])
+        self.assertLess(abs(np.polyfit(np.arange(40.0)[~np.isnan(matrix[:, 2])],
+                                       matrix[~np.isnan(matrix[:, 2]), 2], 1)[0]), 1e-10)
+
+
+class TestFiltering(unittest.TestCase):
+    """Test temporal filtering of super matrices"""
+    
+    def setUp(self):
+        """Create columns mixing a slow and a fast oscillation"""
+        t = np.arange(240.0)
+        self.slow = np.outer(np.sin(2 * np.pi * t / 60), np.linspace(1, 2, 5))
+        self.fast = np.outer(np.sin(2 * np.pi * t / 4), np.ones(5))
+        self.matrix = self.slow + self.fast
+    
+    def test_fft_lowpass(self):
+        """Test that the spectral filter removes the fast oscillation exactly"""
+        matrix = self.matrix.copy()
+        filter_super_matrix(matrix, method='fft', periods=(12, None), chunk_size=2)
+        
+        np.testing.assert_allclose(matrix, self.slow, atol=1e-10)
+    
+    def test_butterworth_lowpass(self):
+        """Test that a low-pass keeps the slow signal away from the edges"""
+        matrix = self.matrix.copy()
+        filter_super_matrix(matrix, method='butterworth', periods=(12, None))
+        
+        np.testing.assert_allclose(matrix[60:180], self.slow[60:180], atol=0.05)
+    
+    def test_butterworth_nyquist_period(self):
+        """Test that a min_period at the Nyquist period drops the low-pass side"""
+        matrix = self.matrix.copy()
+        filter_super_matrix(matrix, method='butterworth', periods=(2, None))
+        np.testing.assert_array_equal(matrix, self.matrix)
+        
+        bandpass = self.matrix.copy()
+        highpass = self.matrix.copy()
+        filter_super_matrix(bandpass, method='butterworth', periods=(2, 30))
+        filter_super_matrix(highpass, method='butterworth', periods=(None, 30))
+        np.testing.assert_array_equal(bandpass, highpass)
+    
+    def test_running_mean(self):
+        """Test that a running mean over one period cancels the fast oscillation"""
+        matrix = self.fast.copy()
+        filter_super_matrix(matrix, method='running_mean', window=4)
+        
+        np.testing.assert_allclose(matrix[4:-4], 0, atol=1e-10)
+    
+    def test_invalid_arguments(self):
+        """Test error handling for bad filters and NaN input"""
+        with self.assertRaises(ValueError):
+            filter_super_matrix(self.matrix.copy(), method='unknown')
+        with self.assertRaises(ValueError):
+            filter_super_matrix(self.matrix.copy(), method='fft', periods=(None, None))
+        
+        matrix = self.matrix.copy()
+        matrix[0, 0] = np.nan
+        with self.assertRaises(ValueError):
+            filter_super_matrix(matrix, method='running_mean', window=3)
+
+
+class TestGrid(unittest.TestCase):
+    """Test grid helper functions"""
+    
+    def test_compute_latitude_weights(self):
+        """Test sqrt(cos(lat)) weights on a grid"""
+        lats = np.array([[0.0, 0.0], [60.0, 60.0], [90.0, 90.0]])
+        weights = compute_latitude_weights(lats)
+        
+        np.testing.assert_allclose(weights[0], [1.0, 1.0])
+        np.testing.assert_allclose(weights[1], np.sqrt(0.5))
+        np.testing.assert_allclose(weights[2], 0.0, atol=1e-7)
+    
+    def test_compute_latitude_weights_with_mask(self):
+        """Test weights are returned in flattened valid-cell order"""
+        lats = np.array([[0.0, 0.0], [60.0, 60.0]])
+        super_mask = np.array([[0, 1], [1, 0]])
+        weights = compute_latitude_weights(lats, super_mask)
+        
+        np.testing.assert_allclose(weights, [1.0, np.sqrt(0.5)])
+
+
+class TestSparse(unittest.TestCase):
+    """Test valid-cells-only grid functions"""
+    
+    def setUp(self):
+        """Create mostly-masked test grids"""
+        self.grids = {
+            'time1': np.array([[1.0, np.nan, 3.0], [np.nan, 5.0, 6.0]]),
+            'time2': np.array([[7.0, 8.0, np.nan], [np.nan, 11.0, 12.0]]),
+            'time3': np.array([[13.0, np.nan], [np.nan, 17.0]])
+        }
+        self.sparse = {key: SparseGrid.from_dense(grid) for key, grid in self.grids.items()}
+    
+    def test_sparse_grid_round_trip(self):
+        """Test that only valid cells are stored and restored"""
+        grid = self.sparse['time1']
+        
+        self.assertEqual(grid.nnz, 4)
+        np.testing.assert_array_equal(grid.to_dense(), self.grids['time1'])
+    
+    def test_sparse_grid_from_masked_array(self):
+        """Test that masked cells are dropped"""
+        masked = np.ma.masked_array([[1.0, 2.0], [3.0, 4.0]], mask=[[0, 1], [0, 0]])
+        grid = SparseGrid.from_dense(masked)
+        
+        np.testing.assert_array_equal(grid.values, [1.0, 3.0, 4.0])
+    
+    def test_sparse_grid_padding(self):
+        """Test alignment into larger target dimensions"""
+        dense = self.sparse['time3'].to_dense((2, 3))
+        
+        self.assertEqual(dense.shape, (2, 3))
+        self.assertEqual(dense[1, 1], 17.0)
+        self.assertTrue(np.isnan(dense[1, 2]))
+    
+    def test_sparse_super_mask_and_flatten_match_dense(self):
+        """Test sparse masking and flattening against the dense path"""
+        standardized, target_dims = standardize_dimensions(self.grids)
+        masks = {key: create_binary_mask(m) for key, m in standardized.items()}
+        expected_mask = create_super_mask(masks)
+        
+        counts = count_sparse_valid_cells(self.sparse, target_dims)
+        super_mask = super_mask_from_counts(counts, len(self.sparse))
+        np.testing.assert_array_equal(super_mask, expected_mask)
+        
+        id_matrix = create_id_matrix(super_mask)
+        expected, _ = flatten_matrices(standardized, id_matrix, super_mask)
+        flattened = flatten_sparse_grids(self.sparse, super_mask)
+        for key in self.grids:
+            np.testing.assert_array_equal(flattened[key], expected[key])
+
+
 class TestReshaper(unittest.TestCase):
     """Test reshaping functions"""
     
@@ -574,6 +1427,75 @@ class TestStacker(unittest.TestCase):
             create_super_matrix(bad_dict)
 
 
+class TestPipeline(unittest.TestCase):
+    """Test the stage-level pipeline cache"""
+    
+    def setUp(self):
+        """Count how often each stage function runs"""
+        self.calls = {'load': 0, 'scale': 0}
+    
+    def load(self, size):
+        self.calls['load'] += 1
+        return np.arange(size, dtype=float)
+    
+    def scale(self, data, factor):
+        self.calls['scale'] += 1
+        return data * factor
+    
+    def test_unchanged_stages_are_cached(self):
+        """Test that rerunning with the same parameters reuses outputs"""
+        pipeline = Pipeline()
+        for _ in range(2):
+            pipeline.run('load', self.load, params={'size': 4})
+            result = pipeline.run('scale', self.scale, params={'factor': 2}, depends=['load'])
+        
+        self.assertEqual(self.calls, {'load': 1, 'scale': 1})
+        self.assertEqual(pipeline.last_run['scale'], 'cached')
+        np.testing.assert_array_equal(result, [0, 2, 4, 6])
+    
+    def test_parameter_change_reruns_only_tail(self):
+        """Test that a downstream parameter change keeps upstream outputs"""
+        pipeline = Pipeline()
+        pipeline.run('load', self.load, params={'size': 4})
+        pipeline.run('scale', self.scale, params={'factor': 2}, depends=['load'])
+        
+        pipeline.run('load', self.load, params={'size': 4})
+        result = pipeline.run('scale', self.scale, params={'factor': 3}, depends=['load'])
+        
+        self.assertEqual(self.calls, {'load': 1, 'scale': 2})
+        np.testing.assert_array_equal(result, [0, 3, 6, 9])
+    
+    def test_upstream_change_invalidates_downstream(self):
+        """Test that changing an upstream stage drops downstream outputs"""
+        pipeline = Pipeline()
+        pipeline.run('load', self.load, params={'size': 4})
+        pipeline.run('scale', self.scale, params={'factor': 2}, depends=['load'])
+        
+        pipeline.run('load', self.load, params={'size': 5})
+        self.assertIsNone(pipeline.output('scale'))
+        
+        result = pipeline.run('scale', self.scale, params={'factor': 2}, depends=['load'])
+        self.assertEqual(len(result), 5)
+        self.assertEqual(self.calls['scale'], 2)
+    
+    def test_disk_cache_shared_between_pipelines(self):
+        """Test that outputs written to cache_dir are reused"""
+        cache_dir = tempfile.mkdtemp()
+        try:
+            Pipeline(cache_dir=cache_dir).run('load', self.load, params={'size': 3})
+            result = Pipeline(cache_dir=cache_dir).run('load', self.load, params={'size': 3})
+            
+            self.assertEqual(self.calls['load'], 1)
+            np.testing.assert_array_equal(result, [0, 1, 2])
+        finally:
+            shutil.rmtree(cache_dir)
+    
+    def test_missing_dependency(self):
+        """Test error handling for stages run out of order"""
+        with self.assertRaises(EOFToolkitError):
+            Pipeline().run('scale', self.scale, params={'factor': 2}, depends=['load'])
+
+
 class TestIO(unittest.TestCase):
     """Test I/O functions"""
     
@@ -630,6 +1552,27 @@ class TestIO(unittest.TestCase):
         self.assertEqual(data['longitude'].shape, (8, 10))
         self.assertEqual(data['latitude'].shape, (8, 10))
     
+    def test_read_netcdf_as_nan(self):
+        """Test NaN-native reading of packed data with fill values"""
+        filepath = os.path.join(self.test_dir, 'packed.nc')
+        with nc.Dataset(filepath, 'w') as ds:
+            ds.createDimension('y', 2)
+            ds.createDimension('x', 3)
+            z = ds.createVariable('z', 'i2', ('y', 'x'), fill_value=-999)
+            z.scale_factor = 0.5
+            z.add_offset = 10.0
+            z.set_auto_maskandscale(False)
+            z[:] = np.array([[0, 2, -999], [4, -999, 6]], dtype=np.int16)
+        
+        data = read_netcdf(filepath, as_masked=False)
+        
+        self.assertNotIsInstance(data['z'], np.ma.MaskedArray)
+        self.assertEqual(data['z'].dtype, np.float64)
+        np.testing.assert_array_equal(data['z'], [[10.0, 11.0, np.nan], [12.0, np.nan, 13.0]])
+        
+        masked = read_netcdf(filepath)
+        np.testing.assert_array_equal(np.isnan(data['z']), np.ma.getmaskarray(masked['z']))
+    
     def test_read_netcdf_invalid_file(self):
         """Test error handling for invalid files"""
         with self.assertRaises(FileReadError):
@@ -644,6 +1587,10 @@ class TestIO(unittest.TestCase):
         self.assertTrue('202101' in sorted_files[0])
         self.assertTrue('202201' in sorted_files[1])
         self.assertTrue('202301' in sorted_files[2])
+        
+        # Parsed dates can be returned alongside the paths
+        _, dates = sort_files_by_date(self.test_dir, '.nc', r'(\d{6})', '%Y%m', return_dates=True)
+        self.assertEqual(dates, [datetime(2021, 1, 1), datetime(2022, 1, 1), datetime(2023, 1, 1)])
 
 
 class TestUtils(unittest.TestCase):
@@ -224,6 +224,18 @@ class TestScientificAccuracy(unittest.TestCase):
             for j in range(i+1, 4):
                 self.assertAlmostEqual(pc_gram[i, j], 0.0, places=12)
     
+    def test_incremental_svd_matches_full(self):
+        """Test that the streamed incremental SVD matches the full SVD"""
+        self.processor.process_directory(str(self.data_dir), date_pattern=r'(\d{3})')
+        full = self.processor.perform_svd(num_modes=3)
+        full = {key: full[key] for key in ('eofs', 'singular_values')}
+        incremental = self.processor.perform_svd(num_modes=3, method='incremental', block_size=4)
+        
+        np.testing.assert_allclose(incremental['singular_values'], full['singular_values'],
+                                   rtol=1e-6)
+        overlap = np.abs(np.sum(incremental['eofs'] * full['eofs'], axis=1))
+        np.testing.assert_allclose(overlap, 1.0, rtol=1e-6)
+    
     def test_conservation_properties(self):
         """Test conservation of variance and other properties"""
         # Process data